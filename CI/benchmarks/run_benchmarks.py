@@ -0,0 +1,421 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Throughput benchmarks of data ingestion, transformations and calculators.
+
+For every system size a synthetic molten salt trajectory is written as a LAMMPS dump
+and read with Experiment.add_data. The calculators are run on this experiment. Each
+transformation is run on a separate experiment that contains its input properties
+but not its output, so it is not skipped.
+
+The wall time, frames/s and the peak resident memory of each benchmark are written
+to a JSON file. Atom pairs/s are only reported for the radial distribution function
+without a cell list, which is the only benchmark that evaluates all N(N-1)/2 pairs
+of each configuration. Two result files can be compared with --compare.
+
+The suite lives in CI/benchmarks next to the unit, integration and functional tests
+so it shares their layout and is not collected into the installed package.
+
+Examples
+--------
+python run_benchmarks.py --atoms 1000 --frames 1000 --output results.json
+python run_benchmarks.py --atoms 1000 10000 100000 --frames 1000 10000
+python run_benchmarks.py --compare old.json new.json
+
+"""
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+import typing
+
+import psutil
+from synthetic_trajectory import SyntheticTrajectory
+
+import mdsuite
+import mdsuite.experiment
+from mdsuite.transformations.transformation_dict import (
+    property_to_transformation_dict,
+)
+
+# benchmark name -> (calculator name, arguments, evaluates all atom pairs)
+calculators = {
+    "RadialDistributionFunction": (
+        "RadialDistributionFunction",
+        {"number_of_configurations": 100},
+        False,
+    ),
+    "RadialDistributionFunction (all pairs)": (
+        "RadialDistributionFunction",
+        {"number_of_configurations": 10, "cell_list": False},
+        True,
+    ),
+    "AngularDistributionFunction": (
+        "AngularDistributionFunction",
+        {"number_of_configurations": 5},
+        False,
+    ),
+    "EinsteinDiffusionCoefficients": (
+        "EinsteinDiffusionCoefficients",
+        {"data_range": 100},
+        False,
+    ),
+    "GreenKuboDiffusionCoefficients": (
+        "GreenKuboDiffusionCoefficients",
+        {"data_range": 500},
+        False,
+    ),
+    "EinsteinHelfandIonicConductivity": (
+        "EinsteinHelfandIonicConductivity",
+        {"data_range": 100},
+        False,
+    ),
+    "GreenKuboIonicConductivity": (
+        "GreenKuboIonicConductivity",
+        {"data_range": 500},
+        False,
+    ),
+}
+
+
+class PeakMemoryMonitor:
+    """
+    Record the peak resident memory of this process in a background thread.
+
+    Attributes
+    ----------
+    peak : int
+            Highest resident set size in bytes seen while the monitor was active.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Constructor of the monitor.
+
+        Parameters
+        ----------
+        interval : float
+                Time in seconds between two measurements.
+        """
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self._process.memory_info().rss
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+def run_benchmark(
+    name: str, trajectory: SyntheticTrajectory, func: typing.Callable, n_pairs: int = 0
+) -> dict:
+    """
+    Time a function and measure its peak memory.
+
+    Parameters
+    ----------
+    name : str
+            Name of the benchmark.
+    trajectory : SyntheticTrajectory
+            The trajectory the benchmark runs on.
+    func : callable
+            The function to benchmark, called without arguments.
+    n_pairs : int
+            Number of atom pairs evaluated by func, 0 if it does not evaluate all
+            pairs.
+
+    Returns
+    -------
+    result : dict
+            The measurements. If func raises, the error is recorded instead.
+    """
+    result = {
+        "benchmark": name,
+        "n_atoms": trajectory.n_atoms,
+        "n_frames": trajectory.n_frames,
+    }
+    print(f"{name} ({trajectory.n_atoms} atoms, {trajectory.n_frames} frames)")
+    try:
+        with PeakMemoryMonitor() as monitor:
+            start = time.perf_counter()
+            func()
+            wall_time = time.perf_counter() - start
+    except Exception as err:
+        result["error"] = f"{type(err).__name__}: {err}"
+        print(f"    failed: {result['error']}")
+        return result
+
+    result["wall_time_s"] = wall_time
+    result["frames_per_s"] = trajectory.n_frames / wall_time
+    if n_pairs > 0:
+        result["atom_pairs_per_s"] = n_pairs / wall_time
+    result["peak_memory_bytes"] = monitor.peak
+    print(f"    {wall_time:.2f} s, peak memory {monitor.peak / 2**20:.0f} MiB")
+    return result
+
+
+def get_transformations() -> list:
+    """Get all transformation classes of the transformation dict."""
+    transformations = []
+    for value in property_to_transformation_dict.values():
+        transformations.extend(value if isinstance(value, list) else [value])
+    return transformations
+
+
+def benchmark_ingestion(
+    trajectory: SyntheticTrajectory, work_dir: pathlib.Path
+) -> typing.Tuple[dict, mdsuite.experiment.Experiment]:
+    """
+    Benchmark reading a LAMMPS dump into an experiment.
+
+    Returns
+    -------
+    result : dict
+            The measurements.
+    experiment : Experiment
+            The experiment with the trajectory, used by the calculator benchmarks.
+    """
+    file_path = work_dir / f"{trajectory.get_name()}.lammpstraj"
+    trajectory.write_lammps(file_path)
+
+    project = mdsuite.Project(name="ingestion", storage_path=work_dir.as_posix())
+    experiment = project.add_experiment(
+        trajectory.get_name(), timestep=0.002, temperature=1400, units="metal"
+    )
+    result = run_benchmark(
+        "Experiment.add_data",
+        trajectory,
+        lambda: experiment.add_data(file_path),
+    )
+    file_path.unlink()
+    return result, experiment
+
+
+def benchmark_transformations(
+    trajectory: SyntheticTrajectory, work_dir: pathlib.Path
+) -> typing.List[dict]:
+    """Benchmark each transformation of the transformation dict."""
+    results = []
+    for transformation in get_transformations():
+        try:
+            instance = transformation()
+        except Exception as err:
+            results.append(
+                {
+                    "benchmark": transformation.__name__,
+                    "n_atoms": trajectory.n_atoms,
+                    "n_frames": trajectory.n_frames,
+                    "error": f"{type(err).__name__}: {err}",
+                }
+            )
+            print(f"{transformation.__name__} failed: {results[-1]['error']}")
+            continue
+        properties = [
+            prop
+            for prop in instance.input_properties
+            if prop.name in trajectory.get_property_names()
+        ]
+        project = mdsuite.Project(
+            name=transformation.__name__,
+            storage_path=work_dir.as_posix(),
+        )
+        experiment = project.add_experiment(
+            trajectory.get_name(),
+            timestep=0.002,
+            temperature=1400,
+            units="metal",
+            simulation_data=trajectory.get_script_input(properties),
+        )
+        results.append(
+            run_benchmark(
+                transformation.__name__,
+                trajectory,
+                lambda: experiment.cls_transformation_run(instance),
+            )
+        )
+    return results
+
+
+def benchmark_calculators(
+    trajectory: SyntheticTrajectory, experiment: mdsuite.experiment.Experiment
+) -> typing.List[dict]:
+    """Benchmark the calculators on the ingested experiment."""
+    # transformations the calculators depend on are benchmarked separately
+    experiment.run.IonicCurrent()
+    experiment.run.TranslationalDipoleMoment()
+
+    results = []
+    for name, (calculator_name, arguments, all_pairs) in calculators.items():
+        arguments = dict(arguments)
+        if "data_range" in arguments:
+            arguments["data_range"] = min(
+                arguments["data_range"], trajectory.n_frames // 2
+            )
+        if "number_of_configurations" in arguments:
+            arguments["number_of_configurations"] = min(
+                arguments["number_of_configurations"], trajectory.n_frames - 1
+            )
+        n_pairs = 0
+        if all_pairs:
+            n_pairs = (
+                arguments["number_of_configurations"]
+                * trajectory.n_atoms
+                * (trajectory.n_atoms - 1)
+                // 2
+            )
+        calculator = getattr(experiment.run, calculator_name)
+        results.append(
+            run_benchmark(
+                name,
+                trajectory,
+                lambda: calculator(plot=False, **arguments),
+                n_pairs=n_pairs,
+            )
+        )
+    return results
+
+
+def get_machine_information() -> dict:
+    """Information about the code version and the machine of the run."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=pathlib.Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "mdsuite_version": mdsuite.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "n_cpus": os.cpu_count(),
+        "memory_bytes": psutil.virtual_memory().total,
+        "date": datetime.datetime.now().isoformat(),
+    }
+
+
+def compare_results(old_path: str, new_path: str):
+    """
+    Print the change of the wall times between two result files.
+
+    Parameters
+    ----------
+    old_path : str
+            Reference results.
+    new_path : str
+            Results to compare against the reference.
+    """
+
+    def load(path):
+        with open(path) as file:
+            results = json.load(file)["results"]
+        return {
+            (item["benchmark"], item["n_atoms"], item["n_frames"]): item
+            for item in results
+        }
+
+    old, new = load(old_path), load(new_path)
+    print(f"{'benchmark':<40} {'atoms':>8} {'frames':>8} {'old s':>9} {'new s':>9}")
+    for key in sorted(old.keys() & new.keys()):
+        old_time = old[key].get("wall_time_s")
+        new_time = new[key].get("wall_time_s")
+        if old_time is None or new_time is None:
+            continue
+        print(
+            f"{key[0]:<40} {key[1]:>8} {key[2]:>8} {old_time:>9.2f} {new_time:>9.2f}"
+            f"  x{old_time / new_time:.2f}"
+        )
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("Summary")[-1])
+    parser.add_argument("--atoms", type=int, nargs="+", default=[1000])
+    parser.add_argument("--frames", type=int, nargs="+", default=[1000])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--skip",
+        nargs="*",
+        default=[],
+        choices=["ingestion", "transformations", "calculators"],
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        compare_results(*args.compare)
+        return
+
+    results = []
+    for n_atoms in args.atoms:
+        for n_frames in args.frames:
+            trajectory = SyntheticTrajectory(n_atoms=n_atoms, n_frames=n_frames)
+            with tempfile.TemporaryDirectory() as work_dir:
+                work_dir = pathlib.Path(work_dir)
+                if not {"ingestion", "calculators"} <= set(args.skip):
+                    ingestion, experiment = benchmark_ingestion(trajectory, work_dir)
+                    if "ingestion" not in args.skip:
+                        results.append(ingestion)
+                    if "calculators" not in args.skip:
+                        results.extend(benchmark_calculators(trajectory, experiment))
+                if "transformations" not in args.skip:
+                    results.extend(benchmark_transformations(trajectory, work_dir))
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {"machine": get_machine_information(), "results": results}, file, indent=2
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Synthetic trajectories of a molten salt for the benchmarks.
+"""
+import pathlib
+import typing
+
+import numpy as np
+
+from mdsuite.database.mdsuite_properties import mdsuite_properties as mdp
+from mdsuite.database.simulation_database import (
+    PropertyInfo,
+    SpeciesInfo,
+    TrajectoryChunkData,
+    TrajectoryMetadata,
+)
+from mdsuite.file_io.script_input import ScriptInput
+
+# number density of molten NaCl in 1/Angstrom^3
+number_density = 0.035
+
+# LAMMPS column names of the properties in the trajectory
+lammps_columns = {
+    mdp.positions: ["x", "y", "z"],
+    mdp.scaled_positions: ["xs", "ys", "zs"],
+    mdp.unwrapped_positions: ["xu", "yu", "zu"],
+    mdp.box_images: ["ix", "iy", "iz"],
+    mdp.velocities: ["vx", "vy", "vz"],
+    mdp.forces: ["fx", "fy", "fz"],
+    mdp.charge: ["q"],
+    mdp.kinetic_energy: ["c_KE"],
+    mdp.potential_energy: ["c_PE"],
+    mdp.stress: [f"c_Stress[{idx}]" for idx in range(1, 7)],
+}
+
+
+class SyntheticTrajectory:
+    """
+    Random walk trajectory of a 1:1 salt of Na and Cl ions.
+
+    The particles start uniformly distributed in a cubic box and perform a random
+    walk. All other properties are random numbers of a sensible magnitude. Frames are
+    generated one after another from a seed, so large trajectories can be written
+    without holding them in memory.
+
+    Attributes
+    ----------
+    n_atoms : int
+            Number of atoms, the first half is Na, the second half Cl.
+    n_frames : int
+            Number of configurations.
+    box_length : float
+            Side length of the cubic box in Angstrom.
+    sample_rate : int
+            Number of time steps between two frames.
+    """
+
+    def __init__(
+        self, n_atoms: int, n_frames: int, sample_rate: int = 10, seed: int = 0
+    ):
+        """
+        Constructor of the synthetic trajectory.
+
+        Parameters
+        ----------
+        n_atoms : int
+                Number of atoms, must be even.
+        n_frames : int
+                Number of configurations.
+        sample_rate : int
+                Number of time steps between two frames.
+        seed : int
+                Seed of the random number generator.
+        """
+        if n_atoms % 2 != 0:
+            raise ValueError("The number of atoms must be even")
+        self.n_atoms = n_atoms
+        self.n_frames = n_frames
+        self.sample_rate = sample_rate
+        self.seed = seed
+        self.box_length = (n_atoms / number_density) ** (1 / 3)
+
+        self.species = {
+            "Na": np.arange(n_atoms // 2),
+            "Cl": np.arange(n_atoms // 2, n_atoms),
+        }
+
+    def iter_frames(self) -> typing.Iterator[typing.Dict[str, np.ndarray]]:
+        """
+        Generate the frames of the trajectory.
+
+        Yields
+        ------
+        frame : dict
+                Property name -> array of shape (n_atoms, n_dims).
+        """
+        rng = np.random.default_rng(self.seed)
+        unwrapped = rng.uniform(0, self.box_length, (self.n_atoms, 3))
+        charge = np.ones((self.n_atoms, 1))
+        charge[self.species["Cl"]] = -1
+
+        for _ in range(self.n_frames):
+            velocities = rng.normal(0, 0.05, (self.n_atoms, 3))
+            unwrapped = unwrapped + velocities
+            images = np.floor(unwrapped / self.box_length)
+            positions = unwrapped - images * self.box_length
+            yield {
+                mdp.positions.name: positions,
+                mdp.scaled_positions.name: positions / self.box_length,
+                mdp.unwrapped_positions.name: unwrapped,
+                mdp.box_images.name: images,
+                mdp.velocities.name: velocities,
+                mdp.forces.name: rng.normal(0, 1, (self.n_atoms, 3)),
+                mdp.charge.name: charge,
+                mdp.kinetic_energy.name: 0.5 * np.sum(velocities**2, axis=1)[:, None],
+                mdp.potential_energy.name: rng.normal(-5, 0.5, (self.n_atoms, 1)),
+                mdp.stress.name: rng.normal(0, 1, (self.n_atoms, 6)),
+            }
+
+    def get_metadata(self, properties: typing.List[PropertyInfo]) -> TrajectoryMetadata:
+        """
+        Get the metadata of the trajectory.
+
+        Parameters
+        ----------
+        properties : list
+                The properties that are recorded for all species.
+        """
+        species_list = [
+            SpeciesInfo(name=name, n_particles=len(idxs), properties=list(properties))
+            for name, idxs in self.species.items()
+        ]
+        return TrajectoryMetadata(
+            n_configurations=self.n_frames,
+            species_list=species_list,
+            box_l=3 * [self.box_length],
+            sample_rate=self.sample_rate,
+        )
+
+    def get_script_input(self, properties: typing.List[PropertyInfo]) -> ScriptInput:
+        """
+        Get the trajectory as an in-memory file processor.
+
+        Parameters
+        ----------
+        properties : list
+                The properties to add to the experiment.
+        """
+        metadata = self.get_metadata(properties)
+        chunk = TrajectoryChunkData(metadata.species_list, self.n_frames)
+        for config_idx, frame in enumerate(self.iter_frames()):
+            for name, idxs in self.species.items():
+                for prop in properties:
+                    chunk.add_data(
+                        frame[prop.name][None, idxs], config_idx, name, prop.name
+                    )
+
+        return ScriptInput(data=chunk, metadata=metadata, name=self.get_name())
+
+    def write_lammps(self, path: typing.Union[str, pathlib.Path]):
+        """
+        Write the trajectory as a LAMMPS dump file with all properties.
+
+        Parameters
+        ----------
+        path : str|Path
+                The file to write.
+        """
+        columns = [column for names in lammps_columns.values() for column in names]
+        header = (
+            "ITEM: TIMESTEP\n{}\nITEM: NUMBER OF ATOMS\n"
+            f"{self.n_atoms}\nITEM: BOX BOUNDS pp pp pp\n"
+            + 3 * f"0.0 {self.box_length}\n"
+            + f"ITEM: ATOMS id element {' '.join(columns)}\n"
+        )
+        elements = np.empty(self.n_atoms, dtype=object)
+        for name, idxs in self.species.items():
+            elements[idxs] = name
+        prefixes = [f"{idx + 1} {element} " for idx, element in enumerate(elements)]
+        number_format = " ".join(len(columns) * ["%.6g"])
+
+        with open(path, "w") as file:
+            for step, frame in enumerate(self.iter_frames()):
+                values = np.concatenate(
+                    [frame[prop.name] for prop in lammps_columns], axis=1
+                )
+                file.write(header.format(step * self.sample_rate))
+                lines = [number_format % tuple(row) for row in values]
+                file.write("\n".join(map(str.__add__, prefixes, lines)))
+                file.write("\n")
+
+    @staticmethod
+    def get_property_names() -> typing.List[str]:
+        """Names of the properties in the trajectory."""
+        return [prop.name for prop in lammps_columns]
+
+    def get_name(self) -> str:
+        """Name of the trajectory, e.g. 'NaCl_1000_atoms_1000_frames'."""
+        return f"NaCl_{self.n_atoms}_atoms_{self.n_frames}_frames"
@@ -0,0 +1,128 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test that the calculator pipeline reproduces the calculators run one by one.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import mdsuite as mds
+from mdsuite.database.mdsuite_properties import mdsuite_properties
+from mdsuite.database.simulation_database import (
+    SpeciesInfo,
+    TrajectoryChunkData,
+    TrajectoryMetadata,
+)
+from mdsuite.file_io.script_input import ScriptInput
+
+calculators = {
+    "EinsteinDiffusionCoefficients": {"data_range": 50, "plot": False},
+    "GreenKuboDiffusionCoefficients": {"data_range": 30, "plot": False},
+}
+
+
+def get_script_input() -> ScriptInput:
+    """Random walk of two species with positions and velocities."""
+    n_part = 20
+    n_step = 400
+    rng = np.random.default_rng(42)
+
+    properties = [
+        mdsuite_properties.unwrapped_positions,
+        mdsuite_properties.velocities,
+    ]
+    species_list = [
+        SpeciesInfo(name=name, n_particles=n_part, properties=properties)
+        for name in ("A", "B")
+    ]
+    metadata = TrajectoryMetadata(
+        species_list=species_list, n_configurations=n_step, sample_rate=1
+    )
+    data = TrajectoryChunkData(species_list=species_list, chunk_size=n_step)
+    for species in species_list:
+        vel = rng.normal(size=(n_step, n_part, 3))
+        data.add_data(np.cumsum(vel, axis=0), 0, species.name, properties[0].name)
+        data.add_data(vel, 0, species.name, properties[1].name)
+
+    return ScriptInput(data=data, metadata=metadata, name="random_walk")
+
+
+@pytest.mark.parametrize("desired_memory", (None, 0.001))
+def test_calculator_pipeline(tmp_path, desired_memory):
+    """
+    Compare the results of the pipeline with separate calculator runs.
+
+    With little memory the pipeline uses smaller batches than the separate runs.
+    The Einstein windows overlap the batches and do not depend on the batch size,
+    the Green-Kubo correlation only uses the time origins within a batch.
+    """
+    rtol = {
+        "EinsteinDiffusionCoefficients": 1e-7,
+        "GreenKuboDiffusionCoefficients": 1e-7 if desired_memory is None else 1e-1,
+    }
+    os.chdir(tmp_path)
+    project = mds.Project()
+    for name in ("pipeline", "separate"):
+        exp = project.add_experiment(name, timestep=0.1, temperature=1.0, units="metal")
+        exp.add_data(get_script_input())
+
+    with mds.utils.helpers.change_memory_fraction(desired_memory=desired_memory):
+        results = project.experiments["pipeline"].run.CalculatorPipeline(**calculators)
+        for name, kwargs in calculators.items():
+            separate = getattr(project.experiments["separate"].run, name)(**kwargs)
+            for species in ("A", "B"):
+                np.testing.assert_allclose(
+                    results[name][species]["diffusion_coefficient"],
+                    separate[species]["diffusion_coefficient"],
+                    rtol=rtol[name],
+                )
+
+
+def test_atom_selection_array(tmp_path):
+    """Check that a calculator with an array atom selection is run separately."""
+    selection = {
+        "EinsteinDiffusionCoefficients": {
+            **calculators["EinsteinDiffusionCoefficients"],
+            "atom_selection": np.arange(10),
+        },
+        "GreenKuboDiffusionCoefficients": calculators["GreenKuboDiffusionCoefficients"],
+    }
+    os.chdir(tmp_path)
+    project = mds.Project()
+    for name in ("pipeline", "separate"):
+        exp = project.add_experiment(name, timestep=0.1, temperature=1.0, units="metal")
+        exp.add_data(get_script_input())
+
+    results = project.experiments["pipeline"].run.CalculatorPipeline(**selection)
+    for name, kwargs in selection.items():
+        separate = getattr(project.experiments["separate"].run, name)(**kwargs)
+        for species in ("A", "B"):
+            np.testing.assert_allclose(
+                results[name][species]["diffusion_coefficient"],
+                separate[species]["diffusion_coefficient"],
+                rtol=1e-7,
+            )
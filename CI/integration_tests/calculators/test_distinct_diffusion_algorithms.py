@@ -0,0 +1,131 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test that the collective and pairwise algorithms of the distinct diffusion
+coefficients give the same results.
+"""
+import os
+
+import jax
+import numpy as np
+import pytest
+
+import mdsuite as mds
+from mdsuite.database.mdsuite_properties import mdsuite_properties
+from mdsuite.database.simulation_database import (
+    SpeciesInfo,
+    TrajectoryChunkData,
+    TrajectoryMetadata,
+)
+from mdsuite.file_io.script_input import ScriptInput
+
+n_step = 60
+species = {"A": 3, "B": 4}
+
+
+def get_script_input(data: dict) -> ScriptInput:
+    """Put the trajectories {property: {species: array}} into a ScriptInput."""
+    properties = [getattr(mdsuite_properties, name) for name in data]
+    species_list = [
+        SpeciesInfo(name=name, n_particles=n_particles, properties=properties)
+        for name, n_particles in species.items()
+    ]
+    metadata = TrajectoryMetadata(
+        species_list=species_list,
+        n_configurations=n_step,
+        sample_rate=1,
+        box_l=[10.0, 10.0, 10.0],
+    )
+    chunk = TrajectoryChunkData(species_list=species_list, chunk_size=n_step)
+    for prop in properties:
+        for name, values in data[prop.name.lower()].items():
+            chunk.add_data(values, 0, name, prop.name)
+
+    return ScriptInput(data=chunk, metadata=metadata, name="two_species")
+
+
+@pytest.fixture()
+def project(tmp_path) -> mds.Project:
+    """Project with a two species trajectory."""
+    os.chdir(tmp_path)
+    rng = np.random.default_rng(7)
+    velocities = {
+        name: rng.normal(size=(n_step, n_particles, 3))
+        for name, n_particles in species.items()
+    }
+    positions = {name: np.cumsum(values, axis=0) for name, values in velocities.items()}
+
+    project = mds.Project()
+    experiment = project.add_experiment(
+        "two_species", timestep=0.1, temperature=1.0, units="metal"
+    )
+    experiment.add_data(
+        get_script_input({"velocities": velocities, "unwrapped_positions": positions})
+    )
+
+    return project
+
+
+@pytest.fixture()
+def enable_x64():
+    """Compute with jax in double precision, it uses float32 by default."""
+    jax.config.update("jax_enable_x64", True)
+    yield
+    jax.config.update("jax_enable_x64", False)
+
+
+@pytest.mark.parametrize(
+    "calculator",
+    ["GreenKuboDistinctDiffusionCoefficients", "EinsteinDistinctDiffusionCoefficients"],
+)
+def test_collective_matches_pairwise(project, enable_x64, calculator):
+    """
+    Test the collective algorithm against the pairwise one for all species pairs.
+
+    The pairwise Einstein MSD is computed with jax, so it is only as accurate as
+    the collective one in double precision.
+    """
+    experiment = project.experiments["two_species"]
+    computations = {
+        algorithm: getattr(experiment.run, calculator)(
+            data_range=20, correlation_time=5, algorithm=algorithm, plot=False
+        )
+        for algorithm in ["collective", "pairwise"]
+    }
+    # the algorithm is part of the computation arguments
+    assert computations["collective"].id != computations["pairwise"].id
+    results = {
+        algorithm: computation.data_dict
+        for algorithm, computation in computations.items()
+    }
+    collective = results["collective"]
+    pairwise = results["pairwise"]
+
+    assert sorted(collective) == ["A_A", "A_B", "B_B"]
+    assert sorted(collective) == sorted(pairwise)
+    for combination, data in collective.items():
+        assert data["diffusion_coefficient"] != 0
+        for key, value in data.items():
+            np.testing.assert_allclose(value, pairwise[combination][key], rtol=1e-7)
@@ -42,8 +42,9 @@ from mdsuite.database.simulation_database import (
 from mdsuite.file_io.script_input import ScriptInput
 
 
+@pytest.mark.parametrize("algorithm", ("window", "fft"))
 @pytest.mark.parametrize("desired_memory", (None, 0.001))
-def test_calculator(tmp_path, desired_memory):
+def test_calculator(tmp_path, desired_memory, algorithm):
     """
     Check correctness of the msd and diffusion coefficient by generating data
     where these quantities are known.
@@ -85,7 +86,7 @@ def test_calculator(tmp_path, desired_memory):
         exp.add_data(proc)
 
         res = exp.run.EinsteinDiffusionCoefficients(
-            plot=False, correlation_time=1, data_range=msd_range
+            plot=False, correlation_time=1, data_range=msd_range, algorithm=algorithm
         )[species.name]
 
         time_should_be = time_step * np.arange(0, msd_range) * units.time
@@ -97,3 +98,40 @@ def test_calculator(tmp_path, desired_memory):
         np.testing.assert_allclose(
             res["diffusion_coefficient"], diff_coeff_should_be, rtol=2e-1
         )
+
+
+def test_fft_tau_values_list(tmp_path):
+    """Check the fft msd at a list of tau values against the msd at all lags."""
+    n_part = 5
+    n_step = 100
+    tau_values = [0, 2, 5, 8, 10, 13, 16, 19]
+
+    rng = np.random.default_rng(3)
+    pos = np.cumsum(rng.normal(size=(n_step, n_part, 3)), axis=0)
+
+    os.chdir(tmp_path)
+    project = mds.Project()
+    exp = project.add_experiment("tau_values", timestep=0.1, temperature=1.0)
+
+    pos_prop = mdsuite_properties.unwrapped_positions
+    species = SpeciesInfo(name="test_species", n_particles=n_part, properties=[pos_prop])
+    metadata = TrajectoryMetadata(
+        species_list=[species], n_configurations=n_step, sample_rate=1
+    )
+    data = TrajectoryChunkData(species_list=[species], chunk_size=n_step)
+    data.add_data(pos, 0, species.name, pos_prop.name)
+    exp.add_data(ScriptInput(data=data, metadata=metadata, name="test_name"))
+
+    res = exp.run.EinsteinDiffusionCoefficients(
+        plot=False,
+        data_range=20,
+        tau_values=tau_values,
+        fit_range=len(tau_values) - 1,
+        algorithm="fft",
+    )[species.name]
+    res_all = exp.run.EinsteinDiffusionCoefficients(
+        plot=False, data_range=20, algorithm="fft"
+    )[species.name]
+
+    np.testing.assert_allclose(res["msd"], np.array(res_all["msd"])[tau_values])
+    np.testing.assert_allclose(res["time"], np.array(res_all["time"])[tau_values])
@@ -0,0 +1,199 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test the Green-Kubo calculators on trajectories and batches that are short compared
+to the data range.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import mdsuite as mds
+from mdsuite.database.mdsuite_properties import mdsuite_properties
+from mdsuite.database.simulation_database import (
+    SpeciesInfo,
+    TrajectoryChunkData,
+    TrajectoryMetadata,
+)
+from mdsuite.file_io.script_input import ScriptInput
+
+n_step = 50
+data_range = 30
+
+
+def get_script_input(name: str, prop, n_particles: int, data: np.ndarray):
+    """Put a trajectory of shape (n_step, n_particles, 3) into a ScriptInput."""
+    species_list = [SpeciesInfo(name=name, n_particles=n_particles, properties=[prop])]
+    metadata = TrajectoryMetadata(
+        species_list=species_list,
+        n_configurations=n_step,
+        sample_rate=1,
+        box_l=[2.0, 2.0, 2.0],
+    )
+    chunk = TrajectoryChunkData(species_list=species_list, chunk_size=n_step)
+    chunk.add_data(data, 0, name, prop.name)
+
+    return ScriptInput(data=chunk, metadata=metadata, name=name)
+
+
+def chunked_acf(data: np.ndarray, chunks: list) -> np.ndarray:
+    """ACF of (n_particles, n_configurations, 3) averaged over the origins in chunks."""
+    acf = np.zeros(data_range)
+    count = np.zeros(data_range)
+    start = 0
+    for size in chunks:
+        chunk = data[:, start : start + size]
+        for lag in range(min(size, data_range)):
+            acf[lag] += np.sum(chunk[:, : size - lag] * chunk[:, lag:])
+            count[lag] += data.shape[0] * (size - lag)
+        start += size
+
+    return acf / count
+
+
+@pytest.fixture()
+def project(tmp_path) -> mds.Project:
+    """Project with a momentum flux and the velocities of a species."""
+    os.chdir(tmp_path)
+    rng = np.random.default_rng(42)
+    project = mds.Project()
+    experiment = project.add_experiment(
+        "short", timestep=0.1, temperature=1.0, units="metal"
+    )
+    experiment.add_data(
+        get_script_input(
+            "Observables",
+            mdsuite_properties.momentum_flux,
+            1,
+            rng.normal(size=(n_step, 1, 3)),
+        )
+    )
+    experiment.add_data(
+        get_script_input(
+            "A", mdsuite_properties.velocities, 5, rng.normal(size=(n_step, 5, 3))
+        )
+    )
+
+    return project
+
+
+def test_viscosity_single_block(project):
+    """
+    Test the viscosity of a trajectory shorter than two data ranges.
+
+    Only one non-overlapping block fits, so the uncertainty is zero and the value
+    is the integral of the averaged ACF.
+    """
+    experiment = project.experiments["short"]
+    flux = np.asarray(
+        experiment.load_matrix("Momentum_Flux", ["Observables"])[
+            "Observables/Momentum_Flux"
+        ]
+    )
+
+    result = experiment.run.GreenKuboViscosity(data_range=data_range, plot=False)
+    data = result["System"]
+
+    acf = data_range * chunked_acf(flux, [n_step])
+    np.testing.assert_allclose(data["acf"], acf)
+    units = experiment.units
+    prefactor = (
+        units.pressure**2
+        * units.volume
+        * units.time
+        / units.energy
+        / (3 * (data_range - 1) * units.boltzmann * experiment.volume)
+    )
+    np.testing.assert_allclose(
+        data["viscosity"], prefactor * np.trapz(acf, x=data["time"])
+    )
+    assert data["uncertainty"] == 0
+
+
+def test_short_batches(project):
+    """Test that batches shorter than the data range add to the ACFs."""
+    experiment = project.experiments["short"]
+    chunks = [40, n_step - 40]
+
+    flux = np.asarray(
+        experiment.load_matrix("Momentum_Flux", ["Observables"])[
+            "Observables/Momentum_Flux"
+        ]
+    )
+    calculator = mds.calculators.GreenKuboViscosity(experiment=experiment)
+    type(calculator).__call__.__wrapped__(calculator, data_range=data_range)
+    for start, stop in zip(np.cumsum([0] + chunks[:-1]), np.cumsum(chunks)):
+        calculator.ensemble_operation(flux[:, start:stop])
+    calculator._apply_averaging_factor()
+    np.testing.assert_allclose(calculator.jacf, data_range * chunked_acf(flux, chunks))
+
+    velocities = np.asarray(experiment.load_matrix("Velocities", ["A"])["A/Velocities"])
+    calculator = mds.calculators.GreenKuboDiffusionCoefficients(experiment=experiment)
+    type(calculator).__call__.__wrapped__(calculator, data_range=data_range)
+    calculator.start_subject("A")
+    for start, stop in zip(np.cumsum([0] + chunks[:-1]), np.cumsum(chunks)):
+        calculator.batch_operation("A", {b"A/Velocities": velocities[:, start:stop]})
+    units = experiment.units
+    np.testing.assert_allclose(
+        calculator.acf_array / calculator.count,
+        units.length**2 / units.time**2 * chunked_acf(velocities, chunks),
+    )
+
+
+def test_distinct_short_batches(project):
+    """Test that batches shorter than the data range add to the distinct VACF."""
+    experiment = project.experiments["short"]
+    chunks = [40, n_step - 40]
+    velocities = np.asarray(experiment.load_matrix("Velocities", ["A"])["A/Velocities"])
+    n_particles = velocities.shape[0]
+
+    # correlation of each particle with the mean of all particles minus itself
+    vacf = np.zeros(data_range)
+    count = np.zeros(data_range)
+    start = 0
+    for size in chunks:
+        chunk = velocities[:, start : start + size]
+        for lag in range(min(size, data_range)):
+            collective = np.sum(chunk[:, lag:], axis=0) / n_particles
+            vacf[lag] += np.sum(chunk[:, : size - lag] * collective) / 3
+            vacf[lag] -= np.sum(chunk[:, : size - lag] * chunk[:, lag:]) / 3
+            count[lag] += n_particles * (size - lag)
+        start += size
+
+    calculator = mds.calculators.GreenKuboDistinctDiffusionCoefficients(
+        experiment=experiment
+    )
+    type(calculator).__call__.__wrapped__(
+        calculator, data_range=data_range, species=["A"]
+    )
+    dict_ref = [b"A/Velocities", b"A/Velocities"]
+    for start, stop in zip(np.cumsum([0] + chunks[:-1]), np.cumsum(chunks)):
+        data = {item: velocities[:, start:stop] for item in dict_ref}
+        calculator.ensemble_operation(data, dict_ref, same_species=True)
+
+    np.testing.assert_allclose(calculator.vacf / calculator.count, vacf / count)
+    # only the full batch is used for the uncertainty
+    assert len(calculator.sigma) == n_particles
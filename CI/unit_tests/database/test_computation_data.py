@@ -0,0 +1,76 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test the lazy access to the results of computations.
+"""
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+import mdsuite.database.scheme as db
+from mdsuite.database.result_store import write_arrays
+
+
+def test_computation_data(tmp_path):
+    """Read results and scalars after the computations were detached."""
+    engine = sa.create_engine(f"sqlite+pysqlite:///{tmp_path / 'project.db'}")
+    db.Base.metadata.create_all(engine)
+    references = write_arrays(
+        tmp_path, tmp_path / "results.hdf5", "1", {"msd": np.arange(100)}
+    )
+    with Session(engine) as ses:
+        sodium = db.ExperimentSpecies(name="Na")
+        for coefficient in (1.0, 2.0):
+            computation = db.Computation(name="Test")
+            result = db.ComputationResult(
+                computation=computation,
+                data={"diffusion_coefficient": coefficient, **references},
+            )
+            result.species.append(db.SpeciesAssociation(species=sodium))
+            ses.add(result)
+        system = db.ComputationResult(computation=computation, data={"volume": 3.0})
+        ses.add(system)
+        ses.commit()
+
+        computations = ses.query(db.Computation).order_by(db.Computation.id).all()
+        for computation in computations:
+            _ = computation.engine
+
+    data = computations[1].data_dict
+    assert data._result_ids is None
+    assert list(data) == ["Na", "System"]
+    assert len(data._data) == 0
+    assert data["Na"]["diffusion_coefficient"] == 2.0
+    np.testing.assert_array_equal(data["Na"]["msd"], np.arange(100))
+    assert computations[1]["System"]["volume"] == 3.0
+
+    scalars = db.Computation.load_scalars(computations, keys=["diffusion_coefficient"])
+    assert scalars == [
+        {"Na": {"diffusion_coefficient": 1.0}},
+        {"Na": {"diffusion_coefficient": 2.0}, "System": {}},
+    ]
+    assert db.Computation.load_scalars(computations[1:])[0]["System"] == {
+        "volume": 3.0
+    }
@@ -0,0 +1,88 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test the fingerprint of computations and the migration of older databases.
+"""
+import dataclasses
+import types
+
+import numpy as np
+import sqlalchemy as sa
+
+from mdsuite.database.calculator_database import CalculatorDatabase
+from mdsuite.database.database_base import DatabaseBase
+
+
+@dataclasses.dataclass
+class Args:
+    """Arguments of a test calculator."""
+
+    data_range: int
+    tau_values: np.ndarray
+
+
+def get_calculator(data_range: int = 10, tau_values=np.arange(2000), version=1):
+    """Create the database part of a calculator for a mock experiment."""
+    experiment = types.SimpleNamespace(
+        name="NaCl", version=version, read_files=["traj.lammpstraj"]
+    )
+    calculator = CalculatorDatabase(experiment)
+    calculator.analysis_name = "Test"
+    calculator.args = Args(data_range=data_range, tau_values=tau_values)
+    return calculator
+
+
+def test_get_fingerprint():
+    """Test that the fingerprint changes with every identifying argument."""
+    fingerprint = get_calculator().get_fingerprint()
+    assert fingerprint == get_calculator().get_fingerprint()
+    assert fingerprint != get_calculator(data_range=11).get_fingerprint()
+    assert fingerprint != get_calculator(version=2).get_fingerprint()
+    # large arrays are hashed completely, not as their truncated string
+    tau_values = np.arange(2000)
+    tau_values[1000] = -1
+    assert fingerprint != get_calculator(tau_values=tau_values).get_fingerprint()
+
+
+def test_add_missing_columns(tmp_path):
+    """Test that the fingerprint column is added to an older project database."""
+    database = DatabaseBase(database_name="project.db")
+    database.storage_path = tmp_path
+    with database.engine.begin() as connection:
+        connection.execute(
+            sa.text("CREATE TABLE computations (id INTEGER PRIMARY KEY, name VARCHAR)")
+        )
+        connection.execute(sa.text("INSERT INTO computations VALUES (1, 'Test')"))
+
+    database.build_database()
+
+    inspector = sa.inspect(database.engine)
+    columns = [column["name"] for column in inspector.get_columns("computations")]
+    assert "fingerprint" in columns
+    indexes = [index["column_names"] for index in inspector.get_indexes("computations")]
+    assert ["fingerprint"] in indexes
+    with database.engine.connect() as connection:
+        rows = connection.execute(sa.text("SELECT * FROM computations")).all()
+    assert len(rows) == 1
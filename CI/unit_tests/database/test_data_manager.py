@@ -0,0 +1,91 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test the ensemble blocks and the batch overlap of the data manager.
+"""
+import numpy as np
+import pytest
+
+from mdsuite.database.data_manager import BatchOverlap, DataManager
+
+
+@pytest.mark.parametrize("correlation_time", [1, 3])
+@pytest.mark.parametrize("ensemble_block_size", [1, 4, 100])
+def test_ensemble_block_generator(correlation_time, ensemble_block_size):
+    """Compare the blocks with the windows of every time origin."""
+    data = np.random.default_rng(42).normal(size=(2, 30, 3))
+    data_manager = DataManager(
+        data_range=7,
+        correlation_time=correlation_time,
+        ensemble_block_size=ensemble_block_size,
+    )
+
+    blocks = list(
+        data_manager.ensemble_block_generator({b"Na/Positions": data, b"data_size": 30})
+    )
+    windows = np.concatenate([block[b"Na/Positions"] for block in blocks], axis=1)
+
+    origins = range(0, 30 - 7 + 1, correlation_time)
+    assert windows.shape == (2, len(origins), 7, 3)
+    assert all(block[b"Na/Positions"].shape[1] <= ensemble_block_size for block in blocks)
+    for idx, origin in enumerate(origins):
+        np.testing.assert_array_equal(windows[:, idx], data[:, origin : origin + 7])
+
+
+def test_ensemble_block_generator_short_batch():
+    """A batch shorter than the data range has no time origins."""
+    data_manager = DataManager(data_range=7, ensemble_block_size=4)
+
+    blocks = data_manager.ensemble_block_generator(
+        {b"Na/Positions": np.zeros((2, 5, 3)), b"data_size": 5}
+    )
+
+    assert list(blocks) == []
+
+
+@pytest.mark.parametrize("correlation_time", [1, 3, 9])
+@pytest.mark.parametrize("batch_size", [4, 7, 12])
+def test_batch_overlap(correlation_time, batch_size):
+    """Check that the joined batches contain every time origin exactly once."""
+    data = np.random.default_rng(42).normal(size=(2, 50, 3))
+    data_manager = DataManager(
+        data_range=7, correlation_time=correlation_time, ensemble_block_size=2
+    )
+    batch_overlap = BatchOverlap(data_range=7, correlation_time=correlation_time)
+
+    windows = []
+    for start in range(0, 50, batch_size):
+        batch = {
+            b"Na/Positions": data[:, start : start + batch_size],
+            b"data_size": batch_size,
+        }
+        for block in data_manager.ensemble_block_generator(batch_overlap(batch)):
+            windows.append(block[b"Na/Positions"])
+    windows = np.concatenate(windows, axis=1)
+
+    origins = range(0, 50 - 7 + 1, correlation_time)
+    assert windows.shape == (2, len(origins), 7, 3)
+    for idx, origin in enumerate(origins):
+        np.testing.assert_array_equal(windows[:, idx], data[:, origin : origin + 7])
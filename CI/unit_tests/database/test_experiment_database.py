@@ -33,7 +33,11 @@ from zinchub import DataHub
 
 import mdsuite as mds
 import mdsuite.file_io.lammps_trajectory_files
-from mdsuite.database.simulation_database import MoleculeInfo, SpeciesInfo
+from mdsuite.database.simulation_database import (
+    MoleculeGroups,
+    MoleculeInfo,
+    SpeciesInfo,
+)
 
 
 @pytest.fixture(scope="session")
@@ -152,6 +156,34 @@ def test_molecules(tmp_path):
     assert project_2.experiments["Exp01"].molecules == molecule
 
 
+def test_molecule_groups(tmp_path):
+    """Test that the molecule groups are stored as index arrays and loaded lazily."""
+    os.chdir(tmp_path)
+    groups = {str(i): {"H": [2 * i, 2 * i + 1], "O": [i]} for i in range(100)}
+    molecule = {
+        "water": MoleculeInfo(
+            name="water", properties=[], mass=18, groups=groups, n_particles=100
+        )
+    }
+
+    project_1 = mds.Project()
+    project_1.add_experiment(name="Exp01")
+    project_1.experiments["Exp01"].molecules = molecule
+
+    with project_1.session as ses:
+        water = ses.query(mds.database.scheme.ExperimentSpecies).first()
+        assert "groups" not in water.data
+        assert isinstance(water.groups, bytes)
+
+    project_2 = mds.Project()
+    water = project_2.experiments["Exp01"].molecules["water"]
+    assert isinstance(water.groups, MoleculeGroups)
+    assert repr(water.groups) == "MoleculeGroups(not loaded)"
+    assert water.n_particles == 100
+    assert water.groups["3"] == {"H": [6, 7], "O": [3]}
+    assert project_2.experiments["Exp01"].molecules == molecule
+
+
 def test_project_box_array(tmp_path):
     """Test that the project description is stored correctly in the database."""
     os.chdir(tmp_path)
@@ -225,3 +257,36 @@ def test_experiment_units(tmp_path):
 
     assert project_2.experiments["Exp01"].units == mds.units.SI
     assert project_2.experiments["Exp02"].units == custom_units
+
+
+def test_batch_writes(tmp_path):
+    """Test that batched attributes are only written when the batch is closed."""
+    os.chdir(tmp_path)
+    project_1 = mds.Project()
+    experiment = project_1.add_experiment(name="Exp01")
+    experiment.number_of_configurations = 0
+
+    with experiment.batch_writes():
+        for _ in range(10):
+            experiment.number_of_configurations += 10
+        with experiment.batch_writes():
+            experiment.box_array = (1.0, 2.0, 3.0)
+        assert experiment.number_of_configurations == 100
+        assert experiment.box_array == [1.0, 2.0, 3.0]
+
+        project_2 = mds.Project()
+        assert project_2.experiments["Exp01"].number_of_configurations == 0
+        assert project_2.experiments["Exp01"].box_array is None
+
+    project_2 = mds.Project()
+    assert project_2.experiments["Exp01"].number_of_configurations == 100
+    assert project_2.experiments["Exp01"].box_array == [1.0, 2.0, 3.0]
+
+
+def test_journal_mode(tmp_path):
+    """Test that the project database is used in WAL mode."""
+    os.chdir(tmp_path)
+    project = mds.Project()
+    with project.engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    assert journal_mode == "wal"
@@ -2,6 +2,7 @@
 import numpy as np
 
 import mdsuite
+import mdsuite.file_io.lammps_trajectory_files as lammps_trajectory_files
 import mdsuite.file_io.script_input as script_input
 from mdsuite.database.simulation_database import (
     PropertyInfo,
@@ -133,3 +134,69 @@ def test_read_script_input(tmp_path):
 
     np.testing.assert_array_almost_equal(positions, pos_loaded, decimal=err_decimal)
     np.testing.assert_array_almost_equal(velocities, vel_loaded, decimal=err_decimal)
+
+
+def test_read_unsorted_lammps_trajectory(tmp_path):
+    n_configs = 7
+    n_parts = 6
+    rng = np.random.default_rng(0)
+    positions = rng.random((n_configs, n_parts, 3))
+    velocities = rng.random((n_configs, n_parts, 3))
+
+    file_path = tmp_path / "traj.lammpstraj"
+    with open(file_path, "w") as file:
+        for config in range(n_configs):
+            file.write(
+                f"ITEM: TIMESTEP\n{10 * config}\nITEM: NUMBER OF ATOMS\n{n_parts}\n"
+                "ITEM: BOX BOUNDS pp pp pp\n0 1\n0 1\n0 1\n"
+                "ITEM: ATOMS id element x y z vx vy vz\n"
+            )
+            for idx in rng.permutation(n_parts):
+                element = "Na" if idx % 2 == 0 else "Cl"
+                row = [*positions[config, idx], *velocities[config, idx]]
+                values = " ".join(str(val) for val in row)
+                file.write(f"{idx + 1} {element} {values}\n")
+
+    proc = lammps_trajectory_files.LAMMPSTrajectoryFile(file_path)
+    chunks = [chunk.get_data() for chunk in proc.get_configurations_generator()]
+
+    for name, idxs in [("Na", [0, 2, 4]), ("Cl", [1, 3, 5])]:
+        pos_read = np.concatenate([chunk[name]["Positions"] for chunk in chunks])
+        vel_read = np.concatenate([chunk[name]["Velocities"] for chunk in chunks])
+        np.testing.assert_array_equal(pos_read, positions[:, idxs])
+        np.testing.assert_array_equal(vel_read, velocities[:, idxs])
+
+
+def test_read_lammps_trajectory_parallel(tmp_path, monkeypatch):
+    n_configs = 23
+    n_parts = 4
+    rng = np.random.default_rng(1)
+    positions = rng.random((n_configs, n_parts, 3))
+
+    file_path = tmp_path / "traj.lammpstraj"
+    with open(file_path, "w") as file:
+        for config in range(n_configs):
+            file.write(
+                f"ITEM: TIMESTEP\n{10 * config}\nITEM: NUMBER OF ATOMS\n{n_parts}\n"
+                "ITEM: BOX BOUNDS pp pp pp\n0 1\n0 1\n0 1\n"
+                "ITEM: ATOMS id type x y z\n"
+            )
+            for idx in rng.permutation(n_parts):
+                values = " ".join(str(val) for val in positions[config, idx])
+                file.write(f"{idx + 1} 1 {values}\n")
+
+    proc = lammps_trajectory_files.LAMMPSTrajectoryFile(file_path)
+    offsets = proc._get_config_byte_offsets()
+    with open(file_path, "rb") as file:
+        for offset in offsets:
+            file.seek(offset)
+            assert file.readline() == b"ITEM: TIMESTEP\n"
+
+    monkeypatch.setattr(mdsuite.config, "file_io_workers", 2)
+    monkeypatch.setattr(mdsuite.config, "file_io_parallel_min_bytes", 0)
+    chunks = list(proc.get_configurations_generator())
+
+    assert len(chunks) > 1
+    assert sum(chunk.chunk_size for chunk in chunks) == n_configs
+    pos_read = np.concatenate([chunk.get_data()["1"]["Positions"] for chunk in chunks])
+    np.testing.assert_array_equal(pos_read, positions)
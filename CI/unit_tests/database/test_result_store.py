@@ -0,0 +1,75 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Test the binary store of computation results.
+"""
+import json
+
+import numpy as np
+
+from mdsuite.database.result_store import (
+    ResultData,
+    is_reference,
+    split_arrays,
+    write_arrays,
+)
+
+
+def test_split_arrays():
+    """Test that only large numeric arrays are separated."""
+    data = {
+        "time": list(range(10)),
+        "msd": np.ones(10),
+        "gradients": [1.0, 2.0],
+        "species": ["Na", "Cl", "Na", "Cl", "Na", "Cl", "Na", "Cl", "Na", "Cl"],
+        "ragged": [[1], [1, 2]],
+        "diffusion_coefficient": 1.2,
+    }
+    other, arrays = split_arrays(data, min_size=5)
+    assert set(arrays) == {"time", "msd"}
+    assert set(other) == {"gradients", "species", "ragged", "diffusion_coefficient"}
+
+
+def test_result_data(tmp_path):
+    """Test that the referenced arrays are read when they are accessed."""
+    store = tmp_path / "experiment" / "results.hdf5"
+    store.parent.mkdir()
+    msd = np.linspace(0, 1, 100)
+    references = write_arrays(tmp_path, store, "1", {"msd": msd})
+    # the references are stored as JSON in the SQL database
+    data = json.loads(json.dumps({"msd": references["msd"], "uncertainty": 0.1}))
+    assert data["msd"]["result_store"] == "experiment/results.hdf5"
+
+    result = ResultData(data, tmp_path)
+    assert is_reference(dict.__getitem__(result, "msd"))
+    np.testing.assert_array_equal(result["msd"], msd)
+    assert not is_reference(dict.__getitem__(result, "msd"))
+    assert result.get("uncertainty") == 0.1
+    assert result.get("time") is None
+    np.testing.assert_array_equal(dict(result.items())["msd"], msd)
+
+    # writing the same group again replaces the arrays
+    write_arrays(tmp_path, store, "1", {"msd": 2 * msd})
+    np.testing.assert_array_equal(ResultData(data, tmp_path)["msd"], 2 * msd)
@@ -25,12 +25,20 @@ Test for module for the simulation database.
 """
 import os
 import tempfile
+import threading
 import unittest
 
 import h5py as hf
 import numpy as np
+import pytest
 
-from mdsuite.database.simulation_database import Database
+from mdsuite.database.simulation_database import (
+    Database,
+    DatasetInfo,
+    MoleculeGroups,
+    StorageLayout,
+    keep_files_open,
+)
 
 
 class TestScalingFunctions(unittest.TestCase):
@@ -144,3 +152,254 @@ class TestScalingFunctions(unittest.TestCase):
         assert database.check_existence("Na/Forces")
         os.chdir("..")
         temp_dir.cleanup()
+
+    def test_storage_layout(self):
+        """
+        Test the chunking and compression of the storage layout.
+
+        Returns
+        -------
+        Checks the chunk shapes, the filters and that the layout is recorded in
+        the database file.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        layout = StorageLayout(chunk_configurations=50, chunk_particles=20)
+        database = Database(layout=layout)
+        database.initialize_database(
+            {"Na": {"Forces": (200, 5000, 3)}, "Temperature": (5000, 1)}
+        )
+        database.resize_datasets({"Cl": {"Forces": (10, 100, 3)}})
+        with hf.File("database") as db:
+            assert db["Na/Forces"].chunks == (20, 50, 3)
+            assert db["Cl/Forces"].chunks == (10, 50, 3)
+            assert db["Temperature"].chunks == (50, 1)
+            assert db["Na/Forces"].compression == "lzf"
+            assert db["Na/Forces"].shuffle
+
+        assert Database().get_storage_layout() == layout
+        assert Database().layout == layout
+
+        uncompressed = StorageLayout(compression=None, max_chunk_bytes=128 * 3 * 4 * 7)
+        assert uncompressed.get_chunk_shape((200, 5000, 3)) == (7, 128, 3)
+        assert uncompressed.get_filter_kwargs() == {
+            "compression": None,
+            "compression_opts": None,
+            "shuffle": False,
+        }
+        with pytest.raises(ValueError):
+            StorageLayout(compression="snappy")
+        os.chdir("..")
+        temp_dir.cleanup()
+
+    def test_file_handles(self):
+        """
+        Test the reuse and closing of the database file handles.
+
+        Returns
+        -------
+        Checks that the handle is shared and upgraded for writing during an
+        operation and closed afterwards.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        database = Database()
+        database.initialize_database({"Na": {"Forces": (200, 5000, 3)}})
+        with database._open("r") as handle:
+            with Database()._open("r") as other_handle:
+                assert other_handle is handle
+        assert not handle.id.valid
+
+        with keep_files_open():
+            with database._open("r") as handle:
+                assert handle.mode == "r"
+            assert handle.id.valid
+            assert database.get_data_size("Na/Forces")[:2] == (200, 5000)
+            database.resize_datasets({"Na": {"Forces": (200, 300, 3)}})
+            with database._open("r") as handle:
+                assert handle.mode == "r+"
+                assert handle["Na/Forces"].shape == (200, 5300, 3)
+            with keep_files_open():
+                pass
+            assert handle.id.valid
+        assert not handle.id.valid
+
+        # without open handles, the file can be opened for writing elsewhere
+        with hf.File(database.path, "a"):
+            pass
+        os.chdir("..")
+        temp_dir.cleanup()
+
+    def test_file_handle_upgrade_with_reader(self):
+        """
+        Test upgrading a file handle for writing while it is read.
+
+        Returns
+        -------
+        Checks that a writer waits until another thread stops reading and that the
+        same thread can not upgrade a handle it reads through.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        database = Database()
+        database.initialize_database({"Na": {"Forces": (2, 10, 3)}})
+        reading = threading.Event()
+        stop_reading = threading.Event()
+        read_shapes = []
+
+        def read():
+            with database._open("r") as handle:
+                reading.set()
+                stop_reading.wait(10)
+                read_shapes.append(handle["Na/Forces"][:].shape)
+
+        def write():
+            database.resize_datasets({"Na": {"Forces": (2, 5, 3)}})
+
+        with keep_files_open():
+            reader = threading.Thread(target=read)
+            reader.start()
+            reading.wait(10)
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.5)
+            assert writer.is_alive()
+            stop_reading.set()
+            reader.join(10)
+            writer.join(10)
+            assert read_shapes == [(2, 10, 3)]
+            assert database.get_data_size("Na/Forces")[:2] == (2, 15)
+
+        with database._open("r") as handle:
+            assert handle.mode == "r"
+            with pytest.raises(RuntimeError):
+                with database._open("r+"):
+                    pass
+        os.chdir("..")
+        temp_dir.cleanup()
+
+    def test_dataset_index(self):
+        """
+        Test the dataset metadata index.
+
+        Returns
+        -------
+        Checks the index entries and that they are updated after writes.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        database = Database()
+        database.initialize_database({"Na": {"Forces": (200, 5000, 3)}})
+        index = database.get_dataset_index()
+        assert index["Na/Forces"] == DatasetInfo("Na/Forces", (200, 5000, 3), "float32")
+        assert Database().get_dataset_index() is index
+        assert database.get_data_size("Na/Forces") == (200, 5000, 200 * 5000 * 3 * 4)
+        assert database.check_existence("Forces")
+        assert not database.check_existence("orces")
+
+        database.resize_datasets({"Na": {"Forces": (200, 300, 3)}})
+        assert database.get_dataset_index()["Na/Forces"].shape == (200, 5300, 3)
+        assert database.get_memory_information() == {"Na/Forces": 200 * 5300 * 3 * 4}
+        os.chdir("..")
+        temp_dir.cleanup()
+
+    def test_memory_map(self):
+        """
+        Test loading memory-mapped contiguous datasets.
+
+        Returns
+        -------
+        Checks that contiguous datasets are mapped, resized and loaded with the same
+        values as through h5py and that slices of them are not copied.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        with pytest.raises(ValueError):
+            StorageLayout(contiguous=True)
+
+        database = Database(layout=StorageLayout(compression=None, contiguous=True))
+        database.initialize_database({"Na": {"Forces": (5, 20, 3)}})
+        database.resize_datasets({"Na": {"Forces": (5, 10, 3)}})
+        forces = np.random.rand(5, 30, 3).astype(np.float32)
+        with database._open("r+") as db:
+            assert db["Na/Forces"].chunks is None
+            assert db["Na/Forces"].attrs["starting_index"] == 0
+            db["Na/Forces"][:] = forces
+
+        for select_slice in [np.s_[:], np.s_[1:3, 4:9], np.s_[[0, 2], [1, 5, 7]]]:
+            mapped = database.load_data(
+                ["Na/Forces"], select_slice=select_slice, memory_map=True
+            )["Na/Forces"]
+            loaded = database.load_data(
+                ["Na/Forces"], select_slice=select_slice, memory_map=False
+            )["Na/Forces"]
+            assert isinstance(mapped, np.ndarray)
+            assert mapped.dtype == np.float64
+            np.testing.assert_array_equal(mapped, loaded.numpy())
+
+        # slices of the float64 datasets are views of the file
+        with database._open("r") as db:
+            assert db["Na/Forces"].dtype == np.float64
+        mapped = database.load_data(
+            ["Na/Forces"], select_slice=np.s_[1:3, 4:9], memory_map=True
+        )["Na/Forces"]
+        assert isinstance(mapped.base, np.memmap)
+        assert np.shares_memory(mapped, mapped.base)
+        assert not mapped.flags.owndata and not mapped.flags.writeable
+
+        scaled = database.load_data(["Na/Forces"], scaling=[2.0], memory_map=True)
+        np.testing.assert_array_equal(scaled["Na/Forces"], 2.0 * forces)
+        with database._open("r") as db:
+            assert isinstance(database._get_memory_map(db["Na/Forces"]), np.memmap)
+        database.close()
+        os.chdir("..")
+        temp_dir.cleanup()
+
+    def test_resize_contiguous_dataset(self):
+        """
+        Test resizing a contiguous dataset block-wise.
+
+        Returns
+        -------
+        Checks that the values and attributes of the dataset are kept when it is
+        copied in blocks which are smaller than the dataset.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(temp_dir.name)
+        database = Database(layout=StorageLayout(compression=None, contiguous=True))
+        database.initialize_database({"Na": {"Forces": (5, 20, 3)}})
+        forces = np.random.rand(5, 20, 3)
+        with database._open("r+") as db:
+            db["Na/Forces"][:] = forces
+            db["Na/Forces"].attrs["starting_index"] = 20
+            # 5 * 3 float64 per configuration, i.e. blocks of 3 configurations
+            database._resize_contiguous_dataset(
+                db, "Na/Forces", 27, axis=1, max_copy_bytes=3 * 120
+            )
+            assert db["Na/Forces"].shape == (5, 27, 3)
+            assert db["Na/Forces"].chunks is None
+            assert db["Na/Forces"].attrs["starting_index"] == 20
+            assert "Na/Forces_resized" not in db
+            np.testing.assert_array_equal(db["Na/Forces"][:, :20], forces)
+        database.close()
+        os.chdir("..")
+        temp_dir.cleanup()
+
+def test_molecule_groups():
+    """Test encoding the groups of molecules as index arrays."""
+    groups = {"0": {"H": [0, 1], "O": [0]}, "1": {"H": [3, 2], "O": []}}
+    molecule_groups = MoleculeGroups.from_dict(groups)
+    assert molecule_groups == groups
+    assert molecule_groups[1] == {"H": [3, 2], "O": []}
+
+    indices, molecules = molecule_groups.particles("H")
+    np.testing.assert_array_equal(indices, [0, 1, 3, 2])
+    np.testing.assert_array_equal(molecules, [0, 0, 1, 1])
+
+    data = molecule_groups.to_bytes()
+    assert MoleculeGroups.from_bytes(data) == groups
+    lazy = MoleculeGroups(loader=lambda: data)
+    assert repr(lazy) == "MoleculeGroups(not loaded)"
+    assert lazy.species == ["H", "O"]
+    assert lazy == groups
+    assert MoleculeGroups.from_dict({}) == {}
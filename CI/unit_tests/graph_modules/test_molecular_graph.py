@@ -29,11 +29,12 @@ from dataclasses import dataclass
 from pathlib import Path
 
 import numpy as np
-import tensorflow as tf
+import scipy.sparse
 
 from mdsuite.graph_modules.molecular_graph import (
-    _apply_system_cutoff,
     build_smiles_graph,
+    get_bonded_pairs,
+    get_connected_components,
 )
 
 
@@ -71,50 +72,6 @@ class MockExperiment:
 class TestMolecularGraph:
     """Class to test the molecular graph module."""
 
-    def test_apply_system_cutoff(self):
-        """
-        Test the apply_system_cutoff method.
-
-        Returns
-        -------
-        Checks whether or not the cutoff has been enforced.
-        """
-        zeros = np.array([0, 0, 0, 0, 0])
-        cutoff_data = [
-            [0, 6.8, 9, 11, 0],
-            [12, 0.0, 4, 3.27, 1],
-            [200, 38, 0, 1, 2.11],
-            [5, 5, 5.8765342, 0, 5],
-            [1, 7, 3, 4.8762511, 0],
-        ]
-        cutoff_tensor = tf.constant(cutoff_data, dtype=tf.float32)
-
-        # Middle range cutoff
-        target = tf.constant(
-            [
-                [0, 0, 0, 0, 1],
-                [0, 0, 1, 1, 1],
-                [0, 0, 0, 1, 1],
-                [0, 0, 0, 0, 0],
-                [1, 0, 1, 1, 0],
-            ]
-        )
-        mask = _apply_system_cutoff(cutoff_tensor, cutoff=5)
-        np.testing.assert_array_equal(np.diagonal(mask), zeros)
-        np.testing.assert_array_equal(mask, target)
-
-        # All zeros
-        target = tf.zeros((5, 5))
-        mask = _apply_system_cutoff(cutoff_tensor, cutoff=0)
-        np.testing.assert_array_equal(np.diagonal(mask), zeros)
-        np.testing.assert_array_equal(mask, target)
-
-        # All ones
-        target = tf.ones((5, 5)) - tf.eye(5)
-        mask = _apply_system_cutoff(cutoff_tensor, cutoff=200.01)
-        np.testing.assert_array_equal(np.diagonal(mask), zeros)
-        np.testing.assert_array_equal(mask, target)
-
     def test_build_smiles_graph(self):
         """
         Test the build_smiles_graph method.
@@ -163,3 +120,45 @@ class TestMolecularGraph:
             graph_obj, species = build_smiles_graph(item.smiles_string)
             assert graph_obj.number_of_nodes() == item.nodes
             assert species == item.species
+
+    def test_get_bonded_pairs(self):
+        """
+        Test the bond search with and without a cell list.
+
+        Returns
+        -------
+        Checks that both searches find the bonds of a brute force search.
+        """
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(0, 10, (300, 3))
+        r_ij = positions[None] - positions[:, None]
+        distances = np.linalg.norm(r_ij - np.rint(r_ij / 10) * 10, axis=-1)
+
+        # the first cutoff uses a cell list, the second one does not fit three cells
+        for cutoff in (1.2, 4.0):
+            target = np.argwhere(np.triu(distances < cutoff, k=1))
+            bonds = get_bonded_pairs(positions, [10, 10, 10], cutoff)
+            assert {tuple(pair) for pair in bonds.T} == {
+                tuple(pair) for pair in target
+            }
+            assert np.all(bonds[0] < bonds[1])
+
+    def test_get_connected_components(self):
+        """
+        Test the graph decomposition.
+
+        Returns
+        -------
+        Checks the components and that single nodes are dropped.
+        """
+        bonds = np.array([[0, 2, 5, 1], [4, 4, 3, 3]])
+        adjacency = scipy.sparse.coo_matrix(
+            (np.ones(4), (bonds[0], bonds[1])), shape=(7, 7)
+        )
+        adjacency = (adjacency + adjacency.T).tocsr()
+
+        components = get_connected_components(adjacency, min_size=2)
+        assert list(components) == [0, 1]
+        np.testing.assert_array_equal(components[0], [0, 2, 4])
+        np.testing.assert_array_equal(components[1], [1, 3, 5])
+        assert len(get_connected_components(adjacency)) == 3
@@ -0,0 +1,91 @@
+"""
+MDSuite: A Zincwarecode package.
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+SPDX-License-Identifier: EPL-2.0
+Copyright Contributors to the Zincwarecode Project.
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+Citation
+--------
+If you use this module please cite us with:
+Summary
+-------
+Test for the memory budget module.
+"""
+import pytest
+
+from mdsuite.memory_management.memory_budget import MemoryBudget
+from mdsuite.memory_management.memory_manager import MemoryManager
+from mdsuite.utils import config
+
+
+class TestDatabase:
+    """Database reporting 100 configurations of 1000 bytes."""
+
+    def get_data_size(self, item):
+        """Return the particles, configurations and bytes of a dataset."""
+        return 10, 100, 100000
+
+
+@pytest.fixture()
+def memory_limit(monkeypatch):
+    """Limit the memory of the process to 10000 bytes."""
+    monkeypatch.setattr(config, "memory_limit", 10000)
+
+
+def test_reserve_release(memory_limit):
+    """Test that reservations reduce the free memory until they are released."""
+    budget = MemoryBudget()
+    assert budget.free == 10000
+
+    first = budget.reserve(4000)
+    second = budget.reserve(5000)
+    assert budget.reserved == 9000
+    assert budget.free == 1000
+
+    budget.release(first)
+    budget.release(first)
+    assert budget.free == 5000
+    budget.release(second)
+    assert budget.reserved == 0
+
+
+def test_memory_manager_reservation(memory_limit, monkeypatch):
+    """Test that concurrent memory managers share the budget."""
+    budget = MemoryBudget()
+    monkeypatch.setattr(
+        "mdsuite.memory_management.memory_manager.memory_budget", budget
+    )
+
+    managers = []
+    for _ in range(2):
+        manager = MemoryManager(
+            data_path=["Test/Path"],
+            database=TestDatabase(),
+            scale_function={"linear": {"scale_factor": 1}},
+            gpu=False,
+        )
+        manager.memory_fraction = 0.5
+        managers.append(manager)
+
+    assert managers[0].get_batch_size()[0] == 5
+    assert budget.reserved == 5000
+    # the second manager plans with the memory left by the first one
+    assert managers[1].get_batch_size()[0] == 2
+    assert budget.reserved == 7000
+
+    # planning again replaces the own reservation
+    assert managers[1].get_batch_size()[0] == 2
+    assert budget.reserved == 7000
+
+    managers[0].release()
+    assert budget.reserved == 2000
+    del manager, managers[1]
+    assert budget.reserved == 0
@@ -19,11 +19,13 @@ Summary
 -------
 Test for the memory manager module.
 """
+import mmap
+import time
 import unittest
 
 import numpy as np
 
-from mdsuite.memory_management.memory_manager import MemoryManager
+from mdsuite.memory_management.memory_manager import MemoryManager, MemoryProbe
 
 
 class TestDatabase:
@@ -179,6 +181,8 @@ class TestMemoryManager(unittest.TestCase):
         """
         data = self.memory_manager._get_optimal_batch_size(10)
         self.assertEqual(data, data)  # Todo: no shit, sherlock
+        self.assertEqual(self.memory_manager._get_optimal_batch_size(300, 128), 256)
+        self.assertEqual(self.memory_manager._get_optimal_batch_size(100, 128), 100)
 
     def test_compute_atomwise_minibatch(self):
         """
@@ -226,3 +230,104 @@ class TestMemoryManager(unittest.TestCase):
         data_partitions, minibatch = self.memory_manager.get_ensemble_loop(10, 5)
         self.assertEqual(minibatch, True)
         self.assertEqual(data_partitions, 1)
+
+    def test_get_ensemble_block_size(self):
+        """
+        Test the get_ensemble_block_size method.
+
+        Returns
+        -------
+        Tests that the windows of a block hold at most as many configurations as the
+        batch and that a block does not exceed the time origins of the batch.
+        """
+        self.memory_manager.batch_size = 50
+        self.assertEqual(self.memory_manager.get_ensemble_block_size(10, 1), 5)
+        self.assertEqual(self.memory_manager.get_ensemble_block_size(60, 1), 1)
+        self.assertEqual(self.memory_manager.get_ensemble_block_size(2, 5), 10)
+
+    def test_fit_calibration(self):
+        """
+        Test the fit_calibration method.
+
+        Returns
+        -------
+        Tests that the fitted line recovers a linear memory usage and that it is
+        raised to bound all measurements.
+        """
+        calibration = self.memory_manager.fit_calibration(
+            [10, 20, 40], [1100, 2100, 4100], [1, 2, 4], 20
+        )
+        self.assertAlmostEqual(
+            calibration["scale_function"]["linear"]["scale_factor"], 5
+        )
+        self.assertAlmostEqual(calibration["overhead"], 100)
+        self.assertAlmostEqual(calibration["frame_time"], 0.1)
+
+        batch_sizes = np.array([10, 20, 40])
+        peak_memory = np.array([1000, 2500, 4000])
+        calibration = self.memory_manager.fit_calibration(
+            batch_sizes, peak_memory, [1, 1, 1], 20
+        )
+        scale_factor = calibration["scale_function"]["linear"]["scale_factor"]
+        estimate = calibration["overhead"] + scale_factor * 20 * batch_sizes
+        self.assertTrue(np.all(estimate >= peak_memory - 1e-6))
+        self.assertAlmostEqual(np.min(estimate - peak_memory), 0)
+
+        # The loaded data is a lower bound of the memory usage.
+        calibration = self.memory_manager.fit_calibration([10], [50], [1], 20)
+        self.assertEqual(calibration["scale_function"]["linear"]["scale_factor"], 1)
+
+    def test_get_batch_size_calibrated(self):
+        """
+        Test the get_batch_size method with a memory calibration.
+
+        Returns
+        -------
+        Tests that the calibrated scale function and overhead are used.
+        """
+        memory_manager = MemoryManager(
+            data_path=["Test/Path"],
+            database=TestDatabase(data_size=1000, rows=10, columns=100),
+            calibration={
+                "scale_function": {"linear": {"scale_factor": 2}},
+                "overhead": 100,
+                "frame_time": 1,
+            },
+        )
+        memory_manager.memory_fraction = 0.5
+        memory_manager.machine_properties["memory"] = 300
+        batch_size, number_of_batches, remainder = memory_manager.get_batch_size()
+        self.assertEqual(batch_size, 2)
+        self.assertEqual(number_of_batches, 50)
+        self.assertEqual(remainder, 0)
+
+    def test_memory_probe(self):
+        """
+        Test the memory probe.
+
+        Returns
+        -------
+        Tests that the allocation of an array is measured.
+        """
+        with MemoryProbe() as probe:
+            data = np.ones(10**6)
+        self.assertGreaterEqual(probe.peak_memory, data.nbytes)
+        self.assertGreater(probe.duration, 0)
+
+    def test_memory_probe_native(self):
+        """
+        Test the memory probe on memory not allocated through Python.
+
+        Returns
+        -------
+        Tests that a buffer that is invisible to tracemalloc, like the CPU buffers
+        of TensorFlow, is measured although it is freed within the probe.
+        """
+        nbytes = 2**26
+        with MemoryProbe() as probe:
+            buffer = mmap.mmap(-1, nbytes)
+            for offset in range(0, nbytes, mmap.PAGESIZE):
+                buffer[offset] = 1
+            time.sleep(0.1)
+            buffer.close()
+        self.assertGreaterEqual(probe.peak_memory, 0.9 * nbytes)
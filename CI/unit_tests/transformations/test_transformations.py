@@ -34,6 +34,7 @@ from mdsuite.transformations import (
     integrated_heat_current,
     ionic_current,
     kinaci_integrated_heat_current,
+    map_molecules,
     momentum_flux,
     scale_coordinates,
     thermal_flux,
@@ -85,7 +86,27 @@ def test_kinaci_integrated_heat_current():
     # TODO
 
 
-# todo map_molecules
+def test_molecule_segments():
+    groups = {"0": {"H": [0, 1], "O": [0]}, "1": {"H": [3, 2], "O": [1]}}
+    masses = {"H": 1 / 18, "O": 16 / 18}
+    trafo = map_molecules.MolecularMap()
+    atom_indices, segment_ids, weights = trafo._get_molecule_segments(
+        groups, {"H": 0, "O": 4}, masses
+    )
+    np.testing.assert_array_equal(atom_indices, [0, 1, 4, 3, 2, 5])
+    np.testing.assert_array_equal(segment_ids, [0, 0, 0, 1, 1, 1])
+
+    pos = {"H": np.random.random((4, 7, 3)), "O": np.random.random((2, 7, 3))}
+    com = tf.math.unsorted_segment_sum(
+        np.concatenate([pos["H"], pos["O"]])[atom_indices] * weights[:, None, None],
+        segment_ids,
+        num_segments=2,
+    )
+    for t, molecule in enumerate(groups.values()):
+        com_should_be = sum(
+            masses[sp] * np.sum(pos[sp][idxs], axis=0) for sp, idxs in molecule.items()
+        )
+        np.testing.assert_array_almost_equal(com[t], com_should_be)
 
 
 def test_momentum_flux():
@@ -28,11 +28,16 @@ Module for testing the calculator helper methods.
 import numpy as np
 import pytest
 from numpy.testing import assert_array_equal, assert_raises
+from scipy.optimize import curve_fit
 
 from mdsuite.utils.calculator_helper_methods import (
     correlate,
+    fft_correlate,
     fit_einstein_curve,
+    msd_fft,
     msd_operation,
+    running_linear_regression,
+    split_time_blocks,
 )
 
 
@@ -68,6 +73,30 @@ class TestCalculatorHelperMethods:
         )
         assert popt[0] == pytest.approx(5.0, 0.01)
 
+    def test_running_linear_regression(self):
+        """
+        Test the prefix fits against scipy.optimize.curve_fit.
+
+        Returns
+        -------
+        Fits a noisy line in SI-like units and compares slope, intercept and
+        covariance of several prefixes with individual curve_fit calls.
+        """
+        rng = np.random.default_rng(1)
+        x_data = np.linspace(3e-12, 5e-10, 200)
+        y_data = 2e-9 * x_data + 1e-20 + rng.normal(0, 1e-20, 200)
+
+        slopes, intercepts, covariances = running_linear_regression(x_data, y_data)
+        assert np.all(np.isinf(covariances[0]))
+
+        for n_points in [3, 10, 57, 200]:
+            popt, pcov = curve_fit(
+                lambda x, m, a: m * x + a, x_data[:n_points], y_data[:n_points]
+            )
+            np.testing.assert_allclose(slopes[n_points - 2], popt[0], rtol=1e-5)
+            np.testing.assert_allclose(intercepts[n_points - 2], popt[1], rtol=1e-5)
+            np.testing.assert_allclose(covariances[n_points - 2], pcov, rtol=1e-5)
+
     def test_correlate(self):
         """
         Test the correlate helper function.
@@ -131,3 +160,74 @@ class TestCalculatorHelperMethods:
         summed_data[summed_data < 1e-10] = 0.0
 
         assert summed_data.sum() == 0.0
+
+    def test_msd_fft(self):
+        """
+        Test the FFT msd helper function.
+
+        Returns
+        -------
+        Compares the FFT MSD summed over all time origins against a direct loop over
+        the lags for a random walk.
+        """
+        rng = np.random.default_rng(42)
+        data = np.cumsum(rng.normal(size=(4, 50, 3)), axis=1) + 100.0
+
+        msd = msd_fft(data, max_lag=60)
+
+        reference = np.zeros(60)
+        for lag in range(50):
+            reference[lag] = np.sum((data[:, lag:] - data[:, : 50 - lag]) ** 2)
+
+        np.testing.assert_allclose(msd, reference, rtol=1e-8, atol=1e-8)
+
+    def test_fft_correlate(self):
+        """
+        Test the FFT correlation engine.
+
+        Returns
+        -------
+        Compares the auto- and cross-correlations over all time origins against a
+        direct loop over the lags, also when the particles are split into chunks by a
+        small memory limit.
+        """
+        rng = np.random.default_rng(42)
+        ds_a = rng.normal(size=(5, 40, 3))
+        ds_b = rng.normal(size=(5, 40, 3))
+
+        reference = np.zeros((5, 50))
+        for lag in range(40):
+            reference[:, lag] = np.sum(ds_a[:, : 40 - lag] * ds_b[:, lag:], axis=(1, 2))
+
+        cross_correlation = fft_correlate(ds_a, ds_b, max_lag=50, memory_limit=1)
+        np.testing.assert_allclose(cross_correlation, reference, atol=1e-10)
+
+        shared_correlation = fft_correlate(ds_a, ds_b[:1], max_lag=50, memory_limit=1)
+        np.testing.assert_allclose(
+            shared_correlation,
+            fft_correlate(ds_a, np.broadcast_to(ds_b[:1], ds_a.shape), max_lag=50),
+            atol=1e-10,
+        )
+
+        auto_correlation = fft_correlate(ds_a, max_lag=10, normalize=True)
+        for lag in range(10):
+            np.testing.assert_allclose(
+                auto_correlation[:, lag],
+                np.mean(np.sum(ds_a[:, : 40 - lag] * ds_a[:, lag:], axis=-1), axis=1),
+            )
+
+    def test_split_time_blocks(self):
+        """
+        Test the splitting of data into time blocks.
+
+        Returns
+        -------
+        Checks the shape of the blocks and that incomplete blocks are dropped.
+        """
+        data = np.arange(2 * 11 * 3).reshape((2, 11, 3))
+
+        blocks = split_time_blocks(data, 5)
+
+        assert blocks.shape == (4, 5, 3)
+        assert_array_equal(blocks[1], data[0, 5:10])
+        assert_array_equal(blocks[2], data[1, :5])
@@ -30,9 +30,12 @@ import os
 import numpy as np
 import tensorflow as tf
 
+from mdsuite.utils import config
 from mdsuite.utils.meta_functions import (
+    _read_cgroup_value,
     check_a_in_b,
     find_item,
+    get_available_memory,
     get_dimensionality,
     get_machine_properties,
     get_nearest_divisor,
@@ -85,6 +88,41 @@ class TestMetaFunction:
         """
         get_machine_properties()
 
+    def test_get_available_memory(self, monkeypatch):
+        """
+        Test the get_available_memory method.
+
+        Returns
+        -------
+        Assert that the config override and a Slurm allocation limit the memory.
+        """
+        monkeypatch.setattr(config, "memory_limit", 1000)
+        assert get_available_memory() == 1000
+
+        monkeypatch.setattr(config, "memory_limit", None)
+        monkeypatch.delenv("SLURM_MEM_PER_NODE", raising=False)
+        monkeypatch.setenv("SLURM_MEM_PER_CPU", "1")
+        monkeypatch.setenv("SLURM_CPUS_ON_NODE", "2")
+        # 2 MiB are less than what the test process uses
+        assert get_available_memory() == 0
+
+    def test_read_cgroup_value(self, tmp_path):
+        """
+        Test the _read_cgroup_value method.
+
+        Returns
+        -------
+        Assert that limits are read and missing or unlimited values are None.
+        """
+        path = tmp_path / "memory.max"
+        assert _read_cgroup_value(path) is None
+        path.write_text("max\n")
+        assert _read_cgroup_value(path) is None
+        path.write_text("9223372036854771712\n")
+        assert _read_cgroup_value(path) is None
+        path.write_text("1073741824\n")
+        assert _read_cgroup_value(path) == 1073741824
+
     def test_line_counter(self):
         """
         Test the line_counter method.
@@ -0,0 +1,104 @@
+"""
+MDSuite: A zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Module for testing the multiple-tau correlator.
+"""
+import numpy as np
+import pytest
+
+from mdsuite.utils.calculator_helper_methods import fft_correlate
+from mdsuite.utils.multi_tau_correlator import MultiTauCorrelator
+
+
+def streaming_multi_tau(data, block_length, averaging, n_levels, mode):
+    """Frame by frame multiple-tau reference implementation."""
+    sums = {}
+    levels = [[] for _ in range(n_levels)]
+    accumulators = [[] for _ in range(n_levels)]
+
+    def push(level, value):
+        levels[level].append(value)
+        first_lag = 0 if level == 0 else block_length // averaging
+        for lag in range(first_lag, min(block_length, len(levels[level]))):
+            earlier = levels[level][-1 - lag]
+            if mode == "msd":
+                product = np.sum((value - earlier) ** 2, axis=-1)
+            else:
+                product = np.sum(value * earlier, axis=-1)
+            total, count = sums.get(lag * averaging**level, (0.0, 0))
+            sums[lag * averaging**level] = (total + product, count + 1)
+        if level + 1 < n_levels:
+            accumulators[level].append(value)
+            if len(accumulators[level]) == averaging:
+                push(level + 1, np.mean(accumulators[level], axis=0))
+                accumulators[level] = []
+
+    for frame in range(data.shape[1]):
+        push(0, data[:, frame])
+
+    lags = np.array(sorted(sums))
+    return lags, np.array([sums[lag][0] / sums[lag][1] for lag in lags]).T
+
+
+@pytest.mark.parametrize("mode", ["correlation", "msd"])
+def test_multi_tau_correlator(mode):
+    """
+    Test the chunked correlator against a frame by frame reference.
+
+    The chunks have sizes that do not align with the averaging or the block length.
+    """
+    rng = np.random.default_rng(42)
+    data = np.cumsum(rng.normal(size=(3, 1000, 2)), axis=1)
+
+    correlator = MultiTauCorrelator(3, 2, 400, block_length=8, mode=mode)
+    for chunk in np.array_split(data, [7, 8, 300, 301, 650], axis=1):
+        correlator.add(chunk)
+    lags, correlation = correlator.get_correlation()
+
+    reference_lags, reference = streaming_multi_tau(
+        data, 8, 2, correlator.n_levels, mode
+    )
+    mask = reference_lags <= 400
+    np.testing.assert_array_equal(lags, reference_lags[mask])
+    np.testing.assert_allclose(correlation, reference[:, mask])
+
+    per_dimension = correlator.get_correlation(per_dimension=True)[1]
+    np.testing.assert_allclose(np.sum(per_dimension, axis=1), correlation)
+
+
+def test_multi_tau_first_level():
+    """Test that the first level is the exact time-origin averaged correlation."""
+    rng = np.random.default_rng(42)
+    data = rng.normal(size=(4, 200, 3))
+
+    correlator = MultiTauCorrelator(4, 3, 15, block_length=16)
+    correlator.add(data)
+    lags, correlation = correlator.get_correlation()
+
+    assert correlator.n_levels == 1
+    np.testing.assert_array_equal(lags, np.arange(16))
+    np.testing.assert_allclose(
+        correlation, fft_correlate(data, max_lag=16, normalize=True), atol=1e-12
+    )
@@ -0,0 +1,65 @@
+"""
+MDSuite: A zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Module for testing the neighbour list methods.
+"""
+import numpy as np
+import pytest
+
+from mdsuite.utils.neighbour_list import cell_list_applicable, get_cell_list_pairs
+
+
+def test_cell_list_applicable():
+    """Test that a cell list is only used for at least three cells per axis."""
+    assert cell_list_applicable(np.array([10.0, 10.0, 10.0]), 3.0)
+    assert not cell_list_applicable(np.array([10.0, 10.0, 8.0]), 3.0)
+    assert not cell_list_applicable(None, 3.0)
+
+
+def test_get_cell_list_pairs():
+    """
+    Test the cell list against all pairs of a random configuration.
+
+    The positions are not wrapped into the box to test the periodic boundaries.
+    """
+    rng = np.random.default_rng(42)
+    box = np.array([10.0, 12.0, 11.0])
+    positions = rng.uniform(-5.0, 15.0, size=(300, 3))
+    cutoff = 3.1
+
+    indices, distances = get_cell_list_pairs(positions, box, cutoff)
+
+    r_ij = positions[None, :, :] - positions[:, None, :]
+    r_ij -= np.rint(r_ij / box) * box
+    full_distances = np.linalg.norm(r_ij, axis=-1)
+    i, j = np.triu_indices(len(positions), k=1)
+    mask = full_distances[i, j] < cutoff
+
+    assert np.all(indices[0] < indices[1])
+    assert set(zip(*indices)) == set(zip(i[mask], j[mask]))
+    np.testing.assert_allclose(distances, full_distances[indices[0], indices[1]])
+
+    with pytest.raises(ValueError):
+        get_cell_list_pairs(positions, box, 4.0)
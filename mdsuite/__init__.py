@@ -33,6 +33,7 @@ import logging
 import sys
 
 from mdsuite import utils
+from mdsuite.database.simulation_database import StorageLayout
 from mdsuite.experiment import Experiment
 from mdsuite.project import Project
 from mdsuite.utils import config, units
@@ -45,6 +46,7 @@ __all__ = [
     Report.__name__,
     "config",
     Molecule.__name__,
+    StorageLayout.__name__,
     "units",
     "utils",
 ]
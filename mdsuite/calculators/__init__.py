@@ -30,6 +30,7 @@ from mdsuite.calculators.angular_distribution_function import (
     AngularDistributionFunction,
 )
 from mdsuite.calculators.calculator import Calculator
+from mdsuite.calculators.calculator_pipeline import CalculatorPipeline
 from mdsuite.calculators.coordination_number_calculation import CoordinationNumbers
 from mdsuite.calculators.einstein_diffusion_coefficients import (
     EinsteinDiffusionCoefficients,
@@ -67,6 +68,7 @@ from mdsuite.calculators.radial_distribution_function import RadialDistributionF
 
 __all__ = [
     Calculator.__name__,
+    CalculatorPipeline.__name__,
     AngularDistributionFunction.__name__,
     CoordinationNumbers.__name__,
     EinsteinDiffusionCoefficients.__name__,
@@ -38,6 +38,7 @@ from tqdm import tqdm
 
 import mdsuite.database.scheme as db
 from mdsuite.database.calculator_database import CalculatorDatabase
+from mdsuite.database.simulation_database import keep_files_open
 from mdsuite.visualizer.d2_data_visualization import DataVisualizer2D
 
 if TYPE_CHECKING:
@@ -110,35 +111,32 @@ def call(func):
         return_dict = self.experiment is None
 
         out = {}
-        for experiment in self.experiments:
-            CLS = self.__class__
-            # NOTE: if the calculator accepts more than just experiment/experiments
-            #  as init, this has to be changed!
-            cls = CLS(experiment=experiment)
-            # pass the user args to the calculator
-            func(cls, *args, **kwargs)
-            data = cls.get_computation_data()
-            if data is None:
-                # new calculation will be performed
-                cls.prepare_db_entry()
-                cls.save_computation_args()
-                cls.run_analysis()
-                cls.save_db_data()
-                # Need to reset the user args, if they got change
-                # or set to defaults, e.g. n_configurations = - 1 so
-                # that they match the query
+        # keep the database files open for the whole run
+        with keep_files_open():
+            for experiment in self.experiments:
+                CLS = self.__class__
+                # NOTE: if the calculator accepts more than just experiment/experiments
+                #  as init, this has to be changed!
+                cls = CLS(experiment=experiment)
+                # pass the user args to the calculator
                 func(cls, *args, **kwargs)
                 data = cls.get_computation_data()
-
-            if cls.plot:
-                """Plot the data"""
-                cls.plotter = DataVisualizer2D(
-                    title=cls.analysis_name, path=experiment.figures_path
-                )
-                cls.plot_data(data.data_dict)
-                cls.plotter.grid_show(cls.plot_array)
-
-            out[cls.experiment.name] = data
+                if data is None:
+                    # new calculation will be performed
+                    cls.prepare_db_entry()
+                    cls.save_computation_args()
+                    cls.run_analysis()
+                    cls.save_db_data()
+                    # Need to reset the user args, if they got change
+                    # or set to defaults, e.g. n_configurations = - 1 so
+                    # that they match the query
+                    func(cls, *args, **kwargs)
+                    data = cls.get_computation_data()
+
+                if cls.plot:
+                    cls.plot_computation(data)
+
+                out[cls.experiment.name] = data
 
         if return_dict:
             return out
@@ -307,11 +305,30 @@ class Calculator(CalculatorDatabase):
                 ),
             )
 
-    def run_analysis(self):
-        """Run the appropriate analysis."""
+    def plot_computation(self, data: db.Computation):
+        """
+        Plot the data of a computation and show the plots.
+
+        Parameters
+        ----------
+        data : db.Computation
+                Computation of this calculator loaded from the database.
+        """
+        self.plotter = DataVisualizer2D(
+            title=self.analysis_name, path=self.experiment.figures_path
+        )
+        self.plot_data(data.data_dict)
+        self.plotter.grid_show(self.plot_array)
+
+    def warn_experimental(self):
+        """Log a warning if the calculator is experimental."""
         if self.experimental:
             log.warning(
                 "This is an experimental calculator. Please see the "
                 "documentation before using the results."
             )
+
+    def run_analysis(self):
+        """Run the appropriate analysis."""
+        self.warn_experimental()
         self.run_calculator()
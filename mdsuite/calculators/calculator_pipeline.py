@@ -0,0 +1,289 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Run several trajectory calculators on shared batches of data.
+"""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy as np
+import tensorflow as tf
+from tqdm import tqdm
+
+import mdsuite.calculators
+import mdsuite.database.scheme as db
+from mdsuite.calculators.calculator import Calculator
+from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
+from mdsuite.database.data_manager import BatchOverlap
+from mdsuite.database.simulation_database import keep_files_open
+from mdsuite.utils.meta_functions import join_path
+
+if TYPE_CHECKING:
+    from mdsuite import Experiment
+
+log = logging.getLogger(__name__)
+
+
+class CalculatorPipeline:
+    """
+    Run several calculators in one pass over the trajectory.
+
+    For every subject, e.g. a species, the datasets needed by any of the calculators
+    are read once per batch and each batch is passed to the batch operation of all
+    calculators. The batch size is the smallest one required by the calculators.
+    Every calculator stores its results in the database as if it was run on its own.
+
+    Calculators that cannot share batches, e.g. because they do not implement the
+    batch operation hooks of the TrajectoryCalculator, need atom-wise mini-batching
+    or select atoms, are run separately. Calculators that overlap their batches get
+    the shared batches joined with their own carried-over configurations.
+
+    Examples
+    --------
+    experiment.run.CalculatorPipeline(
+        EinsteinDiffusionCoefficients={"data_range": 100, "plot": False},
+        GreenKuboDiffusionCoefficients={"data_range": 500, "plot": False},
+        EinsteinHelfandIonicConductivity={"data_range": 100, "plot": False},
+    )
+    """
+
+    def __init__(
+        self, experiment: Experiment = None, experiments: List[Experiment] = None
+    ):
+        """
+        Constructor for the calculator pipeline.
+
+        Parameters
+        ----------
+        experiment : Experiment
+                Experiment for which the calculators will be run.
+        experiments : List[Experiment]
+                List of experiments on which to run the calculators.
+        """
+        self.experiment = experiment
+        self.experiments = experiments
+        if self.experiment is not None:
+            self.experiments = [self.experiment]
+
+    def __call__(self, **calculators: dict) -> Dict[str, db.Computation]:
+        """
+        Run the calculators.
+
+        Parameters
+        ----------
+        calculators : dict
+                Name of each calculator and the arguments of its call, e.g.
+                EinsteinDiffusionCoefficients={"data_range": 100}.
+
+        Returns
+        -------
+        data : dict
+                Computation of each calculator. When called from the project class a
+                dict of shape {experiment name: computation} for each calculator.
+        """
+        out = {name: {} for name in calculators}
+        with keep_files_open():
+            for experiment in self.experiments:
+                results = self._run_experiment(experiment, calculators)
+                for name, data in results.items():
+                    out[name][experiment.name] = data
+
+        if self.experiment is None:
+            return out
+        return {name: data[self.experiment.name] for name, data in out.items()}
+
+    def _run_experiment(
+        self, experiment: Experiment, calculator_args: Dict[str, dict]
+    ) -> Dict[str, db.Computation]:
+        """
+        Run the calculators on a single experiment.
+
+        This follows the steps of the call decorator for each calculator, except
+        that the analyses of all new computations are run together.
+
+        Parameters
+        ----------
+        experiment : Experiment
+                Experiment to run the calculators on.
+        calculator_args : dict
+                Arguments of each calculator call.
+
+        Returns
+        -------
+        data : dict
+                Computation of each calculator.
+        """
+        calculators: Dict[str, Calculator] = {}
+        pending = []
+        for name, user_args in calculator_args.items():
+            calculator = getattr(mdsuite.calculators, name)(experiment=experiment)
+            # pass the user args to the calculator without running it
+            type(calculator).__call__.__wrapped__(calculator, **user_args)
+            calculators[name] = calculator
+            if calculator.get_computation_data() is None:
+                calculator.prepare_db_entry()
+                calculator.save_computation_args()
+                pending.append(calculator)
+
+        self._run_analyses(pending)
+
+        out = {}
+        for name, calculator in calculators.items():
+            if calculator in pending:
+                calculator.save_db_data()
+                # reset the user args so that they match the query
+                type(calculator).__call__.__wrapped__(
+                    calculator, **calculator_args[name]
+                )
+            data = calculator.get_computation_data()
+            if calculator.plot:
+                calculator.plot_computation(data)
+            out[name] = data
+
+        return out
+
+    def _run_analyses(self, calculators: List[Calculator]):
+        """
+        Run the analyses of the calculators, sharing batches where possible.
+
+        Parameters
+        ----------
+        calculators : list
+                Calculators with prepared database entries.
+        """
+        shared = []
+        for calculator in calculators:
+            if (
+                isinstance(calculator, TrajectoryCalculator)
+                and calculator.supports_pipeline
+            ):
+                shared.append(calculator)
+            else:
+                calculator.run_analysis()
+
+        for calculator in shared:
+            calculator.warn_experimental()
+            calculator.check_input()
+
+        subjects = []
+        for calculator in shared:
+            subjects.extend(
+                subject
+                for subject in calculator.get_subjects()
+                if subject not in subjects
+            )
+        for subject in subjects:
+            self._run_subject(
+                subject,
+                [item for item in shared if subject in item.get_subjects()],
+            )
+
+    @staticmethod
+    def _run_subject(subject: str, calculators: List[TrajectoryCalculator]):
+        """
+        Pass every batch of a subject to the batch operations of the calculators.
+
+        Parameters
+        ----------
+        subject : str
+                Subject whose datasets are loaded, e.g. 'Na'.
+        calculators : list
+                Calculators operating on this subject.
+        """
+        data_paths = list(
+            dict.fromkeys(
+                join_path(subject, calculator.loaded_property.name)
+                for calculator in calculators
+            )
+        )
+        # every calculator accounts for the memory of all datasets of the batch
+        for calculator in calculators:
+            calculator.memory_calibration = calculator.load_memory_calibration(subject)
+            calculator._prepare_managers(data_paths, streaming=calculator.streaming)
+            # the batches are shared, only the final managers reserve memory
+            calculator.memory_manager.release()
+        batch_size = min(calculator.batch_size for calculator in calculators)
+
+        shared = []
+        for calculator in calculators:
+            calculator._prepare_managers(
+                data_paths, streaming=calculator.streaming, batch_size=batch_size
+            )
+            atom_selection = getattr(calculator.args, "atom_selection", np.s_[:])
+            selects_all = isinstance(atom_selection, slice) and atom_selection == np.s_[:]
+            if calculator.minibatch or not selects_all:
+                log.info(
+                    f"{type(calculator).__name__} cannot share the batches of"
+                    f" {subject} and is run separately."
+                )
+                calculator.run_subject(subject)
+            else:
+                shared.append(calculator)
+        if len(shared) == 0:
+            return
+
+        data_manager = shared[0].data_manager
+        generator, generator_args = data_manager.batch_generator(
+            system=shared[0].system_property
+        )
+        n_batches, batch_size, database_path, _, dictionary = generator_args
+        batches = generator(
+            n_batches,
+            batch_size,
+            database_path,
+            [str.encode(path) for path in data_paths],
+            dictionary,
+        )
+
+        # calculators overlapping their batches keep their own carried-over data
+        overlaps = [
+            BatchOverlap(calculator.args.data_range, calculator.args.correlation_time)
+            if calculator.overlap_batches
+            else None
+            for calculator in shared
+        ]
+        for calculator in shared:
+            calculator.start_subject(subject)
+        for batch in tqdm(
+            batches,
+            ncols=70,
+            desc=subject,
+            total=n_batches + int(data_manager.remainder > 0),
+        ):
+            batch = {key: tf.convert_to_tensor(value) for key, value in batch.items()}
+            for calculator, overlap in zip(shared, overlaps):
+                keys = [
+                    str.encode(join_path(subject, calculator.loaded_property.name)),
+                    b"data_size",
+                ]
+                calculator_batch = {key: batch[key] for key in keys}
+                if overlap is not None:
+                    calculator_batch = overlap(calculator_batch)
+                calculator.batch_operation(subject, calculator_batch)
+        for calculator in shared:
+            calculator.finish_subject(subject)
+            calculator.memory_manager.release()
@@ -37,13 +37,12 @@ import tensorflow as tf
 from bokeh.models import HoverTool, LinearAxis, Span
 from bokeh.models.ranges import Range1d
 from bokeh.plotting import figure
-from tqdm import tqdm
 
 from mdsuite import utils
 from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
 from mdsuite.database.mdsuite_properties import mdsuite_properties
-from mdsuite.utils.calculator_helper_methods import fit_einstein_curve
+from mdsuite.utils.calculator_helper_methods import fit_einstein_curve, msd_fft
 
 log = logging.getLogger(__name__)
 
@@ -59,6 +58,7 @@ class Args:
     molecules: bool
     species: list
     fit_range: int
+    algorithm: str
 
 
 class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
@@ -79,6 +79,17 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
     project.experiment.run.EinsteinDiffusionCoefficients(data_range=500,
                                                          plot=True,
                                                          correlation_time=10)
+
+    The MSD of all time origins can be computed in a single FFT pass with:
+
+    project.experiment.run.EinsteinDiffusionCoefficients(data_range=500,
+                                                         algorithm="fft")
+
+    Lag times far beyond the memory of a window, here 10^6 frames, are reached with
+    a multiple-tau correlator:
+
+    project.experiment.run.EinsteinDiffusionCoefficients(data_range=1000000,
+                                                         algorithm="multi_tau")
     """
 
     def __init__(self, **kwargs):
@@ -120,6 +131,7 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
         molecules: bool = False,
         tau_values: Union[int, List, Any] = np.s_[:],
         fit_range: int = -1,
+        algorithm: str = "window",
     ):
         """
 
@@ -139,6 +151,17 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
                 If true, molecules are used instead of atoms.
         tau_values : Union[int, list, np.s_]
                 Selection of tau values to use in the window sliding.
+        fit_range : int
+                Index up to which the MSD is fit. Defaults to the full data range.
+        algorithm : str
+                Algorithm used to compute the MSD. "window" averages over windows
+                separated by the correlation time, "fft" uses every time origin in
+                each batch and computes the MSD with FFTs in O(N log N). "multi_tau"
+                streams the trajectory once through a multiple-tau correlator and
+                computes the MSD at log-spaced lags up to the data range with
+                O(N log(data_range)) memory. In this case tau_values are ignored and
+                fit_range is a lag in frames. The correlation time is not used by
+                the "fft" and "multi_tau" algorithms.
 
         Returns
         -------
@@ -152,6 +175,11 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         if fit_range == -1:
             fit_range = int(data_range - 1)
+        if algorithm not in ("window", "fft", "multi_tau"):
+            raise ValueError(
+                f"Unknown MSD algorithm '{algorithm}', use 'window', 'fft' or"
+                " 'multi_tau'."
+            )
         # set args that will affect the computation result
         self.args = Args(
             data_range=data_range,
@@ -161,33 +189,60 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
             molecules=molecules,
             species=species,
             fit_range=fit_range,
+            algorithm=algorithm,
         )
         self.plot = plot
         self.system_property = False
 
-    def ensemble_operation(self, ensemble):
+    @property
+    def overlap_batches(self) -> bool:
+        """The window algorithm uses every time origin of the trajectory."""
+        return self.args.algorithm == "window"
+
+    def ensemble_operation(self, ensemble: np.ndarray) -> np.ndarray:
         """
-        Calculate and return the msd.
+        Calculate and return the msd of a block of time origins.
 
         Parameters
         ----------
-        ensemble : tf.Tensor
-                An ensemble of data to be operated on.
+        ensemble : np.ndarray (n_particles, n_origins, data_range, dimension)
+                The windows of a block of time origins.
 
         Returns
         -------
-        MSD of the tensor_values.
+        MSD of the tensor_values summed over particles and time origins.
         """
-        msd = tf.math.squared_difference(
-            tf.gather(ensemble, self.args.tau_values, axis=1), ensemble[:, None, 0]
-        )
-        self.count += msd.shape[0]
-        # average over particles, sum over dimensions
-        # msd = tf.reduce_sum(tf.reduce_mean(msd, axis=0), axis=-1)
-        msd = tf.reduce_sum(tf.reduce_sum(msd, axis=0), axis=-1)
+        msd = (
+            np.take(ensemble, self.args.tau_values, axis=2) - ensemble[:, :, None, 0]
+        ) ** 2
+        self.count += msd.shape[0] * msd.shape[1]
 
         # sum up ensembles to average in post processing
-        return np.array(msd)
+        return np.sum(msd, axis=(0, 1, 3))
+
+    def fft_operation(self, batch: tf.Tensor):
+        """
+        Calculate the msd over all time origins in a batch using FFTs.
+
+        Parameters
+        ----------
+        batch : tf.Tensor (n_particles, n_configurations, dimension)
+                A full batch of data to be operated on.
+
+        Returns
+        -------
+        msd : np.ndarray
+                Squared displacements summed over particles and time origins at each
+                tau value.
+        counts : np.ndarray
+                Number of (particle, time origin) samples entering each tau value.
+        """
+        n_particles, n_configurations, _ = batch.shape
+        msd = msd_fft(np.array(batch), self.args.data_range)
+        tau_values = np.asarray(self.args.tau_values)
+        counts = n_particles * np.clip(n_configurations - tau_values, 0, None)
+
+        return msd[tau_values], counts
 
     def fit_diff_coeff(self):
         """Apply unit conversion, fit line to the data, prepare for database storage."""
@@ -198,7 +253,11 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
         self.time *= self.experiment.units.time
 
         fit_values, covariance, gradients, gradient_errors = fit_einstein_curve(
-            x_data=self.time, y_data=self.msd_array, fit_max_index=self.args.fit_range
+            x_data=self.time,
+            y_data=self.msd_array,
+            fit_max_index=self._get_range_index(
+                self.args.fit_range, self.time, self._frame_time
+            ),
         )
         error = np.sqrt(np.diag(covariance))[0]
 
@@ -214,38 +273,52 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
         }
         return data
 
+    def multi_tau_operation(self):
+        """Collect the msd at log-spaced lags from the multiple-tau correlator."""
+        lags, msd = self.correlator.get_correlation()
+        self.time = self._get_multi_tau_time(lags)
+        self.msd_array = np.sum(msd, axis=0)
+        self.count = len(msd)
+
+    def get_subjects(self) -> List[str]:
+        """Species for which the diffusion coefficient is computed."""
+        return self.args.species
+
+    def start_subject(self, subject: str):
+        """Reset the msd before the first batch of a species."""
+        self.count = 0
+        self.correlator = None
+        if self.args.algorithm == "multi_tau":
+            return
+        self.time = self._handle_tau_values()
+        self.msd_array = np.zeros(self.data_resolution)
+
+    def batch_operation(self, subject: str, batch: dict):
+        """Add the msd of a batch of a species."""
+        dict_ref = str.encode("/".join([subject, self.loaded_property.name]))
+        if self.args.algorithm == "multi_tau":
+            self.update_multi_tau_correlator(batch[dict_ref], mode="msd")
+            return
+        if self.args.algorithm == "fft":
+            msd, counts = self.fft_operation(batch[dict_ref])
+            self.msd_array += msd
+            self.count += counts
+            return
+
+        for block in self.get_ensemble_blocks(batch):
+            self.msd_array += self.ensemble_operation(block[dict_ref])
+
+    def finish_subject(self, subject: str):
+        """Fit the msd of a species and queue the results."""
+        if self.args.algorithm == "multi_tau":
+            self.multi_tau_operation()
+        fit_results = self.fit_diff_coeff()
+        self.queue_data(data=fit_results, subjects=[subject])
+
     def run_calculator(self):
         """Run analysis."""
-        self._run_dependency_check()
-        for species in self.args.species:
-            # Here for now to avoid issues. Should be moved out when calculators become
-            # species-wise
-            self.time = None
-            self.time = self._handle_tau_values()
-            dict_ref = str.encode("/".join([species, self.loaded_property.name]))
-            batch_ds = self.get_batch_dataset([species])
-            self.msd_array = np.zeros(self.data_resolution)
-            self.count = 0
-            # loop over batches to get MSD
-            for i, batch in tqdm(
-                enumerate(batch_ds),
-                ncols=70,
-                desc=species,
-                total=self.n_batches,
-                disable=self.memory_manager.minibatch,
-            ):
-                ensemble_ds = self.get_ensemble_dataset(batch, species)
-
-                for ensemble in ensemble_ds:
-                    if not ensemble[dict_ref].shape[1] == self.args.data_range:
-                        continue
-                    else:
-                        self.msd_array += self.ensemble_operation(ensemble[dict_ref])
-                        self.count += 1
-
-            # self.msd_array = np.array(tf.reduce_sum(self.msd_array, axis=0))
-            fit_results = self.fit_diff_coeff()
-            self.queue_data(data=fit_results, subjects=[species])
+        self.check_input()
+        self.run_batch_loop()
 
     def plot_data(self, data):
         """
@@ -272,7 +345,9 @@ class EinsteinDiffusionCoefficients(TrajectoryCalculator, ABC):
 
             # Compute the span
             span = Span(
-                location=time[self.args.fit_range],
+                location=time[
+                    self._get_range_index(self.args.fit_range, time, self._frame_time)
+                ],
                 dimension="height",
                 line_dash="dashed",
             )
@@ -51,6 +51,7 @@ class Args:
     molecules: bool
     species: list
     fit_range: int
+    algorithm: str
 
 
 tqdm.monitor_interval = 0
@@ -109,6 +110,10 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
         self.result_keys = ["diffusion_coefficient", "uncertainty"]
         self.result_series_keys = ["time", "msd"]
         self.combinations = []
+        self._distinct_algorithms = {
+            "collective": self._map_over_species,
+            "pairwise": self._map_over_particles,
+        }
 
     @call
     def __call__(
@@ -123,6 +128,7 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
         export: bool = False,
         atom_selection: dict = np.s_[:],
         fit_range: int = -1,
+        algorithm: str = "collective",
     ):
         """
         Parameters
@@ -142,12 +148,22 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
                 Selection of atoms to use within the HDF5 database.
         export : bool
                 If true, export the data directly into a csv file.
+        algorithm : str
+                How the distinct MSD is computed. 'collective' uses the summed
+                displacements of each species, 'pairwise' computes every pair of
+                particles and is kept as a reference. Both give the same result.
 
         Returns
         -------
         None
 
         """
+        if algorithm not in self._distinct_algorithms:
+            raise ValueError(
+                f"Unknown algorithm {algorithm}, choose one of"
+                f" {list(self._distinct_algorithms)}"
+            )
+
         if species is None:
             species = list(self.experiment.species)
         self.combinations = list(itertools.combinations_with_replacement(species, 2))
@@ -166,10 +182,48 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
             molecules=molecules,
             species=species,
             fit_range=fit_range,
+            algorithm=algorithm,
         )
         self.time = self._handle_tau_values() * self.experiment.units.time
 
         self.msd_array = np.zeros(self.args.data_range)  # define empty msd array
+        self.count = 0
+
+    @property
+    def overlap_batches(self) -> bool:
+        """The msd windows use every time origin of the trajectory."""
+        return True
+
+    @staticmethod
+    def _map_over_species(ds_a: np.ndarray, ds_b: np.ndarray) -> np.ndarray:
+        """
+        Compute the distinct MSD from the summed displacements of each data set.
+
+        The mean over all pairs of the product of two displacements equals the
+        product of the summed displacements divided by the number of pairs. This
+        gives the same result as _map_over_particles in O(n_a + n_b) instead of
+        O(n_a n_b) per configuration.
+
+        Parameters
+        ----------
+        ds_a : np.ndarray (n_particles, n_origins, n_configurations, dimension)
+                Dataset to compute correlation with.
+        ds_b : np.ndarray (n_particles, n_origins, n_configurations, dimension)
+                Other dataset to compute correlation with. Does not need to be the
+                same shape as ds_a along the zeroth (particle) axis.
+
+        Returns
+        -------
+        msd : np.ndarray (n_configurations,)
+                Displacement product averaged over all pairs and the spatial
+                dimension, summed over the time origins.
+        """
+        collective_a = np.sum(ds_a - ds_a[:, :, :1], axis=0)
+        collective_b = np.sum(ds_b - ds_b[:, :, :1], axis=0)
+
+        return np.sum(np.mean(collective_a * collective_b, axis=-1), axis=0) / (
+            ds_a.shape[0] * ds_b.shape[0]
+        )
 
     def _map_over_particles(self, ds_a: np.ndarray, ds_b: np.ndarray) -> np.ndarray:
         """
@@ -180,15 +234,17 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
 
         Parameters
         ----------
-        ds_a : np.ndarray (n_particles, n_configurations, dimension)
+        ds_a : np.ndarray (n_particles, n_origins, n_configurations, dimension)
                 Dataset to compute correlation with.
-        ds_b : np.ndarray (n_particles, n_configurations, dimension)
+        ds_b : np.ndarray (n_particles, n_origins, n_configurations, dimension)
                 Other dataset to compute correlation with. Does not need to be the
                 same shape as ds_a along the zeroth (particle) axis.
 
         Returns
         -------
-
+        msd : np.ndarray (n_configurations,)
+                Displacement product averaged over all pairs and the spatial
+                dimension, summed over the time origins.
         """
 
         def ref_conf_map(ref_dataset, full_ds):
@@ -217,7 +273,10 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
 
         acf_calc = jax.vmap(ref_conf_map, in_axes=(0, None))
 
-        return np.mean(acf_calc(ds_a, ds_b), axis=0)
+        return sum(
+            np.mean(acf_calc(ds_a[:, origin], ds_b[:, origin]), axis=0)
+            for origin in range(ds_a.shape[1])
+        )
 
     def _compute_self_correlation(self, ds_a, ds_b):
         """
@@ -225,15 +284,18 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
 
         Parameters
         ----------
-        ds_a : np.ndarray (n_timesteps, n_atoms, dimension)
-        ds_b : np.ndarray (n_timesteps, n_atoms, dimension).
+        ds_a : np.ndarray (n_atoms, n_origins, n_timesteps, dimension)
+        ds_b : np.ndarray (n_atoms, n_origins, n_timesteps, dimension).
 
         Returns
         -------
+        self_correlation : np.ndarray (n_timesteps,)
+                Displacement product of each atom with itself, averaged over the atoms
+                and the spatial dimension and summed over the time origins.
         """
-        atomwise_vmap = jax.vmap(msd_operation, in_axes=0)
+        self_correlation = (ds_a - ds_a[:, :, :1]) * (ds_b - ds_b[:, :, :1])
 
-        return np.mean(atomwise_vmap(ds_a, ds_b), axis=0)
+        return np.sum(np.mean(self_correlation, axis=(0, -1)), axis=0)
 
     def _compute_msd(self, data: dict, data_path: list, combination: tuple):
         """
@@ -242,7 +304,7 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
         Parameters
         ----------
         data : dict
-                Dictionary of data returned by tensorflow.
+                Block of time-origin windows of each species.
         data_path : list
                 Data paths for accessing the dictionary.
         combination : tuple
@@ -252,17 +314,18 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
         -------
         updates the class state
         """
-        msd_array = self._map_over_particles(
-            data[data_path[0]].numpy(), data[data_path[1]].numpy()
+        msd_array = self._distinct_algorithms[self.args.algorithm](
+            data[data_path[0]], data[data_path[1]]
         )
 
         if combination[0] == combination[1]:
             self_correction = self._compute_self_correlation(
-                data[data_path[0]].numpy(), data[data_path[1]].numpy()
+                data[data_path[0]], data[data_path[1]]
             )
             msd_array -= self_correction
 
         self.msd_array += msd_array
+        self.count += data[data_path[0]].shape[1]
 
     def _apply_averaging_factor(self):
         """
@@ -272,7 +335,7 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
         -------
         averaged copy of the tensor_values.
         """
-        self.msd_array /= int(self.n_batches) * self.ensemble_loop
+        self.msd_array /= self.count
 
     def _post_operation_processes(self, species: Union[str, tuple] = None):
         """
@@ -334,7 +397,9 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
                 str.encode("/".join([species, self.loaded_property.name]))
                 for species in species_values
             ]
-            batch_ds = self.get_batch_dataset(species_values)
+            batch_ds = self.get_batch_dataset(
+                species_values, overlap=self.overlap_batches
+            )
 
             for batch in tqdm(
                 batch_ds,
@@ -343,9 +408,9 @@ class EinsteinDistinctDiffusionCoefficients(TrajectoryCalculator):
                 total=self.n_batches,
                 disable=self.memory_manager.minibatch,
             ):
-                ensemble_ds = self.get_ensemble_dataset(batch, species_values)
-                for ensemble in ensemble_ds:
-                    self._compute_msd(ensemble, dict_ref, combination)
+                for block in self.get_ensemble_blocks(batch):
+                    self._compute_msd(block, dict_ref, combination)
 
             self._post_operation_processes(combination)
             self.msd_array = np.zeros(self.args.data_range)  # define empty msd array
+            self.count = 0
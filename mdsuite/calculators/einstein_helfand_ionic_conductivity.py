@@ -27,10 +27,10 @@ MDSuite module for the computation of ionic conductivity using the Einstein meth
 """
 from abc import ABC
 from dataclasses import dataclass
+from typing import List
 
 import numpy as np
 import tensorflow as tf
-from tqdm import tqdm
 
 from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
@@ -128,6 +128,7 @@ class EinsteinHelfandIonicConductivity(TrajectoryCalculator, ABC):
         self.plot = plot
         self.time = self._handle_tau_values()
         self.msd_array = np.zeros(self.data_resolution)
+        self.count = 0
 
     def check_input(self):
         """
@@ -160,25 +161,31 @@ class EinsteinHelfandIonicConductivity(TrajectoryCalculator, ABC):
 
     def _apply_averaging_factor(self):
         """Apply the averaging factor to the msd array."""
-        self.msd_array /= int(self.n_batches) * self.ensemble_loop
+        self.msd_array /= self.count
 
-    def ensemble_operation(self, ensemble: tf.Tensor):
+    @property
+    def overlap_batches(self) -> bool:
+        """The msd windows use every time origin of the trajectory."""
+        return True
+
+    def ensemble_operation(self, ensemble: np.ndarray):
         """
         Calculate and return the msd.
 
         Parameters
         ----------
-        ensemble
+        ensemble : np.ndarray (1, n_origins, data_range, dimension)
+                The windows of a block of time origins.
 
         Returns
         -------
-        MSD of the tensor_values.
+        Adds the MSD of the tensor_values summed over the time origins.
         """
-        msd = tf.math.squared_difference(
-            tf.gather(ensemble, self.args.tau_values, axis=1), ensemble[:, 0, :]
-        )
-        msd = self.prefactor * tf.reduce_sum(msd, axis=2)
-        self.msd_array += np.array(msd)[0, :]
+        msd = (
+            np.take(ensemble, self.args.tau_values, axis=2) - ensemble[:, :, None, 0]
+        ) ** 2
+        self.count += msd.shape[1]
+        self.msd_array += self.prefactor * np.sum(msd, axis=(0, 1, 3))
 
     def _post_operation_processes(self):
         """
@@ -201,6 +208,27 @@ class EinsteinHelfandIonicConductivity(TrajectoryCalculator, ABC):
 
         self.queue_data(data=data, subjects=["System"])
 
+    def get_subjects(self) -> List[str]:
+        """The translational dipole moment is stored with the observables."""
+        return [DatasetKeys.OBSERVABLES]
+
+    def start_subject(self, subject: str):
+        """Reset the msd and compute the pre-factor."""
+        self._calculate_prefactor()
+        self.msd_array = np.zeros(self.data_resolution)
+        self.count = 0
+
+    def batch_operation(self, subject: str, batch: dict):
+        """Add the msd of the ensembles in a batch."""
+        dict_ref = str.encode("/".join([subject, self.loaded_property.name]))
+        for block in self.get_ensemble_blocks(batch):
+            self.ensemble_operation(block[dict_ref])
+
+    def finish_subject(self, subject: str):
+        """Scale, save, and plot the data."""
+        self._apply_averaging_factor()
+        self._post_operation_processes()
+
     def run_calculator(self):
         """
 
@@ -211,26 +239,4 @@ class EinsteinHelfandIonicConductivity(TrajectoryCalculator, ABC):
 
         """
         self.check_input()
-        # Compute the pre-factor early.
-        self._calculate_prefactor()
-
-        dict_ref = str.encode(
-            "/".join([DatasetKeys.OBSERVABLES, self.loaded_property.name])
-        )
-
-        batch_ds = self.get_batch_dataset([DatasetKeys.OBSERVABLES])
-
-        for batch in tqdm(
-            batch_ds,
-            ncols=70,
-            total=self.n_batches,
-            disable=self.memory_manager.minibatch,
-        ):
-            ensemble_ds = self.get_ensemble_dataset(batch, DatasetKeys.OBSERVABLES)
-
-            for ensemble in ensemble_ds:
-                self.ensemble_operation(ensemble[dict_ref])
-
-        # Scale, save, and plot the data.
-        self._apply_averaging_factor()
-        self._post_operation_processes()
+        self.run_batch_loop()
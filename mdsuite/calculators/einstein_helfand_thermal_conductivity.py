@@ -137,6 +137,7 @@ class EinsteinHelfandThermalConductivity(TrajectoryCalculator, ABC):
         self.plot = plot
         self.time = self._handle_tau_values()
         self.msd_array = np.zeros(self.data_resolution)
+        self.count = 0
 
     def check_input(self):
         """
@@ -180,24 +181,32 @@ class EinsteinHelfandThermalConductivity(TrajectoryCalculator, ABC):
         -------.
 
         """
-        self.msd_array /= int(self.n_batches) * self.ensemble_loop
+        self.msd_array /= self.count
 
-    def ensemble_operation(self, ensemble):
+    @property
+    def overlap_batches(self) -> bool:
+        """The msd windows use every time origin of the trajectory."""
+        return True
+
+    def ensemble_operation(self, ensemble: np.ndarray):
         """
         Calculate and return the msd.
 
         Parameters
         ----------
-        ensemble
+        ensemble : np.ndarray (1, n_origins, data_range, dimension)
+                The windows of a block of time origins.
 
         Returns
         -------
-        MSD of the tensor_values.
+        Adds the MSD of the tensor_values summed over the time origins.
         """
-        msd = tf.math.squared_difference(ensemble, ensemble[None, 0])
-
-        msd = self.prefactor * tf.reduce_sum(msd, axis=1)
-        self.msd_array += np.array(msd)  # Update the averaged function
+        msd = (
+            np.take(ensemble, self.args.tau_values, axis=2) - ensemble[:, :, None, 0]
+        ) ** 2
+        self.count += msd.shape[1]
+        # Update the averaged function
+        self.msd_array += self.prefactor * np.sum(msd, axis=(0, 1, 3))
 
     def _post_operation_processes(self):
         """
@@ -243,7 +252,9 @@ class EinsteinHelfandThermalConductivity(TrajectoryCalculator, ABC):
             "/".join([DatasetKeys.OBSERVABLES, self.loaded_property.name])
         )
 
-        batch_ds = self.get_batch_dataset([DatasetKeys.OBSERVABLES])
+        batch_ds = self.get_batch_dataset(
+            [DatasetKeys.OBSERVABLES], overlap=self.overlap_batches
+        )
 
         for batch in tqdm(
             batch_ds,
@@ -251,10 +262,8 @@ class EinsteinHelfandThermalConductivity(TrajectoryCalculator, ABC):
             total=self.n_batches,
             disable=self.memory_manager.minibatch,
         ):
-            ensemble_ds = self.get_ensemble_dataset(batch, DatasetKeys.OBSERVABLES)
-
-            for ensemble in ensemble_ds:
-                self.ensemble_operation(ensemble[dict_ref])
+            for block in self.get_ensemble_blocks(batch):
+                self.ensemble_operation(block[dict_ref])
 
         # Scale, save, and plot the data.
         self._apply_averaging_factor()
@@ -30,7 +30,6 @@ from abc import ABC
 from dataclasses import dataclass
 from typing import Any, List, Union
 
-import jax
 import numpy as np
 import tensorflow as tf
 from bokeh.models import Span
@@ -39,7 +38,7 @@ from tqdm import tqdm
 from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
 from mdsuite.database.mdsuite_properties import mdsuite_properties
-from mdsuite.utils.calculator_helper_methods import correlate
+from mdsuite.utils.calculator_helper_methods import fft_correlate, lag_counts
 
 
 @dataclass
@@ -53,6 +52,7 @@ class Args:
     molecules: bool
     species: list
     integration_range: int
+    algorithm: str
 
 
 class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
@@ -104,6 +104,10 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
         self.result_series_keys = ["time", "vacf"]
         self._dtype = tf.float64
         self.sigma = []
+        self._distinct_algorithms = {
+            "collective": self._map_over_species,
+            "pairwise": self._map_over_particles,
+        }
 
     @call
     def __call__(
@@ -118,6 +122,7 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
         export: bool = False,
         atom_selection: dict = np.s_[:],
         integration_range: int = None,
+        algorithm: str = "collective",
     ):
         """
         Constructor for the Green Kubo diffusion coefficients class.
@@ -142,7 +147,18 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
                 If true, export the data directly into a csv file.
         integration_range : int
                 Range over which to perform the integration.
+        algorithm : str
+                How the distinct correlation is computed. 'collective' correlates
+                each particle with the summed velocity of the other species,
+                'pairwise' correlates every pair of particles and is kept as a
+                reference. Both give the same result.
         """
+        if algorithm not in self._distinct_algorithms:
+            raise ValueError(
+                f"Unknown algorithm {algorithm}, choose one of"
+                f" {list(self._distinct_algorithms)}"
+            )
+
         if integration_range is None:
             integration_range = data_range
 
@@ -155,6 +171,7 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
             molecules=molecules,
             species=species,
             integration_range=integration_range,
+            algorithm=algorithm,
         )
 
         self.plot = plot
@@ -162,7 +179,8 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         self.species = species  # Which species to calculate for
 
-        self.vacf = np.zeros(self.args.data_range)
+        self.vacf = np.zeros(self.data_resolution)
+        self.count = 0
 
         if self.species is None:
             self.species = list(self.experiment.species)
@@ -175,26 +193,27 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         Parameters
         ----------
-        ds_a : np.ndarray (n_timesteps, n_atoms, dimension)
-        ds_b : np.ndarray (n_timesteps, n_atoms, dimension)
-        data_range : int (default = 500)
-                Range over which the acf will be computed.
-        correlation_time : int (default = 1).
+        ds_a : np.ndarray (n_atoms, n_timesteps, dimension)
+        ds_b : np.ndarray (n_atoms, n_timesteps, dimension)
 
         Returns
         -------
-        -------.
+        self_correlation : np.ndarray (n_atoms, data_range)
+                Correlation of each atom with itself, summed over the time origins
+                and averaged over the spatial dimension.
         """
-        atomwise_vmap = jax.vmap(correlate, in_axes=0)
+        correlation = fft_correlate(ds_a, ds_b, max_lag=self.args.data_range)
 
-        return np.mean(atomwise_vmap(ds_a, ds_b), axis=0)
+        return correlation / ds_a.shape[-1]
 
-    def _map_over_particles(self, ds_a: np.ndarray, ds_b: np.ndarray) -> np.ndarray:
+    def _map_over_species(self, ds_a: np.ndarray, ds_b: np.ndarray) -> np.ndarray:
         """
-        Function to map a correlation in a Gram matrix style over two data sets.
+        Correlate every particle in ds_a with the summed signal of ds_b.
 
-        This function will perform the nxm calculations to compute the correlation
-        between all particles in ds_a with all particles in ds_b.
+        The correlation is linear in its second argument, so the sum over the
+        particles in ds_b can be taken before correlating. This gives the same
+        result as _map_over_particles in O((n_a + n_b) T log T) instead of
+        O(n_a n_b T log T).
 
         Parameters
         ----------
@@ -206,40 +225,52 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         Returns
         -------
-
+        correlation : np.ndarray (n_particles_a, data_range)
+                Correlation of each particle in ds_a summed over the time origins
+                and averaged over all particles in ds_b and the spatial dimension.
         """
+        collective_b = np.sum(ds_b, axis=0, keepdims=True)
+        correlation = fft_correlate(ds_a, collective_b, max_lag=self.args.data_range)
 
-        def ref_conf_map(ref_dataset, full_ds):
-            """
-            Maps over the atoms axis in dataset
-            Parameters
-            ----------
-            dataset
-            Returns
-            -------.
-            """
+        return correlation / (ds_b.shape[0] * ds_a.shape[-1])
 
-            def test_conf_map(test_dataset):
-                """
-                Map over atoms in test dataset.
+    def _map_over_particles(self, ds_a: np.ndarray, ds_b: np.ndarray) -> np.ndarray:
+        """
+        Function to map a correlation in a Gram matrix style over two data sets.
 
-                Parameters
-                ----------
-                test_dataset
-                Returns
-                -------.
-                """
-                return correlate(ref_dataset, test_dataset)
+        This function will perform the nxm calculations to compute the correlation
+        between all particles in ds_a with all particles in ds_b.
 
-            return np.mean(jax.vmap(test_conf_map, in_axes=0)(full_ds), axis=0)
+        Parameters
+        ----------
+        ds_a : np.ndarray (n_particles, n_configurations, dimension)
+                Dataset to compute correlation with.
+        ds_b : np.ndarray (n_particles, n_configurations, dimension)
+                Other dataset to compute correlation with. Does not need to be the
+                same shape as ds_a along the zeroth (particle) axis.
 
-        acf_calc = jax.vmap(ref_conf_map, in_axes=(0, None))
+        Returns
+        -------
+        correlation : np.ndarray (n_particles_a, data_range)
+                Correlation of each particle in ds_a summed over the time origins
+                and averaged over all particles in ds_b and the spatial dimension.
+        """
+        correlation = np.zeros((ds_a.shape[0], self.args.data_range))
+        for i, reference in enumerate(ds_a):
+            correlation[i] = np.mean(
+                fft_correlate(
+                    np.broadcast_to(reference, ds_b.shape),
+                    ds_b,
+                    max_lag=self.args.data_range,
+                ),
+                axis=0,
+            )
 
-        return np.mean(acf_calc(ds_a, ds_b), axis=0)
+        return correlation / ds_a.shape[-1]
 
     def ensemble_operation(self, data: dict, dict_ref: list, same_species: bool = False):
         """
-        Compute the vacf on the given dictionary of data.
+        Compute the vacf over all time origins of the given dictionary of data.
 
         Parameters
         ----------
@@ -255,16 +286,21 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
         -------
         updates the class state
         """
-        vacf = self._map_over_particles(
-            data[dict_ref[0]].numpy(), data[dict_ref[1]].numpy()
-        )
+        ds_a = np.array(data[dict_ref[0]])
+        ds_b = np.array(data[dict_ref[1]])
+        vacf = self._distinct_algorithms[self.args.algorithm](ds_a, ds_b)
         if same_species:
-            self_correlation = self._compute_self_correlation(
-                data[dict_ref[0]].numpy(), data[dict_ref[1]].numpy()
-            )
-            vacf -= self_correlation
-        self.vacf += vacf
-        self.sigma.append(np.trapz(vacf, x=self.time))
+            vacf -= self._compute_self_correlation(ds_a, ds_b)
+        vacf = vacf[:, self.args.tau_values]
+        n_configurations = ds_a.shape[1]
+        origins = lag_counts(n_configurations, self.args.data_range)[self.args.tau_values]
+
+        # integrate the particle-wise vacf to estimate the uncertainty, which needs
+        # every lag, so batches shorter than the data range only add to the vacf
+        if n_configurations >= self.args.data_range:
+            self.sigma.extend(np.trapz(vacf / origins, x=self.time, axis=1))
+        self.vacf += np.sum(vacf, axis=0)
+        self.count += len(vacf) * origins
 
     def run_calculator(self):
         """Perform the distinct coefficient analysis analysis."""
@@ -284,15 +320,15 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
                 total=self.n_batches,
                 disable=self.memory_manager.minibatch,
             ):
-                ensemble_ds = self.get_ensemble_dataset(batch, species_values)
-                for ensemble in ensemble_ds:
-                    self.ensemble_operation(
-                        ensemble, dict_ref, species_values[0] == species_values[1]
-                    )
+                self.ensemble_operation(
+                    batch, dict_ref, species_values[0] == species_values[1]
+                )
 
             self._calculate_prefactor(combination)
             self._post_operation_processes(combination)
             self.sigma = []
+            self.vacf = np.zeros(self.data_resolution)
+            self.count = 0
 
     def _calculate_prefactor(self, species: Union[str, tuple] = None):
         """
@@ -307,10 +343,7 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
         -------
 
         """
-        numerator = self.experiment.units.length**2
-        denominator = self.experiment.units.time * (self.args.data_range - 1)
-
-        self.prefactor = numerator / denominator
+        self.prefactor = self.experiment.units.length**2 / self.experiment.units.time
 
     def check_input(self):
         """
@@ -329,13 +362,20 @@ class GreenKuboDistinctDiffusionCoefficients(TrajectoryCalculator, ABC):
         -------.
 
         """
-        result = self.prefactor * np.array(self.sigma)
+        vacf = self.vacf / self.count
+        result = self.prefactor * np.trapz(vacf, x=self.time)
+        # standard error of the particle-wise integrals of the full batches
+        sigma = self.prefactor * np.array(self.sigma)
+        if len(sigma) > 0:
+            uncertainty = float(np.std(sigma) / np.sqrt(len(sigma)))
+        else:
+            uncertainty = np.nan
 
         data = {
-            self.result_keys[0]: np.mean(result).tolist(),
-            self.result_keys[1]: (np.std(result) / (np.sqrt(len(result)))).tolist(),
+            self.result_keys[0]: float(result),
+            self.result_keys[1]: uncertainty,
             self.result_series_keys[0]: self.time.tolist(),
-            self.result_series_keys[1]: self.vacf.tolist(),
+            self.result_series_keys[1]: vacf.tolist(),
         }
 
         self.queue_data(data=data, subjects=list(species))
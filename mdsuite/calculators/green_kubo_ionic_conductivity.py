@@ -30,20 +30,24 @@ from electronic conductivity which is transferred by electrons.
 """
 from abc import ABC
 from dataclasses import dataclass
+from typing import List
 
 import numpy as np
 import tensorflow as tf
-import tensorflow_probability as tfp
 from bokeh.models import HoverTool, LinearAxis, Span
 from bokeh.models.ranges import Range1d
 from bokeh.plotting import figure
 from scipy.integrate import cumtrapz
-from tqdm import tqdm
 
 from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
 from mdsuite.database.mdsuite_properties import mdsuite_properties
 from mdsuite.utils import DatasetKeys
+from mdsuite.utils.calculator_helper_methods import (
+    fft_correlate,
+    lag_counts,
+    split_time_blocks,
+)
 from mdsuite.utils.units import boltzmann_constant, elementary_charge
 
 
@@ -56,6 +60,7 @@ class Args:
     tau_values: np.s_
     atom_selection: np.s_
     integration_range: int
+    algorithm: str
 
 
 class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
@@ -118,6 +123,7 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
         correlation_time=1,
         tau_values: np.s_ = np.s_[:],
         integration_range: int = None,
+        algorithm: str = "fft",
     ):
         """
 
@@ -131,7 +137,19 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
                 Correlation time to use in the window sampling.
         integration_range : int
                 Range over which integration should be performed.
+        algorithm : str
+                Algorithm used to compute the current ACF. "fft" correlates every
+                time origin of each batch with FFTs. "multi_tau" streams the
+                trajectory once through a multiple-tau correlator and computes the
+                ACF at log-spaced lags up to the data range. In this case tau_values
+                are ignored, integration_range is a lag in frames and the
+                uncertainty is estimated from the three Cartesian components.
         """
+        if algorithm not in ("fft", "multi_tau"):
+            raise ValueError(
+                f"Unknown ACF algorithm '{algorithm}', use either 'fft' or"
+                " 'multi_tau'."
+            )
         self.plot = plot
         self.jacf: np.ndarray
         self.sigma = []
@@ -146,6 +164,7 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
             tau_values=tau_values,
             atom_selection=np.s_[:],
             integration_range=integration_range,
+            algorithm=algorithm,
         )
 
         self.time = self._handle_tau_values()
@@ -187,23 +206,32 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
 
     def ensemble_operation(self, ensemble: tf.Tensor):
         """
-        Calculate and return the msd.
+        Calculate the current autocorrelation over all time origins of a batch.
 
         Parameters
         ----------
         ensemble : tf.Tensor
-                Ensemble on which to operate.
+                Batch of the ionic current on which to operate.
 
         Returns
         -------
-        ACF of the tensor_values.
+        jacf : np.ndarray
+                Current ACF summed over the time origins.
+        counts : np.ndarray
+                Number of time origins at each tau value.
         """
-        ensemble = tf.gather(ensemble, self.args.tau_values, axis=1)
-        jacf = tfp.stats.auto_correlation(ensemble, normalize=False, axis=1, center=False)
-        jacf = tf.squeeze(tf.reduce_sum(jacf, axis=-1), axis=0)
-        self.sigmas.append(cumtrapz(jacf, x=self.time))
+        ensemble = np.array(ensemble)
+        jacf = fft_correlate(ensemble, max_lag=self.args.data_range)
+        jacf = np.sum(jacf[:, self.args.tau_values], axis=0)
+
+        # non-overlapping windows give independent samples for the uncertainty
+        blocks = split_time_blocks(ensemble, self.args.data_range)
+        block_jacf = fft_correlate(blocks, normalize=True)[:, self.args.tau_values]
+        self.sigmas.extend(cumtrapz(block_jacf, x=self.time, axis=1))
 
-        return np.array(jacf)
+        n_particles, n_configurations, _ = ensemble.shape
+        counts = lag_counts(n_configurations, self.args.data_range)
+        return jacf, n_particles * counts[self.args.tau_values]
 
     def _post_operation_processes(self):
         """
@@ -214,11 +242,18 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
         """
         self.acf_array /= self.count
         sigma = cumtrapz(self.acf_array, x=self.time)
-        sigma_SEM = np.std(self.sigmas, axis=0) / np.sqrt(len(self.sigmas))
-        ionic_conductivity = self.prefactor * sigma[self.args.integration_range - 1]
-        ionic_conductivity_SEM = (
-            self.prefactor * sigma_SEM[self.args.integration_range - 1]
+        if len(self.sigmas) > 0:
+            sigma_SEM = np.std(self.sigmas, axis=0) / np.sqrt(len(self.sigmas))
+        else:
+            # no batch spans the data range
+            sigma_SEM = np.full_like(sigma, np.nan)
+        integration_index = self._get_range_index(
+            self.args.integration_range,
+            self.time,
+            self.experiment.time_step * self.experiment.sample_rate,
         )
+        ionic_conductivity = self.prefactor * sigma[integration_index - 1]
+        ionic_conductivity_SEM = self.prefactor * sigma_SEM[integration_index - 1]
         data = {
             self.result_keys[0]: [ionic_conductivity],
             self.result_keys[1]: [ionic_conductivity_SEM],
@@ -240,10 +275,13 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
             time = np.array(val[self.result_series_keys[0]])
             acf = np.array(val[self.result_series_keys[1]])
             # Compute the span
+            span_index = self._get_range_index(
+                self.args.integration_range,
+                time,
+                self.experiment.time_step * self.experiment.sample_rate,
+            )
             span = Span(
-                location=np.array(val[self.result_series_keys[0]])[
-                    self.args.integration_range - 1
-                ],
+                location=time[span_index - 1],
                 dimension="height",
                 line_dash="dashed",
             )
@@ -283,28 +321,45 @@ class GreenKuboIonicConductivity(TrajectoryCalculator, ABC):
             fig.add_layout(span)
             self.plot_array.append(fig)
 
-    def run_calculator(self):
-        """Run analysis."""
-        self.check_input()
-        # Compute the pre-factor early.
-        self._calculate_prefactor()
+    def multi_tau_operation(self):
+        """Collect the current ACF at log-spaced lags from the correlator."""
+        lags, jacf = self.correlator.get_correlation(per_dimension=True)
+        self.time = self._get_multi_tau_time(lags)
 
-        dict_ref = str.encode(
-            "/".join([DatasetKeys.OBSERVABLES, self.loaded_property.name])
-        )
+        self.acf_array = np.sum(jacf[0], axis=0)
+        self.count = 1
+        # each component is an estimate of the isotropic ACF summed over dimensions
+        self.sigmas = list(cumtrapz(jacf.shape[1] * jacf[0], x=self.time, axis=1))
+
+    def get_subjects(self) -> List[str]:
+        """The ionic current is stored with the observables."""
+        return [DatasetKeys.OBSERVABLES]
+
+    def start_subject(self, subject: str):
+        """Reset the current ACF and compute the pre-factor."""
+        self._calculate_prefactor()
         self.count = 0
-        self.acf_array = np.zeros((self.args.data_range,))
-        batch_ds = self.get_batch_dataset([DatasetKeys.OBSERVABLES])
-        for batch in tqdm(
-            batch_ds,
-            ncols=70,
-            total=self.n_batches,
-            disable=self.memory_manager.minibatch,
-        ):
-            ensemble_ds = self.get_ensemble_dataset(batch, DatasetKeys.OBSERVABLES)
-            for ensemble in ensemble_ds:
-                self.acf_array += self.ensemble_operation(ensemble[dict_ref])
-                self.count += 1
-
-        # Scale, save, and plot the data.
+        self.acf_array = np.zeros(self.data_resolution)
+        self.sigmas = []
+        self.correlator = None
+
+    def batch_operation(self, subject: str, batch: dict):
+        """Add the current ACF of a batch."""
+        dict_ref = str.encode("/".join([subject, self.loaded_property.name]))
+        if self.args.algorithm == "multi_tau":
+            self.update_multi_tau_correlator(batch[dict_ref], mode="correlation")
+            return
+        jacf, counts = self.ensemble_operation(batch[dict_ref])
+        self.acf_array += jacf
+        self.count += counts
+
+    def finish_subject(self, subject: str):
+        """Scale, save, and plot the data."""
+        if self.args.algorithm == "multi_tau":
+            self.multi_tau_operation()
         self._post_operation_processes()
+
+    def run_calculator(self):
+        """Run analysis."""
+        self.check_input()
+        self.run_batch_loop()
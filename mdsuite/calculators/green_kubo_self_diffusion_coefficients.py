@@ -31,17 +31,16 @@ from typing import Any, List, Union
 
 import numpy as np
 import tensorflow as tf
-import tensorflow_probability as tfp
 from bokeh.models import HoverTool, LinearAxis, Span
 from bokeh.models.ranges import Range1d
 from bokeh.plotting import figure
 from scipy.integrate import cumtrapz
-from tqdm import tqdm
 
 from mdsuite import utils
 from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
 from mdsuite.database.mdsuite_properties import mdsuite_properties
+from mdsuite.utils.calculator_helper_methods import fft_correlate, lag_counts
 
 
 @dataclass
@@ -55,6 +54,7 @@ class Args:
     molecules: bool
     species: list
     integration_range: int
+    algorithm: str
 
 
 class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
@@ -119,6 +119,7 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
         molecules: bool = False,
         tau_values: Union[int, List, Any] = np.s_[:],
         integration_range: int = None,
+        algorithm: str = "fft",
     ):
         """
         Constructor for the Green-Kubo diffusion coefficients class.
@@ -140,7 +141,19 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
         integration_range : int
                 Range over which to integrate. Default is to integrate over
                 the full data range.
+        algorithm : str
+                Algorithm used to compute the VACF. "fft" correlates every time
+                origin of each batch with FFTs. "multi_tau" streams the trajectory
+                once through a multiple-tau correlator and computes the VACF at
+                log-spaced lags up to the data range with O(N log(data_range))
+                memory. In this case tau_values are ignored and integration_range
+                is a lag in frames.
         """
+        if algorithm not in ("fft", "multi_tau"):
+            raise ValueError(
+                f"Unknown VACF algorithm '{algorithm}', use either 'fft' or"
+                " 'multi_tau'."
+            )
         if species is None:
             if molecules:
                 species = list(self.experiment.molecules)
@@ -158,6 +171,7 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
             molecules=molecules,
             species=species,
             integration_range=integration_range,
+            algorithm=algorithm,
         )
 
         self.plot = plot
@@ -178,30 +192,37 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
 
     def ensemble_operation(self, ensemble):
         """
-        Calculate and return the msd.
+        Calculate the vacf over all time origins of a batch.
 
         Parameters
         ----------
-        ensemble
+        ensemble : tf.Tensor (n_particles, n_configurations, dimension)
+                A batch of velocities. Every configuration is used as a time origin,
+                the batch may be shorter than the data range.
 
         Returns
         -------
-        MSD of the tensor_values.
+        vacf : np.ndarray
+                VACF summed over particles, dimensions and time origins.
+        counts : np.ndarray
+                Number of (particle, time origin) samples at each tau value.
         """
+        n_particles, n_configurations, _ = ensemble.shape
         vacf = (
             self.experiment.units.length**2
             / self.experiment.units.time**2
-            * tfp.stats.auto_correlation(ensemble, normalize=False, axis=1, center=False)
+            * fft_correlate(np.array(ensemble), max_lag=self.args.data_range)[
+                :, self.args.tau_values
+            ]
         )
-        self.count += vacf.shape[0]
+        origins = lag_counts(n_configurations, self.args.data_range)[self.args.tau_values]
 
-        # average particles, sum dimensions
-        return_vacf = tf.reduce_sum(tf.reduce_sum(vacf, axis=0), -1)
-        self.sigmas.append(
-            cumtrapz(tf.reduce_sum(tf.reduce_mean(vacf, axis=0), -1), x=self.time)
-        )
+        # integrate the particle-wise vacf to estimate the uncertainty, which needs
+        # every lag, so batches shorter than the data range only add to the vacf
+        if n_configurations >= self.args.data_range:
+            self.sigmas.extend(cumtrapz(vacf / origins, x=self.time, axis=1))
 
-        return np.array(return_vacf)
+        return np.sum(vacf, axis=0), n_particles * origins
 
     def plot_data(self, data: dict):
         """
@@ -220,10 +241,11 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
             time = np.array(val[self.result_series_keys[0]])
             vacf = np.array(val[self.result_series_keys[1]])
             # Compute the span
+            span_index = self._get_range_index(
+                self.args.integration_range, time, self._frame_time
+            )
             span = Span(
-                location=np.array(val[self.result_series_keys[0]])[
-                    self.args.integration_range - 1
-                ],
+                location=time[span_index - 1],
                 dimension="height",
                 line_dash="dashed",
             )
@@ -281,10 +303,17 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
         self.acf_array = self.acf_array / self.count
         self.sigmas = np.array(self.sigmas)
         sigma = cumtrapz(self.acf_array, x=self.time)
-        sigma_SEM = np.std(self.sigmas, axis=0) / np.sqrt(len(self.sigmas))
-
-        diff_coeff = 1 / 3 * sigma[self.args.integration_range - 1]
-        diff_coeff_SEM = 1 / 3 * sigma_SEM[self.args.integration_range - 1]
+        if len(self.sigmas) > 0:
+            sigma_SEM = np.std(self.sigmas, axis=0) / np.sqrt(len(self.sigmas))
+        else:
+            # no batch spans the data range
+            sigma_SEM = np.full_like(sigma, np.nan)
+
+        integration_index = self._get_range_index(
+            self.args.integration_range, self.time, self._frame_time
+        )
+        diff_coeff = 1 / 3 * sigma[integration_index - 1]
+        diff_coeff_SEM = 1 / 3 * sigma_SEM[integration_index - 1]
 
         data = {
             self.result_keys[0]: [diff_coeff],
@@ -297,6 +326,43 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         self.queue_data(data=data, subjects=[species])
 
+    def multi_tau_operation(self):
+        """Collect the vacf at log-spaced lags from the multiple-tau correlator."""
+        lags, vacf = self.correlator.get_correlation()
+        self.time = self._get_multi_tau_time(lags) * self.experiment.units.time
+        vacf *= self.experiment.units.length**2 / self.experiment.units.time**2
+
+        self.acf_array = np.sum(vacf, axis=0)
+        self.count = len(vacf)
+        self.sigmas = list(cumtrapz(vacf, x=self.time, axis=1))
+
+    def get_subjects(self) -> List[str]:
+        """Species for which the diffusion coefficient is computed."""
+        return self.args.species
+
+    def start_subject(self, subject: str):
+        """Reset the vacf before the first batch of a species."""
+        self.count = 0
+        self.acf_array = np.zeros(self.data_resolution)
+        self.sigmas = []
+        self.correlator = None
+
+    def batch_operation(self, subject: str, batch: dict):
+        """Add the vacf of a batch of a species."""
+        dict_ref = str.encode("/".join([subject, self.loaded_property.name]))
+        if self.args.algorithm == "multi_tau":
+            self.update_multi_tau_correlator(batch[dict_ref], mode="correlation")
+            return
+        vacf, counts = self.ensemble_operation(batch[dict_ref])
+        self.acf_array += vacf
+        self.count += counts
+
+    def finish_subject(self, subject: str):
+        """Scale, save, and plot the data of a species."""
+        if self.args.algorithm == "multi_tau":
+            self.multi_tau_operation()
+        self.postprocessing(subject)
+
     def run_calculator(self):
         """
         Run analysis.
@@ -306,30 +372,4 @@ class GreenKuboDiffusionCoefficients(TrajectoryCalculator, ABC):
 
         """
         self.check_input()
-        # Loop over species
-        for species in self.args.species:
-            dict_ref = str.encode("/".join([species, self.loaded_property.name]))
-
-            batch_ds = self.get_batch_dataset([species])
-            self.count = 0
-            self.acf_array = np.zeros(self.data_resolution)
-            self.sigmas = []
-
-            for batch in tqdm(
-                batch_ds,
-                ncols=70,
-                desc=species,
-                total=self.n_batches,
-                disable=self.memory_manager.minibatch,
-            ):
-                ensemble_ds = self.get_ensemble_dataset(batch, species)
-
-                for ensemble in ensemble_ds:
-                    if not ensemble[dict_ref].shape[1] == self.args.data_range:
-                        continue
-                    else:
-                        self.acf_array += self.ensemble_operation(ensemble[dict_ref])
-                        self.count += 1
-
-            # Scale, save, and plot the data.
-            self.postprocessing(species)
+        self.run_batch_loop()
@@ -31,7 +31,6 @@ from dataclasses import dataclass
 
 import numpy as np
 import tensorflow as tf
-import tensorflow_probability as tfp
 from bokeh.models import Span
 from tqdm import tqdm
 
@@ -39,6 +38,11 @@ from mdsuite.calculators.calculator import call
 from mdsuite.calculators.trajectory_calculator import TrajectoryCalculator
 from mdsuite.database.mdsuite_properties import mdsuite_properties
 from mdsuite.utils import DatasetKeys
+from mdsuite.utils.calculator_helper_methods import (
+    fft_correlate,
+    lag_counts,
+    split_time_blocks,
+)
 
 
 @dataclass
@@ -132,6 +136,7 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
 
         self.time = self._handle_tau_values()
         self.jacf = np.zeros(self.data_resolution)
+        self.count = np.zeros(self.data_resolution)
 
     def check_input(self):
         """
@@ -171,18 +176,18 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
 
     def _apply_averaging_factor(self):
         """
-        Apply the averaging factor to the msd array.
+        Divide the summed autocorrelation by the number of time origins of each lag.
 
         Returns
         -------
         -------.
 
         """
-        self.jacf /= max(self.jacf)
+        self.jacf /= self.count
 
-    def ensemble_operation(self, ensemble):
+    def ensemble_operation(self, ensemble: tf.Tensor):
         """
-        Calculate and return the vacf.
+        Calculate the flux autocorrelation over all time origins of a batch.
 
         Parameters
         ----------
@@ -190,17 +195,25 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
 
         Returns
         -------
-        updates class vacf with the tensor_values.
+        Updates the class jacf, count and sigma with the tensor_values.
         """
-        jacf = self.args.data_range * tf.reduce_sum(
-            tfp.stats.auto_correlation(ensemble, normalize=False, axis=0, center=False),
-            axis=-1,
+        ensemble = np.array(ensemble)
+        n_particles, n_configurations, _ = ensemble.shape
+        jacf = fft_correlate(ensemble, max_lag=self.args.data_range)
+        self.jacf += self.args.data_range * np.sum(jacf, axis=0)[self.args.tau_values]
+        self.count += (
+            n_particles
+            * lag_counts(n_configurations, self.args.data_range)[self.args.tau_values]
         )
-        self.jacf += jacf[int(self.args.data_range - 1) :]
-        self.sigma.append(
+
+        # non-overlapping windows give independent samples for the uncertainty
+        blocks = split_time_blocks(ensemble, self.args.data_range)
+        block_jacf = self.args.data_range * fft_correlate(blocks, normalize=True)
+        self.sigma.extend(
             np.trapz(
-                jacf[: self.args.integration_range],
+                block_jacf[:, self.args.tau_values][:, : self.args.integration_range],
                 x=self.time[: self.args.integration_range],
+                axis=1,
             )
         )
 
@@ -212,13 +225,23 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
         -------
 
         """
-        result = self.prefactor * np.array(self.sigma)
+        result = self.prefactor * np.trapz(
+            self.jacf[: self.args.integration_range],
+            x=self.time[: self.args.integration_range],
+        )
+        normalized_acf = self.jacf / max(self.jacf)
+        # standard error of the integrals of the non-overlapping time blocks
+        block_results = self.prefactor * np.array(self.sigma)
+        if len(block_results) > 0:
+            uncertainty = np.std(block_results) / np.sqrt(len(block_results))
+        else:
+            uncertainty = np.nan
 
         data = {
-            "viscosity": result[0],
-            "uncertainty": result[1],
+            "viscosity": result,
+            "uncertainty": uncertainty,
             "time": self.time.tolist(),
-            "acf": self.jacf.numpy().tolist(),
+            "acf": normalized_acf.tolist(),
         }
 
         self.queue_data(data=data, subjects=["System"])
@@ -234,8 +257,8 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
             )
             self.run_visualization(
                 x_data=np.array(self.time) * self.experiment.units.time,
-                y_data=self.jacf.numpy(),
-                title=f"{result[0]} +- {result[1]}",
+                y_data=normalized_acf,
+                title=f"{result} +- {uncertainty}",
                 layouts=[span],
             )
 
@@ -263,10 +286,7 @@ class GreenKuboViscosityFlux(TrajectoryCalculator, ABC):
             total=self.n_batches,
             disable=self.memory_manager.minibatch,
         ):
-            ensemble_ds = self.get_ensemble_dataset(batch, DatasetKeys.OBSERVABLES)
-
-            for ensemble in ensemble_ds:
-                self.ensemble_operation(ensemble[dict_ref])
+            self.ensemble_operation(batch[dict_ref])
 
         # Scale, save, and plot the data.
         self._apply_averaging_factor()
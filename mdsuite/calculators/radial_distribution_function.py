@@ -51,6 +51,7 @@ from mdsuite.utils.linalg import (
     get_partial_triu_indices,
 )
 from mdsuite.utils.meta_functions import join_path, split_array
+from mdsuite.utils.neighbour_list import cell_list_applicable, get_cell_list_pairs
 
 log = logging.getLogger(__name__)
 
@@ -129,6 +130,7 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
 
         self.rdf_minibatch = None
         self.use_tf_function = None
+        self.cell_list = None
         self.override_n_batches = None
         self.index_list = None
         self.sample_configurations = None
@@ -188,6 +190,11 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
                     override the automatic batch size calculation
             use_tf_function : bool
                     If true, tf.function is used in the calculation.
+            cell_list : bool
+                    If true, pairs within the cutoff are found with a cell list
+                    instead of computing all atom pairs. By default the cell list
+                    is used whenever the box holds at least three cells of the
+                    cutoff size along every axis.
         """
         # set args that will affect the computation result
         self.args = Args(
@@ -209,6 +216,7 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
 
         # kwargs parsing
         self.use_tf_function = kwargs.pop("use_tf_function", False)
+        self.cell_list = kwargs.pop("cell_list", None)
         self.override_n_batches = kwargs.get("batches")
         self.tqdm_limit = kwargs.pop("tqdm", 10)
 
@@ -241,6 +249,11 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
                 self.args.cutoff / 0.01
             )  # default is 1/100th of an angstrom
 
+        if self.cell_list is None:
+            self.cell_list = cell_list_applicable(
+                self.experiment.box_array, self.args.cutoff
+            )
+
         # Get the correct species out.
         if self.args.species is None:
             if self.args.molecules:
@@ -467,6 +480,46 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
         minibatch_start = stop
         return minibatch_rdf, minibatch_start, stop
 
+    def run_cell_list_loop(self, positions_tensor: tf.Tensor) -> dict:
+        """
+        Compute the histograms of a batch with a cell list neighbour search.
+
+        Only the pairs within the cutoff are generated for each configuration, they
+        are then binned in the same way as the pairs of the minibatch loop.
+
+        Parameters
+        ----------
+        positions_tensor : tf.Tensor
+                Positions of the batch in the shape (n_atoms, n_configurations, 3).
+
+        Returns
+        -------
+        rdf : dict
+                Dict of rdf values for each combination of species.
+        """
+        positions = np.array(positions_tensor)
+        box = np.array(self.experiment.box_array, dtype=positions.dtype)
+
+        indices, d_ij = [], []
+        for configuration in range(positions.shape[1]):
+            start_time = timer()
+            pair_indices, distances = get_cell_list_pairs(
+                positions[:, configuration], box, self.args.cutoff
+            )
+            log.debug(
+                f"Cell list search found {len(distances)} pairs in"
+                f" {timer() - start_time} s"
+            )
+            indices.append(pair_indices)
+            d_ij.append(distances)
+
+        # every pair is an entry with a single configuration in the d_ij matrix
+        return self.compute_species_values(
+            tf.constant(np.concatenate(indices, axis=1), dtype=tf.int32),
+            0,
+            tf.constant(np.concatenate(d_ij)[:, None], dtype=self.dtype),
+        )
+
     def compute_species_values(
         self, indices: tf.Tensor, start_batch, d_ij: tf.Tensor
     ) -> dict:
@@ -850,6 +903,12 @@ class RadialDistributionFunction(TrajectoryCalculator, ABC):
             log.debug("Reformatting data.")
             positions_tensor = self._format_data(batch=batch, keys=dict_keys)
 
+            if self.cell_list:
+                rdf = self.run_cell_list_loop(positions_tensor)
+                for key in self.rdf:
+                    self.rdf[key] += rdf[key]
+                continue
+
             # Create a new dataset to loop over.
             log.debug("Creating dataset.")
             per_atoms_ds = tf.data.Dataset.from_tensor_slices(positions_tensor)
@@ -27,24 +27,30 @@ A parent class for calculators that operate on the trajectory.
 """
 from __future__ import annotations
 
+import logging
 from abc import ABC
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, Iterator, List, Union
 
 import numpy as np
 import tensorflow as tf
+from tqdm import tqdm
 
 import mdsuite.database.simulation_database
 from mdsuite.calculators.transformations_reference import switcher_transformations
 from mdsuite.database.data_manager import DataManager
 from mdsuite.database.simulation_database import Database
-from mdsuite.memory_management import MemoryManager
-from mdsuite.utils.meta_functions import join_path
+from mdsuite.memory_management import MemoryManager, MemoryProbe
+from mdsuite.utils import config
+from mdsuite.utils.meta_functions import gpu_available, join_path
+from mdsuite.utils.multi_tau_correlator import MultiTauCorrelator
 
 from .calculator import Calculator
 
 if TYPE_CHECKING:
     from mdsuite import Experiment
 
+log = logging.getLogger(__name__)
+
 
 class TrajectoryCalculator(Calculator, ABC):
     """
@@ -63,6 +69,9 @@ class TrajectoryCalculator(Calculator, ABC):
             The scaling behaviour of the computer. e.g.
             {"linear": {"scale_factor": 150}}.  See mdsuite.utils.scale_functions.py for
             the list of possible functions.
+    memory_calibration : dict
+            Measured memory scaling of the calculator for the current subject, see
+            load_memory_calibration. If set, it replaces the scale function.
     batch_size : int
             Batch size to use. This is the number of configurations that can be loaded
             given the complexity and data requirements of the operation.
@@ -99,12 +108,15 @@ class TrajectoryCalculator(Calculator, ABC):
         self.loaded_property: mdsuite.database.simulation_database.PropertyInfo = None
         self.dependency: mdsuite.database.simulation_database.PropertyInfo = None
         self.scale_function = None
+        self.memory_calibration: dict = None
         self.batch_size: int = None
         self.n_batches: int = None
         self.remainder: int = None
         self.minibatch: bool = None
+        self.ensemble_block_size: int = None
         self.memory_manager = None
         self.data_manager = None
+        self.correlator: MultiTauCorrelator = None
         self._database = None
 
     @property
@@ -240,7 +252,13 @@ class TrajectoryCalculator(Calculator, ABC):
         """
         return self.remainder - (self.remainder % self.args.data_range)
 
-    def _prepare_managers(self, data_path: list, correct: bool = False):
+    def _prepare_managers(
+        self,
+        data_path: list,
+        correct: bool = False,
+        streaming: bool = False,
+        batch_size: int = None,
+    ):
         """
         Prepare the memory and tensor_values monitors for calculation.
 
@@ -250,25 +268,38 @@ class TrajectoryCalculator(Calculator, ABC):
                 List of tensor_values paths to load from the hdf5
                 database_path.
         correct : bool
+        streaming : bool
+                If true, the batches are consumed frame by frame and do not need to
+                hold a full data range window.
+        batch_size : int
+                If given, this batch size is used instead of the estimate of the
+                memory manager, e.g. to share batches in a CalculatorPipeline.
 
 
         Returns
         -------
         Updates the calculator class
         """
+        if self.memory_manager is not None:
+            self.memory_manager.release()
         self.memory_manager = MemoryManager(
             data_path=data_path,
             database=self.database,
             memory_fraction=0.8,
             scale_function=self.scale_function,
+            calibration=self.memory_calibration,
         )
         (
             self.batch_size,
             self.n_batches,
             self.remainder,
-        ) = self.memory_manager.get_batch_size()
+        ) = self.memory_manager.get_batch_size(batch_size)
+        window = 1 if streaming else self.args.data_range
         self.ensemble_loop, self.minibatch = self.memory_manager.get_ensemble_loop(
-            self.args.data_range, self.args.correlation_time
+            window, self.args.correlation_time
+        )
+        self.ensemble_block_size = self.memory_manager.get_ensemble_block_size(
+            window, self.args.correlation_time
         )
 
         if self.minibatch:
@@ -287,6 +318,7 @@ class TrajectoryCalculator(Calculator, ABC):
             batch_size=self.batch_size,
             n_batches=self.n_batches,
             ensemble_loop=self.ensemble_loop,
+            ensemble_block_size=self.ensemble_block_size,
             correlation_time=self.args.correlation_time,
             remainder=self.remainder,
             atom_selection=self.args.atom_selection,
@@ -311,6 +343,8 @@ class TrajectoryCalculator(Calculator, ABC):
         subject_list: list = None,
         loop_array: np.ndarray = None,
         correct: bool = False,
+        streaming: bool = False,
+        overlap: bool = False,
     ) -> tf.data.Dataset:
         """
         Collect the batch loop dataset.
@@ -334,6 +368,13 @@ class TrajectoryCalculator(Calculator, ABC):
                 In this case, in the fist batch, configurations 1, 4, and 7 will be
                 loaded for the analysis. This is particularly important in the
                 structural properties.
+        streaming : bool
+                If true, the batches are only required to be in time order, e.g. for
+                a multiple-tau correlator, and are never mini-batched over atoms to
+                fit a data range window.
+        overlap : bool
+                If true, the time-origin windows that do not fit into a batch are
+                completed with the next batch, see overlap_batches.
 
         Returns
         -------
@@ -342,7 +383,7 @@ class TrajectoryCalculator(Calculator, ABC):
 
         """
         path_list = [join_path(item, self.loaded_property.name) for item in subject_list]
-        self._prepare_managers(path_list, correct=correct)
+        self._prepare_managers(path_list, correct=correct, streaming=streaming)
         type_spec = {}
         for item in subject_list:
             dict_ref = "/".join([item, self.loaded_property.name])
@@ -352,7 +393,7 @@ class TrajectoryCalculator(Calculator, ABC):
         type_spec[str.encode("data_size")] = tf.TensorSpec(shape=(), dtype=tf.int32)
 
         batch_generator, batch_generator_args = self.data_manager.batch_generator(
-            system=self.system_property, loop_array=loop_array
+            system=self.system_property, loop_array=loop_array, overlap=overlap
         )
         ds = tf.data.Dataset.from_generator(
             generator=batch_generator,
@@ -362,45 +403,306 @@ class TrajectoryCalculator(Calculator, ABC):
 
         return ds.prefetch(tf.data.AUTOTUNE)
 
-    def get_ensemble_dataset(self, batch: dict, subject: Union[str, list]):
+    def update_multi_tau_correlator(self, data: tf.Tensor, mode: str):
+        """
+        Add the next frames of a subject to the multiple-tau correlator.
+
+        The correlator is created on the first call after self.correlator was reset
+        to None.
+
+        Parameters
+        ----------
+        data : tf.Tensor (n_particles, n_configurations, dimension)
+                Batch of the loaded property, following the previous batch in time.
+        mode : str
+                Correlator mode, either 'correlation' or 'msd'.
+        """
+        data = np.array(data)
+        if self.correlator is None:
+            self.correlator = MultiTauCorrelator(
+                n_particles=data.shape[0],
+                dimension=data.shape[2],
+                max_lag=self.args.data_range - 1,
+                mode=mode,
+            )
+        self.correlator.add(data)
+
+    def _get_multi_tau_time(self, lags: np.ndarray) -> np.ndarray:
+        """
+        Set the multiple-tau lags as tau values and return their times.
+
+        Parameters
+        ----------
+        lags : np.ndarray
+                Lags in frames computed by a MultiTauCorrelator.
+
+        Returns
+        -------
+        times : np.ndarray
+                Time of each lag in simulation units.
+        """
+        self.args.tau_values = lags
+        self.data_resolution = len(lags)
+
+        return lags * self.experiment.time_step * self.experiment.sample_rate
+
+    @property
+    def _frame_time(self) -> float:
+        """Time between two frames in SI units."""
+        return (
+            self.experiment.time_step
+            * self.experiment.sample_rate
+            * self.experiment.units.time
+        )
+
+    def _get_range_index(self, range_: int, time: np.ndarray, frame_time: float) -> int:
+        """
+        Get the index in a time series up to which a fit or integration range extends.
+
+        For evenly spaced tau values the range is the index itself. For the lags of
+        a multiple-tau correlator it is the index of the last lag inside the range.
+
+        Parameters
+        ----------
+        range_ : int
+                Fit or integration range in frames.
+        time : np.ndarray
+                Times of the computed series.
+        frame_time : float
+                Time between two frames, in the units of time.
+
+        Returns
+        -------
+        index : int
+                Index in time.
+        """
+        if self.args.algorithm != "multi_tau":
+            return range_
+        lags = np.rint(np.asarray(time) / frame_time)
+
+        return int(np.searchsorted(lags, range_, side="right") - 1)
+
+    @property
+    def streaming(self) -> bool:
+        """If true, batches are consumed in time order by a multiple-tau correlator."""
+        return getattr(self.args, "algorithm", None) == "multi_tau"
+
+    @property
+    def overlap_batches(self) -> bool:
+        """
+        If true, consecutive batches overlap by the windows that do not fit a batch.
+
+        Calculators operating on time-origin windows from get_ensemble_blocks set
+        this, such that every time origin of the trajectory is used exactly once.
         """
-        Collect the ensemble loop dataset.
+        return False
+
+    @property
+    def supports_pipeline(self) -> bool:
+        """If true, the batch operations can be shared in a CalculatorPipeline."""
+        return type(self).batch_operation is not TrajectoryCalculator.batch_operation
+
+    def check_input(self):
+        """Check the user input and build the loaded property if required."""
+        self._run_dependency_check()
+
+    def get_subjects(self) -> List[str]:
+        """
+        Get the subjects whose loaded property is looped over in batches.
+
+        Returns
+        -------
+        subjects : list
+                e.g. the species ['Na', 'Cl'] or [DatasetKeys.OBSERVABLES].
+        """
+        raise NotImplementedError
+
+    def start_subject(self, subject: str):
+        """
+        Reset the accumulated data before the first batch of a subject.
 
         Parameters
         ----------
         subject : str
-                What object to loop over.
-        batch : tf.Tensor
-                A batch of data to be looped over in ensembles.
+                Subject whose batches follow.
+        """
+        raise NotImplementedError
+
+    def batch_operation(self, subject: str, batch: dict):
+        """
+        Operate on a batch of the loaded property of a subject.
+
+        Parameters
+        ----------
+        subject : str
+                Subject the batch belongs to.
+        batch : dict
+                Batch as returned by the batch dataset, e.g.
+                {b'Na/Velocities': tf.Tensor, b'data_size': int}.
+        """
+        raise NotImplementedError
+
+    def finish_subject(self, subject: str):
+        """
+        Post-process and queue the results of a subject after its last batch.
+
+        Parameters
+        ----------
+        subject : str
+                Subject whose batches are complete.
+        """
+        raise NotImplementedError
+
+    def run_subject(self, subject: str):
+        """
+        Loop over the batches of a subject and apply the batch operation.
+
+        Parameters
+        ----------
+        subject : str
+                Subject whose loaded property is processed.
+        """
+        self.memory_calibration = self.load_memory_calibration(subject)
+        batch_ds = self.get_batch_dataset(
+            [subject], streaming=self.streaming, overlap=self.overlap_batches
+        )
+        self.start_subject(subject)
+        for batch in tqdm(
+            batch_ds,
+            ncols=70,
+            desc=subject,
+            total=self.n_batches,
+            disable=self.memory_manager.minibatch,
+        ):
+            self.batch_operation(subject, batch)
+        self.finish_subject(subject)
+        self.memory_manager.release()
+
+    @property
+    def calibration_name(self) -> str:
+        """Name under which the memory calibration of the calculator is stored."""
+        algorithm = getattr(self.args, "algorithm", None)
+        if algorithm is None:
+            return type(self).__name__
+        return f"{type(self).__name__}/{algorithm}"
+
+    def load_memory_calibration(self, subject: str) -> Union[dict, None]:
+        """
+        Get the memory calibration for the system size of a subject.
+
+        If no calibration is stored in the project database and
+        config.memory_calibration is set, the calculator is calibrated and the
+        result is stored.
+
+        Parameters
+        ----------
+        subject : str
+                Subject whose loaded property is processed.
 
         Returns
         -------
-        dataset : tf.data.Dataset
-                A TensorFlow dataset object for the ensemble loop to be iterated over.
+        calibration : dict
+                The calibration or None if the calculator is not calibrated.
+        """
+        path = join_path(subject, self.loaded_property.name)
+        n_particles = self.database.get_data_size(path)[0]
+        calibration = self.get_memory_calibration(self.calibration_name, n_particles)
+        if calibration is None and config.memory_calibration:
+            calibration = self.calibrate_memory(subject)
+            if calibration is not None:
+                self.save_memory_calibration(
+                    self.calibration_name, n_particles, calibration
+                )
+        return calibration
+
+    def calibrate_memory(
+        self, subject: str, n_probes: int = 3, min_batch_size: int = 32
+    ) -> Union[dict, None]:
+        """
+        Measure the memory and time of the batch operation on probe batches.
+
+        The batch operation is run on the first configurations of the subject for
+        a few doubling batch sizes and the peak memory is fitted with
+        MemoryManager.fit_calibration. The accumulated results of the probes are
+        discarded by the next start_subject.
+
+        Parameters
+        ----------
+        subject : str
+                Subject whose loaded property is used for the probes.
+        n_probes : int
+                Number of probe batch sizes.
+        min_batch_size : int
+                Smallest probe batch size, if larger than the data range.
 
+        Returns
+        -------
+        calibration : dict
+                The calibration or None if the trajectory is too short for a probe.
         """
-        (
-            ensemble_generator,
-            ensemble_generators_args,
-        ) = self.data_manager.ensemble_generator(
-            glob_data=batch, system=self.system_property
+        path_list = [join_path(subject, self.loaded_property.name)]
+        _, n_configs, n_bytes = self.database.get_data_size(path_list[0])
+        window = 1 if self.streaming else self.args.data_range
+        smallest = max(window, min_batch_size)
+        if smallest > n_configs:
+            log.info(f"Not enough configurations to calibrate {self.calibration_name}")
+            return None
+        batch_sizes = np.unique(
+            np.clip(smallest * 2 ** np.arange(n_probes), None, n_configs)
         )
 
-        type_spec = {}
-        if isinstance(subject, str):
-            loop_list = [subject]
-        else:
-            loop_list = subject
-        for item in loop_list:
-            dict_ref = "/".join([item, self.loaded_property.name])
-            type_spec[str.encode(dict_ref)] = tf.TensorSpec(
-                shape=(None, None, self.loaded_property.n_dims), dtype=self.dtype
+        peak_memory = []
+        durations = []
+        # the first operation includes the tracing of TensorFlow functions
+        for batch_size in np.concatenate([batch_sizes[:1], batch_sizes]):
+            self._prepare_managers(
+                path_list, streaming=self.streaming, batch_size=int(batch_size)
             )
-
-        ds = tf.data.Dataset.from_generator(
-            generator=ensemble_generator,
-            args=ensemble_generators_args,
-            output_signature=type_spec,
+            generator, generator_args = self.data_manager.batch_generator(
+                system=self.system_property
+            )
+            n_batches, size, database_path, _, dictionary = generator_args
+            self.start_subject(subject)
+            with MemoryProbe(gpu=gpu_available()) as probe:
+                batch = next(
+                    generator(
+                        n_batches,
+                        size,
+                        database_path,
+                        [str.encode(path) for path in path_list],
+                        dictionary,
+                    )
+                )
+                batch = {key: tf.convert_to_tensor(val) for key, val in batch.items()}
+                self.batch_operation(subject, batch)
+            peak_memory.append(probe.peak_memory)
+            durations.append(probe.duration)
+
+        calibration = MemoryManager.fit_calibration(
+            batch_sizes, peak_memory[1:], durations[1:], n_bytes / n_configs
         )
+        log.info(f"Memory calibration of {self.calibration_name}: {calibration}")
 
-        return ds.prefetch(tf.data.AUTOTUNE)
+        return calibration
+
+    def run_batch_loop(self):
+        """Run the batch operation on every subject."""
+        for subject in self.get_subjects():
+            self.run_subject(subject)
+
+    def get_ensemble_blocks(self, batch: dict) -> Iterator[dict]:
+        """
+        Collect the time-origin windows of a batch in blocks.
+
+        Parameters
+        ----------
+        batch : dict
+                A batch of data to be looped over in ensembles.
+
+        Returns
+        -------
+        blocks : Iterator[dict]
+                Blocks of windows of shape (n_particles, n_origins, data_range,
+                dimension) for each item of the batch.
+        """
+        return self.data_manager.ensemble_block_generator(batch)
@@ -26,14 +26,22 @@ Summary
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import pathlib
 from collections import Counter
 from dataclasses import dataclass, field, fields
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Union
 
+import numpy as np
 from sqlalchemy import and_
+from sqlalchemy.orm import selectinload
 
 import mdsuite.database.scheme as db
+from mdsuite.database.result_store import STORE_NAME, split_arrays, write_arrays
+from mdsuite.utils.config import config
+from mdsuite.utils.database import get_or_create
 from mdsuite.utils.meta_functions import is_jsonable
 
 if TYPE_CHECKING:
@@ -67,6 +75,15 @@ def conv_to_db(val):
     return val
 
 
+def _canonical(val):
+    """Convert a value to its canonical JSON serializable form for hashing."""
+    if isinstance(val, (np.ndarray, np.generic)):
+        return val.tolist()
+    if is_jsonable(val):
+        return val
+    return str(val)
+
+
 class CalculatorDatabase:
     """Database Interactions of the calculator class.
 
@@ -100,11 +117,36 @@ class CalculatorDatabase:
         self.db_computation = db.Computation(experiment=experiment)
         self.db_computation.name = self.analysis_name
 
+    def get_fingerprint(self) -> str:
+        """Hash the arguments that identify a computation.
+
+        The hash covers the analysis name, the experiment, the user args, the
+        experiment version and the files the experiment data was read from.
+
+        Returns
+        -------
+        fingerprint : str
+            A hex digest that is equal for computations with equal arguments.
+        """
+        identity = {
+            "name": self.analysis_name,
+            "experiment": self.experiment.name,
+            "args": {
+                args_field.name: _canonical(getattr(self.args, args_field.name))
+                for args_field in fields(self.args)
+            },
+            "version": self.experiment.version,
+            "read_files": self.experiment.read_files,
+        }
+        identity = json.dumps(identity, sort_keys=True, default=str)
+
+        return hashlib.sha256(identity.encode()).hexdigest()
+
     def get_computation_data(self) -> db.Computation:
         """Query the database for computation data.
 
-        This method used the self.args dataclass to look for matching
-        calculator attributes and returns a db.Computation object if
+        This method looks for a computation with the fingerprint of the
+        self.args dataclass and returns a db.Computation object if
         the calculation has already been performed
 
         Return:
@@ -114,53 +156,24 @@ class CalculatorDatabase:
             otherwise returns None
         """
         log.debug(f"Getting data for {self.experiment.name} with args {self.args}")
+        fingerprint = self.get_fingerprint()
         with self.experiment.project.session as ses:
-            experiment = (
-                ses.query(db.Experiment)
-                .filter(db.Experiment.name == self.experiment.name)
-                .first()
-            )
-
-            #  filter the correct experiment
-            computations = ses.query(db.Computation).filter(
-                db.Computation.experiment == experiment,
-                db.Computation.name == self.analysis_name,
-            )
-
-            # filter set args
-            for args_field in fields(self.args):
-                key = args_field.name
-                val = getattr(self.args, key)
-                computations = computations.filter(
-                    db.Computation.computation_attributes.any(
-                        and_(
-                            db.ComputationAttribute.name == key,
-                            db.ComputationAttribute.data == conv_to_db(val),
-                        )
-                    )
-                )
-
-            # filter the version of the experiment, e.g. run new computation
-            # if the experiment version has changed
-            computations = computations.filter(
-                db.Computation.computation_attributes.any(
-                    and_(
-                        db.ComputationAttribute.name == "version",
-                        db.ComputationAttribute.data
-                        == conv_to_db(self.experiment.version),
-                    )
-                )
-            )
+            computations = self._query_fingerprint(ses, fingerprint)
+            if len(computations) == 0:
+                # store the fingerprint of computations from older versions
+                legacy_computations = self._query_computation_attributes(ses)
+                for computation in legacy_computations:
+                    computation.fingerprint = fingerprint
+                if len(legacy_computations) > 0:
+                    ses.commit()
+                    computations = self._query_fingerprint(ses, fingerprint)
 
-            computations = computations.all()
             if len(computations) > 0:
                 log.debug("Calculation already performed! Loading it up")
-            # loading data_dict to avoid DetachedInstance errors
-            # this can take some time, depending on the size of the data
-            # TODO remove and use lazy call
+            # keep the engine such that the results are read lazily after the
+            # session is closed
             for computation in computations:
-                _ = computation.data_dict
-                _ = computation.data_range
+                _ = computation.engine
 
         if len(computations) > 0:
             if len(computations) > 1:
@@ -171,13 +184,97 @@ class CalculatorDatabase:
             return computations[0]  # it should only be one value
         return None
 
+    @staticmethod
+    def _query_fingerprint(ses, fingerprint: str) -> List[db.Computation]:
+        """Query computations by their fingerprint.
+
+        The computation attributes are loaded as well, such that they are available
+        after the session is closed.
+
+        Parameters
+        ----------
+        ses : Session
+            Session of the project database.
+        fingerprint : str
+            Fingerprint as returned by get_fingerprint.
+
+        Returns
+        -------
+        computations : list
+            The computations with this fingerprint.
+        """
+        return (
+            ses.query(db.Computation)
+            .options(selectinload(db.Computation.computation_attributes))
+            .filter(db.Computation.fingerprint == fingerprint)
+            .all()
+        )
+
+    def _query_computation_attributes(self, ses) -> List[db.Computation]:
+        """Query computations without fingerprint by their attributes.
+
+        Computations stored before fingerprints were introduced are compared
+        attribute by attribute.
+
+        Parameters
+        ----------
+        ses : Session
+            Session of the project database.
+
+        Returns
+        -------
+        computations : list
+            The computations with matching attributes.
+        """
+        experiment = (
+            ses.query(db.Experiment)
+            .filter(db.Experiment.name == self.experiment.name)
+            .first()
+        )
+
+        #  filter the correct experiment
+        computations = ses.query(db.Computation).filter(
+            db.Computation.experiment == experiment,
+            db.Computation.name == self.analysis_name,
+            db.Computation.fingerprint.is_(None),
+        )
+
+        # filter set args
+        for args_field in fields(self.args):
+            key = args_field.name
+            val = getattr(self.args, key)
+            computations = computations.filter(
+                db.Computation.computation_attributes.any(
+                    and_(
+                        db.ComputationAttribute.name == key,
+                        db.ComputationAttribute.data == conv_to_db(val),
+                    )
+                )
+            )
+
+        # filter the version of the experiment, e.g. run new computation
+        # if the experiment version has changed
+        computations = computations.filter(
+            db.Computation.computation_attributes.any(
+                and_(
+                    db.ComputationAttribute.name == "version",
+                    db.ComputationAttribute.data == conv_to_db(self.experiment.version),
+                )
+            )
+        )
+
+        return computations.all()
+
     def save_computation_args(self):
         """Store the user args.
 
         This method stored the user args from the self.args dataclass
         into SQLAlchemy objects and adds them to a list which will be
         written to the database after the calculation was successful.
+        The attributes are kept for display and queries, computations are
+        identified by the fingerprint of the args.
         """
+        self.db_computation.fingerprint = self.get_fingerprint()
         for args_field in fields(self.args):
             key = args_field.name
             val = getattr(self.args, key)
@@ -197,9 +294,12 @@ class CalculatorDatabase:
         """Save all the collected computationattributes and computation data to the
         database.
 
-        This will be run after the computation was successful.
+        This will be run after the computation was successful. Large arrays of the
+        computation data are written to the result store of the experiment.
         """
+        store = pathlib.Path(self.experiment.database_path, STORE_NAME).resolve()
         with self.experiment.project.session as ses:
+            root = pathlib.Path(ses.get_bind().url.database).resolve().parent
             ses.add(self.db_computation)
             for val in self.db_computation_attributes:
                 # I need to set the relation inside the session.
@@ -210,9 +310,21 @@ class CalculatorDatabase:
                 # TODO consider renaming species to e.g., subjects, because species here
                 #  can also be molecules
                 data_obj: ComputationResults
+                data, arrays = split_arrays(data_obj.data, config.result_array_min_size)
                 computation_result = db.ComputationResult(
-                    computation=self.db_computation, data=data_obj.data
+                    computation=self.db_computation, data=data
                 )
+                if len(arrays) > 0:
+                    # the id of the result names its group in the store
+                    ses.add(computation_result)
+                    ses.flush()
+                    references = write_arrays(
+                        root, store, str(computation_result.id), arrays
+                    )
+                    computation_result.data = {
+                        key: references[key] if key in references else data[key]
+                        for key in data_obj.data
+                    }
                 species_list = []
                 for species in data_obj.subjects:
                     # this will collect duplicates that can be counted later,
@@ -247,6 +359,55 @@ class CalculatorDatabase:
         """
         self._queued_data.append(ComputationResults(data=data, subjects=subjects))
 
+    def get_memory_calibration(self, name: str, n_particles: int) -> Union[dict, None]:
+        """Query the project database for a memory calibration.
+
+        Parameters
+        ----------
+        name : str
+                Name of the calibrated calculator.
+        n_particles : int
+                Number of particles of the calibrated system.
+
+        Returns
+        -------
+        calibration : dict
+                The calibration as returned by MemoryManager.fit_calibration or None
+                if the calculator was not calibrated for this system size.
+        """
+        with self.experiment.project.session as ses:
+            calibration = (
+                ses.query(db.MemoryCalibration)
+                .filter(
+                    db.MemoryCalibration.name == name,
+                    db.MemoryCalibration.n_particles == n_particles,
+                )
+                .first()
+            )
+        if calibration is None:
+            return None
+        return dict(calibration.data)
+
+    def save_memory_calibration(self, name: str, n_particles: int, data: dict):
+        """Store a memory calibration in the project database.
+
+        Parameters
+        ----------
+        name : str
+                Name of the calibrated calculator.
+        n_particles : int
+                Number of particles of the calibrated system.
+        data : dict
+                The calibration, replacing any previous one of this calculator and
+                system size.
+        """
+        with self.experiment.project.session as ses:
+            calibration = get_or_create(
+                ses, db.MemoryCalibration, name=name, n_particles=n_particles
+            )
+            calibration.data = data
+            ses.commit()
+
     def update_database(self, parameters, delete_duplicate: bool = True):
         """
         Add data to the database.
@@ -28,9 +28,11 @@ generators. These generators allow for the full use of the TF data pipelines but
 required special formatting rules.
 """
 import logging
+import typing
 
 import numpy as np
 import tensorflow as tf
+from numpy.lib.stride_tricks import sliding_window_view
 from tqdm import tqdm
 
 from mdsuite.database.simulation_database import Database
@@ -56,6 +58,7 @@ class DataManager:
         n_batches: int = None,
         batch_size: int = None,
         ensemble_loop: int = None,
+        ensemble_block_size: int = 1,
         correlation_time: int = 1,
         remainder: int = None,
         atom_selection=np.s_[:],
@@ -82,6 +85,8 @@ class DataManager:
                 Size of a batch.
         ensemble_loop : int
                 Number of ensembles to be looped over.
+        ensemble_block_size : int
+                Number of time origins in each block of the ensemble loop.
         correlation_time : int
                 Correlation time used in the calculator.
         remainder : int
@@ -112,6 +117,7 @@ class DataManager:
         self.batch_size = batch_size
         self.remainder = remainder
         self.ensemble_loop = ensemble_loop
+        self.ensemble_block_size = ensemble_block_size
         self.correlation_time = correlation_time
         self.atom_selection = atom_selection
 
@@ -121,6 +127,7 @@ class DataManager:
         system: bool = False,
         remainder: bool = False,
         loop_array: np.ndarray = None,
+        overlap: bool = False,
     ) -> tuple:
         """
         Build a generator object for the batch loop.
@@ -140,6 +147,9 @@ class DataManager:
                 In this case, in the fist batch, configurations 1, 4, and 7 will be
                 loaded for the analysis. This is particularly important in the
                 structural properties.
+        overlap : bool
+                If true, the configurations of time-origin windows that do not fit
+                into a batch are carried over to the next batch, see BatchOverlap.
 
         Returns
         -------
@@ -179,6 +189,7 @@ class DataManager:
             -------
             """
             database = Database(database)
+            batch_overlap = BatchOverlap(self.data_range, self.correlation_time)
 
             loop_over_remainder = self.remainder > 0
 
@@ -202,7 +213,7 @@ class DataManager:
                     else:
                         select_slice = np.s_[self.atom_selection, loop_array[batch]]
                 elif system:
-                    select_slice = np.s_[start:stop]
+                    select_slice = np.s_[:, start:stop]
                 else:
                     if type(self.atom_selection) is dict:
                         select_slice = {}
@@ -213,12 +224,13 @@ class DataManager:
                     else:
                         select_slice = np.s_[self.atom_selection, start:stop]
 
-                yield database.load_data(
+                data = database.load_data(
                     data_path,
                     select_slice=select_slice,
                     dictionary=dictionary,
                     d_size=data_size,
                 )
+                yield batch_overlap(data) if overlap else data
 
         def atom_generator(
             batch_number: int,
@@ -265,6 +277,7 @@ class DataManager:
                 atom_stop = atom_start + self.atom_batch_size
                 if atom_batch == self.n_atom_batches:
                     atom_stop = start + self.atom_remainder
+                batch_overlap = BatchOverlap(self.data_range, self.correlation_time)
                 for batch in range(batch_number + int(remainder)):
                     start = int(batch * batch_size) + self.offset
                     stop = int(start + batch_size)
@@ -273,69 +286,141 @@ class DataManager:
                         stop = int(start + self.remainder)
                         data_size = tf.cast(self.remainder, dtype=tf.int16)
                     select_slice = np.s_[int(atom_start) : int(atom_stop), start:stop]
-                    yield database.load_data(
+                    data = database.load_data(
                         data_path,
                         select_slice=select_slice,
                         dictionary=dictionary,
                         d_size=data_size,
                     )
+                    yield batch_overlap(data) if overlap else data
 
         if self.minibatch:
             return atom_generator, args
         else:
             return generator, args
 
-    def ensemble_generator(self, system: bool = False, glob_data: dict = None) -> tuple:
+    def ensemble_block_generator(self, glob_data: dict) -> typing.Iterator[dict]:
         """
-        Build a generator for the ensemble loop.
+        Build the time-origin windows of a batch in blocks.
+
+        All windows of the batch are strided views on the batch, so no window is
+        copied. The windows are grouped into blocks of ensemble_block_size time
+        origins such that an ensemble operation can act on a whole block at once.
 
         Parameters
         ----------
-        system : bool
-                If true, the system generator is returned.
         glob_data : dict
-                data to be loaded in ensembles from a tensorflow generator.
-                e.g. {b'Na/Positions': tf.Tensor}.
-                Will usually include a b'data_size' key which is checked in the
-                loop and ignored. All keys are in byte arrays. This appears when you
-                pass a dict to the tensorflow generator.
+                Batch of data, e.g. {b'Na/Positions': tf.Tensor}. A b'data_size'
+                key is ignored.
+
+        Yields
+        ------
+        block : dict
+                The windows of a block of time origins for each item of the batch,
+                each of shape (n_particles, n_origins, data_range, dimension).
+        """
+        data = {
+            item: np.asarray(value)
+            for item, value in glob_data.items()
+            if item != b"data_size"
+        }
+        n_configurations = min(value.shape[1] for value in data.values())
+        n_origins = (n_configurations - self.data_range) // self.correlation_time + 1
+
+        for start in range(0, max(n_origins, 0), self.ensemble_block_size):
+            stop = min(start + self.ensemble_block_size, n_origins)
+            # configurations spanned by the windows of this block
+            configurations = np.s_[
+                :,
+                start * self.correlation_time : (stop - 1) * self.correlation_time
+                + self.data_range,
+            ]
+            block = {}
+            for item, value in data.items():
+                windows = sliding_window_view(
+                    value[configurations], self.data_range, axis=1
+                )[:, :: self.correlation_time]
+                # (n_particles, n_origins, dimension, data_range) -> time axis 2
+                block[item] = np.moveaxis(windows, -1, 2)
+
+            yield block
+
+
+class BatchOverlap:
+    """
+    Carry the end of a batch over to the next batch.
+
+    Time-origin windows only fit into a batch if the whole window of data_range
+    configurations is loaded. The configurations from the first origin that did not
+    fit are kept and put in front of the next batch, so every origin of the
+    trajectory is used exactly once without reading configurations twice. Every
+    joined batch starts at a time origin.
+
+    Attributes
+    ----------
+    data_range : int
+            Number of configurations in a window.
+    correlation_time : int
+            Number of configurations between two time origins.
+    tail : dict
+            Configurations kept from the previous batch.
+    skip : int
+            Number of configurations at the start of the next batch that lie before
+            the next time origin.
+    """
 
-        Returns
-        -------
-        Ensemble loop generator
+    def __init__(self, data_range: int, correlation_time: int = 1):
         """
-        args = (self.ensemble_loop, self.correlation_time, self.data_range)
+        Constructor for the batch overlap.
 
-        def dictionary_generator(ensemble_loop, correlation_time, data_range):
-            """
-            Generator for the ensemble loop
-            Parameters
-            ----------
-            ensemble_loop : int
-                    Number of ensembles to loop over
-            correlation_time : int
-                    Distance between ensembles
-            data_range : int
-                    Size of each ensemble
-            Returns
-            -------
-            None.
-            """
-            ensemble_loop = int(
-                np.clip(
-                    (glob_data[b"data_size"] - data_range) / correlation_time, 1, None
-                )
-            )
-            for ensemble in range(ensemble_loop):
-                start = ensemble * correlation_time
-                stop = start + data_range
-                output_dict = {}
-                for item in glob_data:
-                    if item == str.encode("data_size"):
-                        pass
-                    else:
-                        output_dict[item] = glob_data[item][:, start:stop]
+        Parameters
+        ----------
+        data_range : int
+                Number of configurations in a window.
+        correlation_time : int
+                Number of configurations between two time origins.
+        """
+        self.data_range = data_range
+        self.correlation_time = correlation_time
+        self.tail = None
+        self.skip = 0
 
-                yield output_dict
+    def __call__(self, batch: dict) -> dict:
+        """
+        Join a batch with the configurations kept from the previous one.
 
-        return dictionary_generator, args
+        Parameters
+        ----------
+        batch : dict
+                The next batch, e.g. {b'Na/Positions': tf.Tensor, b'data_size': 10}.
+
+        Returns
+        -------
+        batch : dict
+                The joined batch with the updated b'data_size'.
+        """
+        joined = {}
+        for item, value in batch.items():
+            if item == b"data_size":
+                continue
+            value = np.asarray(value)[:, self.skip :]
+            if self.tail is not None:
+                value = np.concatenate([self.tail[item], value], axis=1)
+            joined[item] = value
+        n_configurations = min(value.shape[1] for value in joined.values())
+        joined[b"data_size"] = np.int32(n_configurations)
+
+        if n_configurations < self.data_range:
+            next_origin = 0
+        else:
+            n_origins = (n_configurations - self.data_range) // self.correlation_time
+            next_origin = (n_origins + 1) * self.correlation_time
+        # copy, so the joined batch is not kept alive by a view
+        self.tail = {
+            item: value[:, next_origin:].copy()
+            for item, value in joined.items()
+            if item != b"data_size"
+        }
+        self.skip = max(next_origin - n_configurations, 0)
+
+        return joined
@@ -32,11 +32,31 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.orm.session import Session
 
+from mdsuite.utils.config import config
+
 from .scheme import Base
 
 log = logging.getLogger(__name__)
 
 
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Set the journal mode and locking behaviour of a new SQLite connection.
+
+    In WAL mode readers do not block the writer and vice versa, so several processes
+    can work on one project. With synchronous=NORMAL a commit does not wait for the
+    disk unless the WAL is checkpointed, which is safe in WAL mode. Instead of failing
+    immediately on a locked database, a connection waits for up to
+    config.sqlite_busy_timeout seconds.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(config.sqlite_busy_timeout * 1000)}")
+    if config.sqlite_journal_mode is not None:
+        cursor.execute(f"PRAGMA journal_mode = {config.sqlite_journal_mode}")
+        if config.sqlite_journal_mode.upper() == "WAL":
+            cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.close()
+
+
 class DatabaseBase:
     """Docstring."""
 
@@ -69,6 +89,7 @@ class DatabaseBase:
             self._engine = sa.create_engine(
                 f"sqlite+pysqlite:///{engine_path}", echo=False, future=True
             )
+            sa.event.listen(self._engine, "connect", _configure_sqlite)
         return self._engine
 
     @property
@@ -103,3 +124,29 @@ class DatabaseBase:
         """Build the database and get create the tables."""
         log.debug("Creating the database if it does not exist.")
         self.base.metadata.create_all(self.engine)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """Add the columns and indices of the scheme missing in an existing database.
+
+        create_all only creates missing tables. Columns that were added to the scheme
+        later are added here, such that databases of older versions can be used.
+        """
+        inspector = sa.inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in self.base.metadata.sorted_tables:
+                columns = inspector.get_columns(table.name)
+                existing = {column["name"] for column in columns}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    log.debug(f"Adding column {column.name} to {table.name}.")
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(
+                        sa.text(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name}"
+                            f" {column_type}"
+                        )
+                    )
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
@@ -26,14 +26,21 @@ Summary
 """
 from __future__ import annotations
 
+import contextlib
 import dataclasses
+import functools
+import json
 import logging
 from typing import TYPE_CHECKING, Dict, List, Union
 
 import numpy as np
 
 import mdsuite.database.scheme as db
-from mdsuite.database.simulation_database import MoleculeInfo, SpeciesInfo
+from mdsuite.database.simulation_database import (
+    MoleculeGroups,
+    MoleculeInfo,
+    SpeciesInfo,
+)
 from mdsuite.utils.database import get_or_create
 from mdsuite.utils.units import Units
 
@@ -94,6 +101,8 @@ class ExperimentDatabase:
         # Property cache
         self._species = None
         self._molecules = None
+        # Attributes written inside of batch_writes, stored on exit
+        self._pending_writes = None
 
     def export_property_data(self, parameters: dict) -> List[db.Computation]:
         """
@@ -115,6 +124,58 @@ class ExperimentDatabase:
             "This function has been removed and replaced by queue_database"
         )
 
+    @contextlib.contextmanager
+    def batch_writes(self):
+        """Collect the attribute writes of an operation and store them at once.
+
+        Inside of the context, set_db keeps the values in memory and get_db returns
+        them, so e.g. incrementing number_of_configurations for every chunk of a file
+        does not access the database. All collected values are written in a single
+        transaction when the outermost context exits, also if an error is raised.
+
+        Examples
+        --------
+        with experiment.batch_writes():
+            experiment.number_of_configurations += 100
+            experiment.version += 1
+        """
+        if self._pending_writes is not None:
+            yield
+            return
+        self._pending_writes = {}
+        try:
+            yield
+        finally:
+            pending, self._pending_writes = self._pending_writes, None
+            self._write_attributes(pending)
+
+    def _write_attributes(self, attributes: dict):
+        """Write experiment attributes in a single transaction.
+
+        Parameters
+        ----------
+        attributes: dict
+            Name and serialized value of every attribute.
+        """
+        if len(attributes) == 0:
+            return
+        with self.project.session as ses:
+            experiment = get_or_create(ses, db.Experiment, name=self.name)
+            existing = {
+                attribute.name: attribute
+                for attribute in ses.query(db.ExperimentAttribute)
+                .filter(db.ExperimentAttribute.experiment == experiment)
+                .filter(db.ExperimentAttribute.name.in_(list(attributes)))
+            }
+            for name, value in attributes.items():
+                try:
+                    attribute = existing[name]
+                except KeyError:
+                    attribute = db.ExperimentAttribute(experiment=experiment, name=name)
+                    ses.add(attribute)
+                attribute.data = value
+            ses.commit()
+
     def set_db(self, name: str, value):
         """Store values in the database.
 
@@ -125,15 +186,13 @@ class ExperimentDatabase:
         value:
             Any serializeable data type that can be written to the database
         """
-        with self.project.session as ses:
-            experiment = get_or_create(ses, db.Experiment, name=self.name)
-            if not isinstance(value, dict):
-                value = {"serialized_value": value}
-            attribute: db.ExperimentAttribute = get_or_create(
-                ses, db.ExperimentAttribute, experiment=experiment, name=name
-            )
-            attribute.data = value
-            ses.commit()
+        if not isinstance(value, dict):
+            value = {"serialized_value": value}
+        if self._pending_writes is not None:
+            # store what the database would return, e.g. lists instead of tuples
+            self._pending_writes[name] = json.loads(json.dumps(value))
+            return
+        self._write_attributes({name: value})
 
     def get_db(self, name: str, default=None):
         """Load values from the database.
@@ -156,6 +215,8 @@ class ExperimentDatabase:
         Internally the values will be converted to dict, so e.g. tuples or sets
          might be converted to lists
         """
+        if self._pending_writes is not None and name in self._pending_writes:
+            return self._unpack(self._pending_writes[name])
         with self.project.session as ses:
             experiment = get_or_create(ses, db.Experiment, name=self.name)
             attribute: db.ExperimentAttribute = (
@@ -169,11 +230,15 @@ class ExperimentDatabase:
             except AttributeError:
                 log.debug(f"Got no database entries for {name}")
                 return default
-            try:
-                return data["serialized_value"]
-            except KeyError:
-                log.debug(f"Returning a dictionary for {name}")
-                return data
+        return self._unpack(data)
+
+    @staticmethod
+    def _unpack(data: dict):
+        """Get the value of an attribute from its stored dictionary."""
+        try:
+            return data["serialized_value"]
+        except KeyError:
+            return data
 
     @property
     def active(self):
@@ -270,10 +335,29 @@ class ExperimentDatabase:
                     .first()
                 )
                 self._molecules = experiment.get_molecules()
+                stored_groups = dict(
+                    ses.query(
+                        db.ExperimentSpecies.name,
+                        db.ExperimentSpecies.groups.isnot(None),
+                    )
+                    .filter(db.ExperimentSpecies.experiment == experiment)
+                    .filter(db.ExperimentSpecies.molecule.is_(True))
+                )
                 # hotfix to convert to SpeciesInfo
                 for molecule_name, molecule_obj in self._molecules.items():
                     # set properties = None if it does not exist
                     molecule_obj["properties"] = molecule_obj.get("properties", [])
+                    if molecule_obj.get("groups") is not None:
+                        # groups stored as JSON by older versions
+                        molecule_obj["groups"] = MoleculeGroups.from_dict(
+                            molecule_obj["groups"]
+                        )
+                    elif stored_groups.get(molecule_name):
+                        molecule_obj["groups"] = MoleculeGroups(
+                            loader=functools.partial(
+                                self._load_molecule_groups, molecule_name
+                            )
+                        )
                     molecule_info = MoleculeInfo(name=molecule_name, **molecule_obj)
                     self._molecules[molecule_name] = molecule_info
 
@@ -281,20 +365,26 @@ class ExperimentDatabase:
 
     @molecules.setter
     def molecules(self, value):
-        """Save the molecules dict to the database."""
+        """Save the molecules dict to the database.
+
+        The groups of the molecules are stored as encoded MoleculeGroups instead of
+        JSON.
+        """
         if value is None:
             return
 
         processed_value = {}
+        groups = {}
         for molecule_name, molecule_obj in value.items():
             if isinstance(molecule_obj, MoleculeInfo):
                 processed_value[molecule_name] = dataclasses.asdict(molecule_obj)
                 # we do not use the name here, because it is already used as the key
             else:
-                processed_value[molecule_name] = molecule_obj
+                processed_value[molecule_name] = dict(molecule_obj)
             # can't have name or indices in the dict
             processed_value[molecule_name].pop("name", None)
             processed_value[molecule_name].pop("indices", None)
+            groups[molecule_name] = processed_value[molecule_name].pop("groups", None)
 
         value = processed_value
 
@@ -312,8 +402,37 @@ class ExperimentDatabase:
                     molecule=True,
                 )
                 molecule.data = molecule_data
+                molecule_groups = groups[molecule_name]
+                if molecule_groups is not None:
+                    if not isinstance(molecule_groups, MoleculeGroups):
+                        molecule_groups = MoleculeGroups.from_dict(molecule_groups)
+                    molecule_groups = molecule_groups.to_bytes()
+                molecule.groups = molecule_groups
             ses.commit()
 
+    def _load_molecule_groups(self, name: str) -> bytes:
+        """Load the encoded groups of a molecule.
+
+        Parameters
+        ----------
+        name: str
+            Name of the molecule.
+
+        Returns
+        -------
+        bytes:
+            The groups encoded by MoleculeGroups.to_bytes
+        """
+        with self.project.session as ses:
+            return (
+                ses.query(db.ExperimentSpecies.groups)
+                .join(db.ExperimentSpecies.experiment)
+                .filter(db.Experiment.name == self.name)
+                .filter(db.ExperimentSpecies.name == name)
+                .filter(db.ExperimentSpecies.molecule.is_(True))
+                .scalar()
+            )
+
     # Almost Lazy Properties
     @property
     def box_array(self):
@@ -0,0 +1,184 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+
+Summary
+-------
+Binary storage of the array-valued results of computations.
+
+Large arrays, e.g. the time series of a correlation function, are written to an
+HDF5 file next to the simulation database of the experiment. The SQL database only
+holds a reference to the dataset, which is read when the result is accessed.
+"""
+import collections.abc
+import os
+import pathlib
+import typing
+
+import h5py as hf
+import numpy as np
+
+STORE_NAME = "computation_results.hdf5"
+REFERENCE_KEY = "result_store"
+
+
+def split_arrays(data: dict, min_size: int) -> typing.Tuple[dict, dict]:
+    """
+    Separate the large numeric arrays of computation data.
+
+    Parameters
+    ----------
+    data : dict
+            Data of a computation result, e.g. {"time": [...], "msd": [...],
+            "diffusion_coefficient": 1.2}.
+    min_size : int
+            Smallest number of elements of an array that is separated.
+
+    Returns
+    -------
+    other : dict
+            The values that are stored in the SQL database.
+    arrays : dict
+            The numeric arrays with at least min_size elements.
+    """
+    other = {}
+    arrays = {}
+    for key, value in data.items():
+        if isinstance(value, (list, tuple, np.ndarray)):
+            try:
+                array = np.asarray(value)
+            except ValueError:  # ragged lists
+                array = np.empty(0)
+            if array.size >= min_size and array.dtype.kind in "biuf":
+                arrays[key] = array
+                continue
+        other[key] = value
+
+    return other, arrays
+
+
+def write_arrays(
+    root: pathlib.Path, store: pathlib.Path, group: str, arrays: dict
+) -> dict:
+    """
+    Write arrays to a result store.
+
+    Parameters
+    ----------
+    root : pathlib.Path
+            Directory to which the references are relative, i.e. the project
+            directory.
+    store : pathlib.Path
+            HDF5 file to write to, it is created if it does not exist.
+    group : str
+            Group of the arrays in the file, e.g. the id of the computation result.
+    arrays : dict
+            Arrays to be written.
+
+    Returns
+    -------
+    references : dict
+            A JSON serializable reference for each array.
+    """
+    references = {}
+    with hf.File(store, "a") as database:
+        for key, value in arrays.items():
+            name = f"{group}/{key}"
+            if name in database:
+                del database[name]
+            database.create_dataset(name, data=value)
+            references[key] = {
+                REFERENCE_KEY: pathlib.Path(os.path.relpath(store, root)).as_posix(),
+                "dataset": name,
+            }
+
+    return references
+
+
+def is_reference(value) -> bool:
+    """Check if a value of computation data references the result store."""
+    return isinstance(value, dict) and REFERENCE_KEY in value
+
+
+def read_array(root: pathlib.Path, reference: dict) -> np.ndarray:
+    """
+    Read an array of a result store.
+
+    Parameters
+    ----------
+    root : pathlib.Path
+            Directory to which the reference is relative.
+    reference : dict
+            Reference as returned by write_arrays.
+
+    Returns
+    -------
+    array : np.ndarray
+    """
+    with hf.File(pathlib.Path(root, reference[REFERENCE_KEY]), "r") as database:
+        return database[reference["dataset"]][()]
+
+
+class ResultData(dict):
+    """
+    Data of a computation result that reads referenced arrays on first access.
+
+    Values stored in the SQL database are returned as they are, references to the
+    result store are replaced by the arrays they point to.
+    """
+
+    def __init__(self, data: dict, root: pathlib.Path):
+        """
+        Constructor for the result data.
+
+        Parameters
+        ----------
+        data : dict
+                Data of the computation result as stored in the SQL database.
+        root : pathlib.Path
+                Directory to which the references are relative.
+        """
+        super().__init__(data)
+        self.root = root
+
+    def __getitem__(self, key):
+        """Get a value and read it from the result store if required."""
+        value = super().__getitem__(key)
+        if is_reference(value):
+            value = read_array(self.root, value)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        """Get a value or the default if the key does not exist."""
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        """Items with the arrays read from the result store."""
+        return collections.abc.ItemsView(self)
+
+    def values(self):
+        """Values with the arrays read from the result store."""
+        return collections.abc.ValuesView(self)
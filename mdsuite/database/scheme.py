@@ -24,11 +24,24 @@ If you use this module please cite us with:
 Summary
 -------
 """
+import collections.abc
 import logging
-
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
-from sqlalchemy.orm import declarative_base, relationship
-
+import pathlib
+from typing import List
+
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import (
+    Session,
+    declarative_base,
+    deferred,
+    object_session,
+    relationship,
+    selectinload,
+    undefer,
+)
+
+from .result_store import ResultData
 from .types import JSONEncodedDict, MutableDict
 
 log = logging.getLogger(__name__)
@@ -180,6 +193,8 @@ class ExperimentSpecies(Base):
     name = Column(String)
     data = Column(MutableDict.as_mutable(JSONEncodedDict))
     molecule = Column(Boolean, default=False)
+    # encoded MoleculeGroups of a molecule, only loaded when they are accessed
+    groups = deferred(Column(LargeBinary))
 
     experiment_id = Column(Integer, ForeignKey("experiments.id", ondelete="CASCADE"))
     experiment = relationship("Experiment", back_populates="species")
@@ -197,6 +212,8 @@ class Computation(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String, default="Computation")
+    # hash of the arguments identifying the computation, see CalculatorDatabase
+    fingerprint = Column(String, index=True)
 
     experiment_id = Column(Integer, ForeignKey("experiments.id", ondelete="CASCADE"))
     experiment = relationship("Experiment")
@@ -223,13 +240,13 @@ class Computation(Base):
         return f"Exp{self.experiment_id}_{self.name}_{self.id}"
 
     @property
-    def data_dict(self) -> dict:
+    def data_dict(self) -> "ComputationData":
         """
 
         Returns
         -------
-        species_dict: dict
-            A dictionary of the type
+        species_dict: ComputationData
+            A mapping of the type
             {
                 Li:
                     {
@@ -247,25 +264,76 @@ class Computation(Base):
                     },
             }
             where the keys are defined by species (multiple species are joined by "_")
-            and the dimension argument of the computation_data
+            and the dimension argument of the computation_data.
+            The results of a species are read from the database when they are
+            accessed, large arrays are read from the result store of the experiment
+            and returned as numpy arrays.
 
         """
-        species_dict = {}
-        for result in self.computation_results:
-            result: ComputationResult
-            species_keys_list = []
-            for species_associate in result.species:
-                species_associate: SpeciesAssociation
-                species_keys_list += species_associate.count * [
-                    species_associate.species.name
-                ]
-            species_keys = "_".join(species_keys_list)
-            if species_keys == "":
-                species_keys = "System"
-            # iterating over associates
-            species_dict[species_keys] = result.data
+        if getattr(self, "_data_dict", None) is None:
+            self._data_dict = ComputationData(self.id, self.engine)
+        return self._data_dict
 
-        return species_dict
+    @property
+    def engine(self) -> Engine:
+        """Engine of the project database the computation was loaded from.
+
+        The engine is taken from the session of the computation and kept, such
+        that results can be read after the computation was detached.
+        """
+        if getattr(self, "_engine", None) is None:
+            session = object_session(self)
+            if session is not None:
+                self._engine = session.get_bind()
+        return getattr(self, "_engine", None)
+
+    @staticmethod
+    def load_scalars(computations: List["Computation"], keys: List[str] = None) -> list:
+        """Read the scalar results of many computations at once.
+
+        The results of all computations are read in a single query. Only scalar
+        values are kept and no series are read from the result stores.
+
+        Parameters
+        ----------
+        computations: list
+            Computations of the same project.
+        keys: list
+            Keys to keep, e.g. ["diffusion_coefficient", "uncertainty"]. If None,
+            all scalar values are kept.
+
+        Returns
+        -------
+        scalars: list
+            For each computation a dict of the type
+            {Li: {diffusion_coefficient: 1.2, uncertainty: 0.1}}
+
+        Examples
+        --------
+        >>> Computation.load_scalars(computations, keys=["diffusion_coefficient"])
+        """
+        if len(computations) == 0:
+            return []
+        ids = [computation.id for computation in computations]
+        scalars = {computation_id: {} for computation_id in ids}
+        with Session(computations[0].engine) as ses:
+            results = (
+                ses.query(ComputationResult)
+                .options(
+                    undefer(ComputationResult.data), *ComputationResult.load_species()
+                )
+                .filter(ComputationResult.computation_id.in_(ids))
+                .all()
+            )
+            for result in results:
+                scalars[result.computation_id][result.species_key] = {
+                    key: value
+                    for key, value in result.data.items()
+                    if (keys is None or key in keys)
+                    and isinstance(value, (bool, int, float, str, type(None)))
+                }
+
+        return [scalars[computation_id] for computation_id in ids]
 
     def __getitem__(self, item):
         """Allow for subscription.
@@ -367,7 +435,8 @@ class ComputationResult(Base):
 
     id = Column(Integer, primary_key=True)
 
-    data = Column(MutableDict.as_mutable(JSONEncodedDict))
+    # only read when accessed, e.g. by ComputationData
+    data = deferred(Column(MutableDict.as_mutable(JSONEncodedDict)))
 
     # Relation data
     computation_id = Column(Integer, ForeignKey("computations.id", ondelete="CASCADE"))
@@ -375,3 +444,103 @@ class ComputationResult(Base):
 
     # Many <-> Many
     species = relationship("SpeciesAssociation", back_populates="computation_result")
+
+    @classmethod
+    def load_species(cls) -> tuple:
+        """Get the loader options to read the species of many results at once."""
+        return (selectinload(cls.species).joinedload(SpeciesAssociation.species),)
+
+    @property
+    def species_key(self) -> str:
+        """Species of the result joined by "_", e.g. Na_Cl, or System."""
+        species_keys_list = []
+        for species_associate in self.species:
+            species_associate: SpeciesAssociation
+            species_keys_list += species_associate.count * [
+                species_associate.species.name
+            ]
+        species_keys = "_".join(species_keys_list)
+        if species_keys == "":
+            species_keys = "System"
+        return species_keys
+
+
+class ComputationData(collections.abc.Mapping):
+    """Results of a computation that are read from the database when accessed.
+
+    The species keys are read on first use without the data of the results. The
+    data of a species is read with its first access. Sessions are opened on
+    demand, such that the mapping can be used after the computation was detached.
+    """
+
+    def __init__(self, computation_id: int, engine: Engine):
+        """Constructor for the computation data.
+
+        Parameters
+        ----------
+        computation_id: int
+            Id of the computation whose results are read.
+        engine: Engine
+            Engine of the project database.
+        """
+        self.computation_id = computation_id
+        self.engine = engine
+        self.root = pathlib.Path(engine.url.database).resolve().parent
+        self._result_ids = None
+        self._data = {}
+
+    @property
+    def result_ids(self) -> dict:
+        """Id of the result of each species key."""
+        if self._result_ids is None:
+            with Session(self.engine) as ses:
+                results = (
+                    ses.query(ComputationResult)
+                    .options(*ComputationResult.load_species())
+                    .filter(ComputationResult.computation_id == self.computation_id)
+                    .all()
+                )
+                self._result_ids = {result.species_key: result.id for result in results}
+        return self._result_ids
+
+    def __getitem__(self, key) -> ResultData:
+        """Read the results of a species."""
+        if key not in self._data:
+            result_id = self.result_ids[key]
+            with Session(self.engine) as ses:
+                data = (
+                    ses.query(ComputationResult.data)
+                    .filter(ComputationResult.id == result_id)
+                    .scalar()
+                )
+            self._data[key] = ResultData(data, self.root)
+        return self._data[key]
+
+    def __iter__(self):
+        """Iterate over the species keys."""
+        return iter(self.result_ids)
+
+    def __len__(self) -> int:
+        """Number of results."""
+        return len(self.result_ids)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+
+class MemoryCalibration(Base):
+    """Measured memory scaling of a calculator for a given system size.
+
+    The calibration does not depend on the experiment, calculators operating on
+    systems of the same size share it within a project.
+    """
+
+    __tablename__ = "memory_calibrations"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)  # calculator name, e.g. EinsteinDiffusionCoefficients/fft
+    n_particles = Column(Integer)
+    data = Column(MutableDict.as_mutable(JSONEncodedDict))
+
+    def __repr__(self):
+        return f"{self.name}_{self.n_particles}"
@@ -24,9 +24,16 @@ If you use this module please cite us with:
 Summary
 -------
 """
+import collections
+import collections.abc
+import contextlib
 import dataclasses
+import io
+import json
 import logging
+import os
 import pathlib
+import threading
 import time
 import typing
 from typing import List
@@ -35,8 +42,14 @@ import h5py as hf
 import numpy as np
 import tensorflow as tf
 
+from mdsuite.utils import config
 from mdsuite.utils.meta_functions import join_path
 
+try:
+    import hdf5plugin  # registers the blosc and zstd filters with HDF5
+except ImportError:
+    hdf5plugin = None
+
 log = logging.getLogger(__name__)
 
 
@@ -116,6 +129,7 @@ class MoleculeInfo(SpeciesInfo):
             water = {"groups": {"0": {"H": [0, 1], "O": [0]}}
         This tells us that the 0th water molecule consists of the 0th and 1st hydrogen
         atoms in the database as well as the 0th oxygen atom.
+        Molecules loaded from the database have MoleculeGroups instead of a dict.
     """
 
     groups: dict = None
@@ -127,6 +141,181 @@ class MoleculeInfo(SpeciesInfo):
         return super(MoleculeInfo, self).__eq__(other)
 
 
+class MoleculeGroups(collections.abc.Mapping):
+    """
+    Particles of every molecule stored as index arrays.
+
+    The groups are accessed like the groups dict of a MoleculeInfo, e.g.
+    groups["0"] == {"H": [0, 1], "O": [0]}. Instead of a list for every molecule and
+    species, the particles of a species are kept in one array ordered by molecule,
+    together with the offset of the first particle of each molecule. Encoded, these
+    arrays are a small fraction of the size of the groups as JSON.
+
+    Groups loaded from the database are decoded when they are accessed the first
+    time, so reading the other molecule information does not load them.
+    """
+
+    def __init__(self, keys: list = None, particles: dict = None, loader=None):
+        """
+        Constructor for the molecule groups.
+
+        Parameters
+        ----------
+        keys : list
+                Name of each molecule, e.g. ["0", "1"].
+        particles : dict
+                Offsets of the molecules and the particle indices for each species,
+                e.g. {"H": (np.array([0, 2, 4]), np.array([0, 1, 2, 3]))}.
+        loader : Callable
+                Function returning the encoded groups, see to_bytes. If given, it is
+                called on the first access instead of using keys and particles.
+        """
+        self._keys = keys or []
+        self._particles = particles or {}
+        self._loader = loader
+        self._positions = None
+
+    @classmethod
+    def from_dict(cls, groups: dict) -> "MoleculeGroups":
+        """
+        Build the index arrays from a groups dict.
+
+        Parameters
+        ----------
+        groups : dict
+                Groups of the form {"0": {"H": [0, 1], "O": [0]}}.
+
+        Returns
+        -------
+        groups : MoleculeGroups
+        """
+        species = dict.fromkeys(item for group in groups.values() for item in group)
+        particles = {}
+        for item in species:
+            members = [np.asarray(group.get(item, [])) for group in groups.values()]
+            offsets = np.cumsum([0] + [len(member) for member in members])
+            particles[item] = (offsets, np.concatenate(members).astype(np.int64))
+
+        return cls([str(key) for key in groups], particles)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MoleculeGroups":
+        """
+        Decode groups written by to_bytes.
+
+        Parameters
+        ----------
+        data : bytes
+                Encoded groups.
+
+        Returns
+        -------
+        groups : MoleculeGroups
+        """
+        with np.load(io.BytesIO(data)) as arrays:
+            particles = {
+                item: (arrays[f"offsets_{i}"], arrays[f"particles_{i}"])
+                for i, item in enumerate(arrays["species"].tolist())
+            }
+            return cls(arrays["keys"].tolist(), particles)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the index arrays.
+
+        Returns
+        -------
+        data : bytes
+                Compressed NumPy archive of the arrays.
+        """
+        self._load()
+        arrays = {
+            "keys": np.array(self._keys, dtype=str),
+            "species": np.array(list(self._particles), dtype=str),
+        }
+        for i, (offsets, particles) in enumerate(self._particles.values()):
+            arrays[f"offsets_{i}"] = offsets
+            arrays[f"particles_{i}"] = particles
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+
+        return buffer.getvalue()
+
+    @property
+    def species(self) -> list:
+        """Species of the particles in the molecules."""
+        self._load()
+        return list(self._particles)
+
+    def particles(self, species: str) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Get all particles of a species in the molecules.
+
+        Parameters
+        ----------
+        species : str
+                Name of the species, e.g. 'H'.
+
+        Returns
+        -------
+        indices : np.ndarray
+                Index of each particle of the species, ordered by molecule.
+        molecules : np.ndarray
+                Position of the molecule of each particle in the groups.
+        """
+        self._load()
+        try:
+            offsets, indices = self._particles[species]
+        except KeyError:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        molecules = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+        return indices, molecules
+
+    def _load(self):
+        """Decode the groups if they were not loaded yet."""
+        if self._loader is not None:
+            groups = self.from_bytes(self._loader())
+            self._keys, self._particles = groups._keys, groups._particles
+            self._loader = None
+        if self._positions is None:
+            self._positions = {key: i for i, key in enumerate(self._keys)}
+
+    def __getitem__(self, key) -> dict:
+        """Get the particle indices of each species in a molecule."""
+        self._load()
+        position = self._positions[str(key)]
+        return {
+            item: indices[offsets[position] : offsets[position + 1]].tolist()
+            for item, (offsets, indices) in self._particles.items()
+        }
+
+    def __iter__(self):
+        """Iterate over the names of the molecules."""
+        self._load()
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        """Number of molecules."""
+        self._load()
+        return len(self._keys)
+
+    def __deepcopy__(self, memo) -> "MoleculeGroups":
+        """Copy the arrays, but not the loader which references the database."""
+        self._load()
+        particles = {
+            item: (offsets.copy(), indices.copy())
+            for item, (offsets, indices) in self._particles.items()
+        }
+        return type(self)(list(self._keys), particles)
+
+    def __repr__(self) -> str:
+        """Representation of the groups."""
+        if self._loader is not None:
+            return f"{type(self).__name__}(not loaded)"
+        return f"{type(self).__name__}({len(self._keys)} molecules)"
+
+
 @dataclasses.dataclass
 class TrajectoryMetadata:
     """Trajectory Metadata container.
@@ -227,6 +416,389 @@ class TrajectoryChunkData:
         return self._data
 
 
+@dataclasses.dataclass(frozen=True)
+class StorageLayout:
+    """
+    HDF5 storage layout of the datasets in a simulation database.
+
+    Trajectory datasets are stored as (n_particles, n_configurations, n_dims) and
+    are read in windows along the configuration axis. The chunks are therefore
+    shaped as (particles, chunk_configurations, n_dims) such that a batch which
+    starts and stops on a multiple of chunk_configurations only decompresses the
+    chunks it returns.
+
+    Attributes
+    ----------
+    chunk_configurations : int
+            Number of configurations per chunk.
+    chunk_particles : int, optional
+            Number of particles per chunk. If None, as many particles as fit into
+            max_chunk_bytes are put into a chunk.
+    max_chunk_bytes : int
+            Upper bound on the size of a chunk when chunk_particles is None.
+    compression : str, optional
+            Compression codec, one of None, "lzf", "gzip", "blosc" or "zstd".
+            blosc and zstd require the optional hdf5plugin package.
+    compression_opts : int, optional
+            Compression level passed on to the codec.
+    shuffle : bool
+            If true, the byte shuffle filter is applied before compression.
+    contiguous : bool
+            If true, datasets are stored contiguously instead of in chunks. This
+            requires compression=None and allows Database.load_data to memory-map
+            the datasets. Contiguous datasets are stored as float64 instead of
+            float32, so slices of them are loaded as views of the file. They are
+            copied block-wise when they are resized.
+    """
+
+    chunk_configurations: int = 128
+    chunk_particles: int = None
+    max_chunk_bytes: int = 2**20
+    compression: str = "lzf"
+    compression_opts: int = None
+    shuffle: bool = True
+    contiguous: bool = False
+
+    codecs = (None, "lzf", "gzip", "blosc", "zstd")
+
+    def __post_init__(self):
+        """Check that the codec is known and available."""
+        if self.compression not in self.codecs:
+            raise ValueError(
+                f"Unknown compression {self.compression}, use one of {self.codecs}"
+            )
+        if self.compression in ("blosc", "zstd") and hdf5plugin is None:
+            raise ImportError(
+                f"The {self.compression} codec requires hdf5plugin, install it with"
+                " pip install hdf5plugin."
+            )
+        if self.chunk_configurations < 1:
+            raise ValueError("chunk_configurations must be a positive integer")
+        if self.contiguous and self.compression is not None:
+            raise ValueError("Contiguous datasets can not be compressed")
+
+    def get_chunk_shape(self, shape: tuple, itemsize: int = 4) -> tuple:
+        """
+        Compute the chunk shape of a dataset.
+
+        Parameters
+        ----------
+        shape : tuple
+                Shape of the dataset, either (n_particles, n_configurations, n_dims)
+                or (n_configurations, n_dims).
+        itemsize : int
+                Number of bytes per element, h5py stores float32 by default.
+
+        Returns
+        -------
+        chunks : tuple
+                Chunk shape of the dataset.
+        """
+        n_dims = max(1, shape[-1])
+        if len(shape) == 2:
+            return self.chunk_configurations, n_dims
+
+        n_particles = max(1, shape[0])
+        if self.chunk_particles is None:
+            chunk_bytes = self.chunk_configurations * n_dims * itemsize
+            chunk_particles = max(1, self.max_chunk_bytes // chunk_bytes)
+        else:
+            chunk_particles = self.chunk_particles
+
+        return min(chunk_particles, n_particles), self.chunk_configurations, n_dims
+
+    def get_filter_kwargs(self) -> dict:
+        """
+        Get the compression arguments of h5py.File.create_dataset.
+
+        Returns
+        -------
+        kwargs : dict
+                compression, compression_opts and shuffle arguments.
+        """
+        if self.compression == "blosc":
+            clevel = 5 if self.compression_opts is None else self.compression_opts
+            if self.shuffle:
+                shuffle = hdf5plugin.Blosc.SHUFFLE
+            else:
+                shuffle = hdf5plugin.Blosc.NOSHUFFLE
+            return dict(hdf5plugin.Blosc(cname="zstd", clevel=clevel, shuffle=shuffle))
+        if self.compression == "zstd":
+            clevel = 3 if self.compression_opts is None else self.compression_opts
+            return {"shuffle": self.shuffle, **hdf5plugin.Zstd(clevel=clevel)}
+
+        return {
+            "compression": self.compression,
+            "compression_opts": self.compression_opts,
+            "shuffle": self.shuffle and self.compression is not None,
+        }
+
+    def to_json(self) -> str:
+        """Serialize the layout for storage in the file attributes."""
+        return json.dumps(dataclasses.asdict(self))
+
+    @classmethod
+    def from_json(cls, value: str) -> "StorageLayout":
+        """Load a layout stored with to_json."""
+        return cls(**json.loads(value))
+
+
+class _FileHandlePool:
+    """
+    Process wide pool of open HDF5 files.
+
+    HDF5 does not allow a file to be opened for writing while it is open read-only
+    in the same process. All Database instances therefore share one handle per
+    file: a read-only handle which is upgraded to a write handle when required.
+    A write handle also serves reads until the file is closed. A read-only handle
+    is only upgraded once no other thread reads through it, a request for a write
+    handle waits until then. Requesting a write handle while the same thread still
+    reads through the read-only handle raises a RuntimeError.
+
+    An open handle locks the file against other processes (HDF5 file locking), a
+    write handle against any access and a read-only handle against writing. Handles
+    are therefore only kept between accesses inside of keep_files_open, i.e. for
+    the duration of an operation such as a calculator run. Outside of it, a file is
+    closed as soon as it is no longer accessed.
+    """
+
+    def __init__(self):
+        """Constructor of the pool."""
+        self._pid = os.getpid()
+        self._handles: typing.Dict[str, hf.File] = {}
+        # number of handles in use of each file by each thread
+        self._users: typing.Dict[str, collections.Counter] = {}
+        self._waiting_writers: typing.Dict[str, int] = {}
+        self._operations = 0
+        self._lock = threading.Condition(threading.RLock())
+
+    def _check_process(self):
+        """Forget the handles inherited from a parent process."""
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._handles = {}
+            self._users = {}
+            self._waiting_writers = {}
+            self._operations = 0
+
+    def _get_open_handle(self, key: str) -> typing.Union[hf.File, None]:
+        """Get the pooled handle of a file if it is still open."""
+        handle = self._handles.get(key)
+        if handle is not None and not handle.id.valid:
+            return None
+        return handle
+
+    def _wait_for_readers(self, key: str):
+        """
+        Wait until no thread reads through the read-only handle of a file.
+
+        Parameters
+        ----------
+        key : str
+                Absolute path to the HDF5 file.
+        """
+        users = self._users.get(key, collections.Counter())
+        if users[threading.get_ident()] > 0:
+            raise RuntimeError(
+                f"{key} can not be opened for writing while it is read by the same"
+                " thread."
+            )
+        self._waiting_writers[key] = self._waiting_writers.get(key, 0) + 1
+        try:
+            self._lock.wait_for(lambda: len(self._users.get(key, {})) == 0)
+        finally:
+            self._waiting_writers[key] -= 1
+
+    def get(self, path: str, writable: bool = False) -> hf.File:
+        """
+        Get an open handle of a file.
+
+        Every call has to be followed by a call to release from the same thread once
+        the handle is no longer used.
+
+        Parameters
+        ----------
+        path : str
+                Path to the HDF5 file.
+        writable : bool
+                If true, the handle is opened for writing and the file is created
+                if it does not exist.
+
+        Returns
+        -------
+        handle : hf.File
+                An open file handle.
+        """
+        with self._lock:
+            self._check_process()
+            key = os.path.abspath(path)
+            users = self._users.get(key, collections.Counter())
+            if not writable and users[threading.get_ident()] == 0:
+                # do not keep a waiting writer from upgrading the handle
+                self._lock.wait_for(lambda: self._waiting_writers.get(key, 0) == 0)
+            handle = self._get_open_handle(key)
+            if handle is not None and writable and handle.mode == "r":
+                self._wait_for_readers(key)
+                # the handle may have been closed or upgraded in the meantime
+                handle = self._get_open_handle(key)
+                if handle is not None and handle.mode == "r":
+                    handle.close()
+                    handle = None
+
+            if handle is None:
+                handle = hf.File(
+                    key,
+                    "a" if writable else "r",
+                    rdcc_nbytes=config.hdf5_chunk_cache_bytes,
+                    rdcc_nslots=config.hdf5_chunk_cache_slots,
+                )
+                self._handles[key] = handle
+            self._users[key] = self._users.get(key, collections.Counter())
+            self._users[key][threading.get_ident()] += 1
+
+            return handle
+
+    def release(self, path: str):
+        """
+        Stop using the handle of a file.
+
+        The file is closed if it is not used anymore and no operation is running.
+
+        Parameters
+        ----------
+        path : str
+                Path to the HDF5 file.
+        """
+        with self._lock:
+            self._check_process()
+            key = os.path.abspath(path)
+            users = self._users.get(key, collections.Counter())
+            thread = threading.get_ident()
+            users[thread] -= 1
+            if users[thread] <= 0:
+                del users[thread]
+            self._lock.notify_all()
+            if len(users) > 0:
+                self._users[key] = users
+                return
+            self._users.pop(key, None)
+            if self._operations == 0:
+                self.close(key)
+
+    @contextlib.contextmanager
+    def keep_open(self):
+        """Keep the files opened inside of the context open until it is left."""
+        with self._lock:
+            self._check_process()
+            self._operations += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._operations -= 1
+                if self._operations == 0:
+                    for key in list(self._handles):
+                        if key not in self._users:
+                            self.close(key)
+
+    def close(self, path: str):
+        """
+        Close the handle of a file if it is open.
+
+        Parameters
+        ----------
+        path : str
+                Path to the HDF5 file.
+        """
+        with self._lock:
+            handle = self._handles.pop(os.path.abspath(path), None)
+            if handle is not None and handle.id.valid and os.getpid() == self._pid:
+                handle.close()
+
+
+def keep_files_open():
+    """
+    Keep the simulation database files open for the duration of an operation.
+
+    Inside of the context, the handles of the HDF5 files are shared and reused by
+    all accesses. They are closed when the outermost context is left, so other
+    processes can open the files again. Calculator runs, transformations and adding
+    data use it.
+
+    Examples
+    --------
+    with keep_files_open():
+        for species in experiment.species:
+            database.load_data([f"{species}/Positions"])
+    """
+    return _file_handles.keep_open()
+
+
+def _select_per_axis(array: np.ndarray, select_slice) -> np.ndarray:
+    """
+    Index an array the way h5py indexes a dataset.
+
+    numpy broadcasts several index lists against each other, h5py selects each of
+    them along its own axis, e.g. np.s_[[0, 1], [2, 3]] selects a 2x2 block.
+
+    Parameters
+    ----------
+    array : np.ndarray
+            The array to index.
+    select_slice : np.s_
+            The selection.
+
+    Returns
+    -------
+    selection : np.ndarray
+            A view of array if select_slice contains no index lists.
+    """
+    if not isinstance(select_slice, tuple):
+        return array[select_slice]
+    n_lists = sum(np.ndim(item) > 0 for item in select_slice)
+    if n_lists <= 1:
+        return array[select_slice]
+
+    axis = 0
+    for item in select_slice:
+        array = array[(slice(None),) * axis + (item,)]
+        if np.ndim(item) > 0 or isinstance(item, slice):
+            axis += 1
+    return array
+
+
+_file_handles = _FileHandlePool()
+_dataset_indices: typing.Dict[str, typing.Dict[str, "DatasetInfo"]] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class DatasetInfo:
+    """
+    Metadata of a dataset in the simulation database.
+
+    Attributes
+    ----------
+    path : str
+            Path of the dataset in the database, e.g. 'Na/Positions'
+    shape : tuple
+            Shape of the dataset
+    dtype : str
+            Data type of the dataset, e.g. 'float32'
+    starting_index : int
+            Configuration at which the next chunk of data is written
+    """
+
+    path: str
+    shape: tuple
+    dtype: str
+    starting_index: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the dataset in bytes."""
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+
 class Database:
     """
     Database class.
@@ -236,13 +808,25 @@ class Database:
     are using has a separate class with commonly used methods which act as
     wrappers for the hdf5 database_path.
 
+    All instances pointing to the same file share one handle. Inside of
+    keep_files_open, e.g. during a calculator run, the handle is kept open between
+    calls and locks the file against other processes until the operation ends.
+    Otherwise the file is closed after every access. close() releases the handle
+    and the cached dataset index immediately.
+
     Attributes
     ----------
     path : str|Path
             The name of the database_path in question.
+    layout : StorageLayout
+            The layout with which new datasets are created.
     """
 
-    def __init__(self, path: typing.Union[str, pathlib.Path] = "database"):
+    def __init__(
+        self,
+        path: typing.Union[str, pathlib.Path] = "database",
+        layout: StorageLayout = None,
+    ):
         """
         Constructor for the database_path class.
 
@@ -250,6 +834,9 @@ class Database:
         ----------
         path : str|Path
                 The name of the database_path in question.
+        layout : StorageLayout, optional
+                Storage layout of new datasets. If None, the layout recorded in an
+                existing database file is used, otherwise the default layout.
         """
         if isinstance(path, pathlib.Path):
             self.path = path.as_posix()
@@ -260,6 +847,108 @@ class Database:
             log.debug(f"Expected str|Path but found {type(path)}")
             self.path = path
 
+        self._layout = layout
+
+    def __enter__(self):
+        """Enter the context, the file is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the file when leaving the context."""
+        self.close()
+
+    def close(self):
+        """Close the open handles of the database file."""
+        _file_handles.close(self.path)
+        _dataset_indices.pop(os.path.abspath(self.path), None)
+
+    def get_dataset_index(self) -> typing.Dict[str, DatasetInfo]:
+        """
+        Get the metadata of all datasets in the database.
+
+        The index is built once by visiting the file and shared by all instances
+        pointing to the same file. Writes through a Database invalidate it.
+
+        Returns
+        -------
+        index : dict
+                Dataset metadata keyed by the dataset path, e.g.
+                {'Na/Positions': DatasetInfo('Na/Positions', (500, 1000, 3), ...)}
+        """
+        key = os.path.abspath(self.path)
+        index = _dataset_indices.get(key)
+        if index is None:
+            index = {}
+
+            def add_to_index(name: str, item):
+                if isinstance(item, hf.Dataset):
+                    index[name] = DatasetInfo(
+                        path=name,
+                        shape=item.shape,
+                        dtype=item.dtype.name,
+                        starting_index=int(item.attrs.get("starting_index", 0)),
+                    )
+
+            with self._open("r") as database:
+                database.visititems(add_to_index)
+            _dataset_indices[key] = index
+
+        return index
+
+    @contextlib.contextmanager
+    def _open(self, mode: str = "r"):
+        """
+        Access the pooled handle of the database file.
+
+        Parameters
+        ----------
+        mode : str
+                "r" for read access, "r+" or "a" for write access. Written data is
+                flushed and the dataset index is invalidated when the context is
+                left.
+
+        Yields
+        ------
+        database : hf.File
+                The open database file.
+        """
+        writable = mode != "r"
+        database = _file_handles.get(self.path, writable=writable)
+        try:
+            yield database
+            if writable:
+                database.flush()
+        finally:
+            if writable:
+                # the dataset index may be outdated after a write
+                _dataset_indices.pop(os.path.abspath(self.path), None)
+            _file_handles.release(self.path)
+
+    @property
+    def layout(self) -> StorageLayout:
+        """The layout with which new datasets are created."""
+        if self._layout is None:
+            self._layout = self.get_storage_layout() or StorageLayout()
+        return self._layout
+
+    def get_storage_layout(self) -> typing.Union[StorageLayout, None]:
+        """
+        Read the storage layout recorded in the database file.
+
+        Returns
+        -------
+        layout : StorageLayout
+                The recorded layout or None if the file does not exist or was
+                written without a layout.
+        """
+        if not self.database_exists():
+            return None
+        with self._open("r") as database:
+            value = database.attrs.get("storage_layout")
+        if value is None:
+            return None
+        return StorageLayout.from_json(value)
+
     @staticmethod
     def _update_indices(
         data: np.array, reference: np.array, batch_size: int, n_atoms: int
@@ -345,7 +1034,7 @@ class Database:
 
         chunk_data = chunk.get_data()
 
-        with hf.File(self.path, "r+") as database:
+        with self._open("r+") as database:
             for sp_info in chunk.species_list:
                 for prop_info in sp_info.properties:
                     dataset_name = f"{sp_info.name}/{prop_info.name}"
@@ -392,7 +1081,7 @@ class Database:
         -------
 
         """
-        with hf.File(self.path, "r+") as db:
+        with self._open("r+") as db:
             # construct the architecture dict
             architecture = self._build_path_input(structure=structure)
 
@@ -411,12 +1100,58 @@ class Database:
                         axis = 1
 
                     expansion = dataset_information[axis] + db[identifier].shape[axis]
-                    db[identifier].resize(expansion, axis)
+                    if db[identifier].chunks is None:
+                        self._resize_contiguous_dataset(db, identifier, expansion, axis)
+                    else:
+                        db[identifier].resize(expansion, axis)
 
                 # It is actually a new group
                 except KeyError:
                     self.add_dataset({identifier: architecture[identifier]})
 
+    @staticmethod
+    def _resize_contiguous_dataset(
+        db: hf.File, identifier: str, size: int, axis: int, max_copy_bytes: int = 2**26
+    ):
+        """
+        Resize a contiguous dataset by copying it into a larger one.
+
+        HDF5 can only resize chunked datasets. The data is copied in blocks along
+        axis such that at most max_copy_bytes are held in memory at once. The space
+        of the old dataset is not released from the file, it can be reclaimed with
+        h5repack.
+
+        Parameters
+        ----------
+        db : hf.File
+                The open database file.
+        identifier : str
+                Path to the dataset.
+        size : int
+                New size of the dataset along axis.
+        axis : int
+                Axis along which the dataset is resized.
+        max_copy_bytes : int
+                Upper bound on the size of a block which is copied at once.
+        """
+        dataset = db[identifier]
+        shape = list(dataset.shape)
+        shape[axis] = size
+        resized_identifier = f"{identifier}_resized"
+        resized = db.create_dataset(resized_identifier, tuple(shape), dtype=dataset.dtype)
+
+        length = dataset.shape[axis]
+        bytes_per_index = dataset.nbytes // max(length, 1)
+        block_size = max(1, max_copy_bytes // max(bytes_per_index, 1))
+        for start in range(0, length, block_size):
+            block = [slice(None)] * dataset.ndim
+            block[axis] = slice(start, min(start + block_size, length))
+            resized[tuple(block)] = dataset[tuple(block)]
+
+        resized.attrs.update(dataset.attrs)
+        del db[identifier]
+        db.move(resized_identifier, identifier)
+
     def initialize_database(self, structure: dict):
         """
         Build a database_path with a general structure.
@@ -468,7 +1203,9 @@ class Database:
         -------
         Updates the database_path directly.
         """
-        with hf.File(self.path, "a") as database:
+        layout = self.layout
+        with self._open("a") as database:
+            database.attrs["storage_layout"] = layout.to_json()
             for item in architecture:
                 dataset_information = architecture[item]  # get the tuple information
                 dataset_path = item  # get the dataset path in the database_path
@@ -480,21 +1217,27 @@ class Database:
                 except TypeError:
                     raise TypeError
 
-                if len(dataset_information[:-1]) == 1:
-                    vector_length = dataset_information[-1]
-                    max_shape = (None, vector_length)
+                if layout.contiguous:
+                    # stored as float64 so that mapped datasets are not cast on load
+                    database.create_dataset(
+                        dataset_path, dataset_information, dtype=np.float64
+                    )
                 else:
-                    max_shape = list(dataset_information)
-                    max_shape[1] = None
-                    max_shape = tuple(max_shape)
-
-                database.create_dataset(
-                    dataset_path,
-                    dataset_information,
-                    maxshape=max_shape,
-                    compression="gzip",
-                    chunks=True,
-                )
+                    if len(dataset_information[:-1]) == 1:
+                        vector_length = dataset_information[-1]
+                        max_shape = (None, vector_length)
+                    else:
+                        max_shape = list(dataset_information)
+                        max_shape[1] = None
+                        max_shape = tuple(max_shape)
+
+                    database.create_dataset(
+                        dataset_path,
+                        dataset_information,
+                        maxshape=max_shape,
+                        chunks=layout.get_chunk_shape(dataset_information),
+                        **layout.get_filter_kwargs(),
+                    )
                 dataset = database[dataset_path]
                 dataset.attrs["starting_index"] = 0
 
@@ -516,7 +1259,7 @@ class Database:
         -------
         Updates the database_path directly.
         """
-        with hf.File(self.path, "a") as database:
+        with self._open("a") as database:
             # Build file paths for the addition.
             architecture = self._build_path_input(structure=structure)
             for item in list(architecture):
@@ -535,13 +1278,9 @@ class Database:
                 A dictionary of the memory information of the groups in the
                 database_path
         """
-        with hf.File(self.path, "r") as database:
-            memory_database = {}
-            for item in database:
-                for ds in database[item]:
-                    memory_database[join_path(item, ds)] = database[item][ds].nbytes
-
-        return memory_database
+        return {
+            path: info.nbytes for path, info in self.get_dataset_index().items()
+        }
 
     def check_existence(self, path: str) -> bool:
         """
@@ -557,19 +1296,13 @@ class Database:
         response : bool
                 If true, the path exists, else, it does not.
         """
-        with hf.File(self.path, "r") as database_object:
-            keys = []
-            database_object.visit(
-                lambda item: (
-                    keys.append(database_object[item].name)
-                    if isinstance(database_object[item], hf.Dataset)
-                    else None
-                )
-            )
-            path = f"/{path}"  # add the / to avoid name overlapping
+        index = self.get_dataset_index()
+        path = path.strip("/")
+        if path in index:
+            return True
+        path = f"/{path}"  # add the / to avoid name overlapping
 
-            response = any(list(item.endswith(path) for item in keys))
-        return response
+        return any(f"/{item}".endswith(path) for item in index)
 
     def change_key_names(self, mapping: dict):
         """
@@ -584,7 +1317,7 @@ class Database:
         -------
         Updates the database_path
         """
-        with hf.File(self.path, "r+") as db:
+        with self._open("r+") as db:
             groups = list(db.keys())
 
             for item in groups:
@@ -598,6 +1331,7 @@ class Database:
         dictionary: bool = False,
         scaling: list = None,
         d_size: int = None,
+        memory_map: bool = None,
     ):
         """
         Load tensor_values from the database_path for some operation.
@@ -605,14 +1339,27 @@ class Database:
         Should be called by the tensor_values fetch class as this will ensure
         correct loading and pre-loading.
 
+        Parameters
+        ----------
+        memory_map : bool
+                If true, contiguous uncompressed datasets are memory-mapped and
+                returned as float64 numpy arrays. Slices of float64 datasets which are
+                not scaled and not selected by index lists are returned as views of the
+                file, contiguous datasets are stored as float64 for this. This avoids
+                the copy of the h5py read and of the cast to float64, the data is
+                still copied when it is passed on through tf.data. Other datasets are
+                read through h5py. Defaults to config.memory_map_datasets.
+
         Returns
         -------
 
         """
         if scaling is None:
             scaling = [1 for _ in range(len(path_list))]
+        if memory_map is None:
+            memory_map = config.memory_map_datasets
 
-        with hf.File(self.path, "r") as database:
+        with self._open("r") as database:
             data = {}
             for i, item in enumerate(path_list):
                 if type(select_slice) is dict:
@@ -621,23 +1368,61 @@ class Database:
                     my_slice = select_slice[slice_index]
                 else:
                     my_slice = select_slice
-                try:
-                    data[item] = (
-                        tf.convert_to_tensor(database[item][my_slice], dtype=tf.float64)
-                        * scaling[i]
+
+                mapped_dataset = None
+                if memory_map:
+                    mapped_dataset = self._get_memory_map(database[item])
+
+                if mapped_dataset is not None:
+                    # only copies if the dataset is not stored as float64
+                    values = np.asarray(
+                        _select_per_axis(mapped_dataset, my_slice), dtype=np.float64
                     )
+                    if scaling[i] != 1:
+                        values = values * scaling[i]
+                    data[item] = values
+                    continue
+
+                # convert to float64 while reading instead of after
+                dataset = database[item].astype(np.float64)
+                try:
+                    values = tf.convert_to_tensor(dataset[my_slice])
                 except TypeError:
-                    data[item] = (
-                        tf.convert_to_tensor(
-                            database[item][my_slice[0]][:, my_slice[1], :],
-                            dtype=tf.float64,
-                        )
-                        * scaling[i]
+                    values = tf.convert_to_tensor(
+                        dataset[my_slice[0]][:, my_slice[1], :]
                     )
+                if scaling[i] != 1:
+                    values = values * scaling[i]
+                data[item] = values
             data[str.encode("data_size")] = d_size
 
         return data
 
+    def _get_memory_map(self, dataset: hf.Dataset) -> typing.Union[np.memmap, None]:
+        """
+        Memory-map a dataset of the database file.
+
+        Parameters
+        ----------
+        dataset : hf.Dataset
+                An open dataset of this database.
+
+        Returns
+        -------
+        mapped_dataset : np.memmap
+                A read-only array backed by the file or None if the dataset is
+                chunked, filtered or not yet written.
+        """
+        if dataset.chunks is not None or dataset.compression is not None:
+            return None
+        offset = dataset.id.get_offset()
+        if offset is None or dataset.size == 0:
+            return None
+
+        return np.memmap(
+            self.path, mode="r", dtype=dataset.dtype, offset=offset, shape=dataset.shape
+        )
+
     def get_load_time(self, database_path: str = None):
         """
         Calculate the open/close time of the database_path.
@@ -680,14 +1465,11 @@ class Database:
                 Tuple of tensor_values about the dataset, e.g.
                 (n_rows, n_columns, n_bytes)
         """
-        with hf.File(self.path, "r") as db:
-            data_tuple = (
-                db[data_path].shape[0],
-                db[data_path].shape[1],
-                db[data_path].nbytes,
-            )
+        if isinstance(data_path, bytes):
+            data_path = data_path.decode()
+        info = self.get_dataset_index()[data_path.strip("/")]
 
-        return data_tuple
+        return info.shape[0], info.shape[1], info.nbytes
 
     def get_database_summary(self):
         """
@@ -698,5 +1480,5 @@ class Database:
         summary : list
                 A list of properties that are in the database.
         """
-        with hf.File(self.path, "r") as db:
+        with self._open("r") as db:
             return list(db.keys())
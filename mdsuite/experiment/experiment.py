@@ -44,7 +44,9 @@ from mdsuite.database.experiment_database import ExperimentDatabase
 from mdsuite.database.simulation_database import (
     Database,
     SpeciesInfo,
+    StorageLayout,
     TrajectoryMetadata,
+    keep_files_open,
 )
 from mdsuite.experiment.run import RunComputation
 from mdsuite.time_series import time_series_dict
@@ -129,6 +131,9 @@ class Experiment(ExperimentDatabase):
             read from the file and will be correct.
     number_of_atoms : int
             The total number of atoms in the simulation
+    storage_layout : StorageLayout
+            HDF5 layout of the simulation database, None uses the layout recorded
+            in the database or the default.
     """
 
     def __init__(
@@ -139,6 +144,7 @@ class Experiment(ExperimentDatabase):
         temperature=None,
         units: Union[str, Units] = None,
         cluster_mode=False,
+        storage_layout: StorageLayout = None,
     ):
         """
         Initialise the experiment class.
@@ -158,6 +164,9 @@ class Experiment(ExperimentDatabase):
                 If true, several parameters involved in plotting and parallelization
                 will be adjusted so as to allow for optimal performance on a large
                 computing cluster.
+        storage_layout : StorageLayout, optional
+                Chunking and compression of the simulation database. Only used for
+                datasets that are created after instantiation.
         """
         if not name[0].isalpha():
             raise ValueError(
@@ -169,6 +178,7 @@ class Experiment(ExperimentDatabase):
         self.name = name
         self.storage_path = Path(project.storage_path, project.name).as_posix()
         self.cluster_mode = cluster_mode
+        self.storage_layout = storage_layout
 
         # ExperimentDatabase stored properties:
         # ------- #
@@ -279,7 +289,8 @@ class Experiment(ExperimentDatabase):
         transformation: Transformations
         """
         transformation.experiment = self
-        transformation.run_transformation(*args, **kwargs)
+        with keep_files_open():
+            transformation.run_transformation(*args, **kwargs)
 
     @staticmethod
     def units_to_si(units_system) -> Units:
@@ -528,28 +539,35 @@ class Experiment(ExperimentDatabase):
             )
             return
 
-        database = Database(self.database_path / "database.hdf5")
+        # store the experiment attributes in a single transaction and keep the
+        # database file open while adding the batches
+        with self.batch_writes(), keep_files_open():
+            database = Database(
+                self.database_path / "database.hdf5", layout=self.storage_layout
+            )
 
-        metadata = file_processor.metadata
-        architecture = _species_list_to_architecture_dict(
-            metadata.species_list, metadata.n_configurations
-        )
-        if not database.database_exists():
-            self._store_metadata(metadata, update_with_pubchempy=update_with_pubchempy)
-            database.initialize_database(architecture)
-        else:
-            database.resize_datasets(architecture)
+            metadata = file_processor.metadata
+            architecture = _species_list_to_architecture_dict(
+                metadata.species_list, metadata.n_configurations
+            )
+            if not database.database_exists():
+                self._store_metadata(
+                    metadata, update_with_pubchempy=update_with_pubchempy
+                )
+                database.initialize_database(architecture)
+            else:
+                database.resize_datasets(architecture)
 
-        for i, batch in enumerate(file_processor.get_configurations_generator()):
-            database.add_data(chunk=batch)
-            self.number_of_configurations += batch.chunk_size
+            for i, batch in enumerate(file_processor.get_configurations_generator()):
+                database.add_data(chunk=batch)
+                self.number_of_configurations += batch.chunk_size
 
-        self.version += 1
+            self.version += 1
 
-        self.memory_requirements = database.get_memory_information()
+            self.memory_requirements = database.get_memory_information()
 
-        # set at the end, because if something fails, the file was not properly read.
-        self.read_files = self.read_files + [str(file_processor)]
+            # set at the end, because if something fails, the file was not properly read.
+            self.read_files = self.read_files + [str(file_processor)]
 
     def load_matrix(
         self,
@@ -627,9 +645,6 @@ class Experiment(ExperimentDatabase):
                 "mass": sp_info.mass,
                 "charge": sp_info.charge,
                 "n_particles": sp_info.n_particles,
-                # legacy: calculators use this list to determine the number of particles
-                # TODO change this.
-                "indices": list(range(sp_info.n_particles)),
                 "properties": [prop_info.name for prop_info in sp_info.properties],
             }
         self.species = species_dict
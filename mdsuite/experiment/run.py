@@ -18,6 +18,7 @@ from mdsuite.calculators import (
     AngularDistributionFunction,  # SpatialDistributionFunction,
 )
 from mdsuite.calculators import (  # StructureFactor,
+    CalculatorPipeline,
     CoordinationNumbers,
     EinsteinDiffusionCoefficients,
     EinsteinDistinctDiffusionCoefficients,
@@ -161,6 +162,10 @@ class RunComputation:
     #####################
     #### Calculators ####
     #####################
+    @property
+    def CalculatorPipeline(self) -> CalculatorPipeline:
+        return CalculatorPipeline(**self.kwargs)
+
     @property
     def AngularDistributionFunction(self) -> AngularDistributionFunction:
         return self.exp_wrapper(AngularDistributionFunction)(**self.kwargs)
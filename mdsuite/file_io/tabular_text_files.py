@@ -1,7 +1,13 @@
 """MDSuite Tabular Text file reader module."""
+
 import abc
+import collections
+import concurrent.futures
 import copy
 import dataclasses
+import itertools
+import multiprocessing
+import os
 import pathlib
 import typing
 
@@ -11,6 +17,7 @@ import tqdm
 import mdsuite.database.simulation_database
 import mdsuite.file_io.file_read
 import mdsuite.utils.meta_functions
+from mdsuite.utils import config
 
 
 @dataclasses.dataclass
@@ -127,7 +134,20 @@ class TabularTextFileProcessor(mdsuite.file_io.file_read.FileProcessor):
         but requires its children to provide the necessary information about the table
         contents,
         see self._get_tabular_text_reader_data.
+
+        If config.file_io_workers is set, large files are parsed by a pool of worker
+        processes, see self._get_configurations_generator_parallel. The chunks are
+        yielded in the order of the configurations in the file either way.
         """
+        n_workers = _get_n_workers()
+        if (
+            n_workers > 1
+            and self.tabular_text_reader_data.n_configs > 1
+            and os.path.getsize(self.file_path) >= config.file_io_parallel_min_bytes
+        ):
+            yield from self._get_configurations_generator_parallel(n_workers)
+            return
+
         n_configs = self.tabular_text_reader_data.n_configs
 
         batch_size = mdsuite.utils.meta_functions.optimize_batch_size(
@@ -157,6 +177,107 @@ class TabularTextFileProcessor(mdsuite.file_io.file_read.FileProcessor):
                     n_header_lines=n_header_lines_in_config,
                 )
 
+    def _get_configurations_generator_parallel(
+        self, n_workers: int
+    ) -> typing.Iterator[mdsuite.database.simulation_database.TrajectoryChunkData]:
+        """
+        Parse disjoint ranges of configurations in worker processes.
+
+        All configurations have the same number of lines, so the byte offsets of the
+        configuration starts are collected once and each worker seeks directly to the
+        first configuration of its batch. At most two batches per worker are in
+        flight, the finished chunks are yielded in file order so a single writer can
+        append them to the database.
+
+        Parameters
+        ----------
+        n_workers : int
+                Number of worker processes.
+        """
+        n_configs = int(self.tabular_text_reader_data.n_configs)
+        if self.tabular_text_reader_data.header_lines_for_each_config:
+            n_header_lines_in_config = self.tabular_text_reader_data.n_header_lines
+        else:
+            n_header_lines_in_config = 0
+
+        max_in_flight = 2 * n_workers
+        # every batch in flight has to fit into the memory of one serial batch
+        batch_size = mdsuite.utils.meta_functions.optimize_batch_size(
+            filepath=self.file_path, number_of_configurations=n_configs
+        )
+        batch_size = max(
+            1, min(batch_size // max_in_flight, -(-n_configs // max_in_flight))
+        )
+        batch_starts = range(0, n_configs, batch_size)
+
+        offsets = self._get_config_byte_offsets()
+        # the workers receive the layout of the file once and then only byte ranges.
+        # They are spawned, forking a process that imported TensorFlow can deadlock.
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.tabular_text_reader_data, self.metadata.species_list),
+        )
+        with executor:
+            futures = collections.deque()
+            for start in tqdm.tqdm(batch_starts, ncols=70):
+                futures.append(
+                    executor.submit(
+                        _read_configurations_at,
+                        self.file_path,
+                        int(offsets[start]),
+                        min(batch_size, n_configs - start),
+                        n_header_lines_in_config,
+                    )
+                )
+                if len(futures) >= max_in_flight:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def _get_config_byte_offsets(self) -> np.ndarray:
+        """
+        Get the byte offsets at which the configurations start.
+
+        The file is scanned in blocks for line breaks, every line break that ends
+        a configuration (or the file header) marks the start of the next one.
+
+        Returns
+        -------
+        offsets : np.ndarray
+                Array of shape (n_configs,) with the byte offset of each configuration.
+        """
+        mdata = self.tabular_text_reader_data
+        if mdata.header_lines_for_each_config:
+            n_lines_per_config = mdata.n_header_lines + mdata.n_particles
+            n_file_header_lines = 0
+        else:
+            n_lines_per_config = mdata.n_particles
+            n_file_header_lines = mdata.n_header_lines
+
+        block_size = 2**24
+        offsets = [np.zeros(1, dtype=np.int64)] if n_file_header_lines == 0 else []
+        n_lines_read = 0
+        n_bytes_read = 0
+        with open(self.file_path, "rb") as file:
+            while True:
+                block = file.read(block_size)
+                if not block:
+                    break
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                # number of lines in the file up to and including each newline
+                n_lines = n_lines_read + 1 + np.arange(len(newlines), dtype=np.int64)
+                n_config_lines = n_lines - n_file_header_lines
+                is_config_end = (n_config_lines >= 0) & (
+                    n_config_lines % n_lines_per_config == 0
+                )
+                offsets.append(n_bytes_read + newlines[is_config_end] + 1)
+                n_lines_read += len(newlines)
+                n_bytes_read += len(block)
+
+        return np.concatenate(offsets)[: mdata.n_configs]
+
     def _read_process_n_configurations(
         self,
         file,
@@ -164,7 +285,8 @@ class TabularTextFileProcessor(mdsuite.file_io.file_read.FileProcessor):
         n_header_lines: int = 0,
     ) -> mdsuite.database.simulation_database.TrajectoryChunkData:
         """
-        Read n configurations and package them into a trajectory chunk of the right format
+        Read n configurations and package them into a trajectory chunk.
+
         Parameters
         ----------
         file:
@@ -176,48 +298,172 @@ class TabularTextFileProcessor(mdsuite.file_io.file_read.FileProcessor):
         -------
             The chunk for your reader output.
         """
-        species_list = self.metadata.species_list
-        chunk = mdsuite.database.simulation_database.TrajectoryChunkData(
-            species_list, n_configs
+        return _read_configurations(
+            file,
+            n_configs,
+            n_header_lines,
+            self.tabular_text_reader_data,
+            self.metadata.species_list,
         )
 
-        for config_idx in range(n_configs):
-            # skip the header
-            mdsuite.file_io.tabular_text_files.skip_n_lines(file, n_header_lines)
-            # read one config
-            traj_data = np.stack(
-                [
-                    (list(file.readline().split()))
-                    for _ in range(
-                        self.tabular_text_reader_data.n_particles,
-                    )
-                ]
+
+def _read_configurations(
+    file,
+    n_configs: int,
+    n_header_lines: int,
+    reader_data: TabularTextFileReaderMData,
+    species_list: typing.List[mdsuite.database.simulation_database.SpeciesInfo],
+) -> mdsuite.database.simulation_database.TrajectoryChunkData:
+    """
+    Read n configurations and package them into a trajectory chunk.
+
+    The lines of all configurations are read at once and only the columns that are
+    needed are parsed into one float array, which is then sliced by species and
+    property.
+
+    Parameters
+    ----------
+    file:
+        A file opened at the start of a configuration
+    n_configs:
+        Number of configs to process
+    n_header_lines:
+        Number of header lines PER CONFIG
+    reader_data:
+        The tabular text reader data of the file.
+    species_list:
+        The species of the trajectory metadata.
+    -------
+        The chunk for your reader output.
+    """
+    chunk = mdsuite.database.simulation_database.TrajectoryChunkData(
+        species_list, n_configs
+    )
+    n_particles = reader_data.n_particles
+    n_lines_per_config = n_header_lines + n_particles
+
+    lines = list(itertools.islice(file, n_configs * n_lines_per_config))
+    if n_header_lines > 0:
+        # skip the header of each config
+        lines = list(
+            itertools.chain.from_iterable(
+                lines[start + n_header_lines : start + n_lines_per_config]
+                for start in range(0, len(lines), n_lines_per_config)
             )
-            # sort by id
-            if self.tabular_text_reader_data.sort_by_column_idx is not None:
-                traj_data = mdsuite.utils.meta_functions.sort_array_by_column(
-                    traj_data, self.tabular_text_reader_data.sort_by_column_idx
-                )
+        )
 
-            # slice by species
-            for sp_info in species_list:
-                idxs = self.tabular_text_reader_data.species_name_to_line_idx_dict[
-                    sp_info.name
-                ]
-                sp_data = traj_data[idxs, :]
-                # slice by property
-                for prop_info in sp_info.properties:
-                    prop_column_idxs = (
-                        self.tabular_text_reader_data.property_to_column_idx_dict[
-                            prop_info.name
-                        ]
-                    )
-                    write_data = sp_data[:, prop_column_idxs]
-                    # add 'time' axis. we only have one configuration to write
-                    write_data = write_data[np.newaxis, :, :]
-                    chunk.add_data(write_data, config_idx, sp_info.name, prop_info.name)
+    columns, column_positions, sort_position = _get_parsed_columns(reader_data)
+    traj_data = np.loadtxt(
+        lines, usecols=columns, comments=None, ndmin=2, dtype=np.float64
+    )
+    traj_data = traj_data.reshape((n_configs, n_particles, len(columns)))
+
+    # sort by id
+    if sort_position is not None:
+        order = np.argsort(traj_data[:, :, sort_position], axis=1)
+        traj_data = np.take_along_axis(traj_data, order[:, :, None], axis=1)
+
+    # slice by species and property
+    for sp_info in species_list:
+        idxs = reader_data.species_name_to_line_idx_dict[sp_info.name]
+        idxs = np.asarray(idxs)[:, None]
+        for prop_info in sp_info.properties:
+            write_data = traj_data[:, idxs, column_positions[prop_info.name]]
+            chunk.add_data(write_data, 0, sp_info.name, prop_info.name)
+
+    return chunk
+
+
+def _get_parsed_columns(
+    reader_data: TabularTextFileReaderMData,
+) -> typing.Tuple[list, dict, typing.Optional[int]]:
+    """
+    Get the columns that have to be parsed to fill a chunk.
+
+    Parameters
+    ----------
+    reader_data:
+        The tabular text reader data of the file.
+
+    Returns
+    -------
+    columns:
+        Sorted column idxs that are read from the file.
+    column_positions:
+        Position of the property columns within the parsed columns,
+        e.g. {"Positions": np.array([0, 1, 2])}.
+    sort_position:
+        Position of the column to sort by within the parsed columns or None.
+    """
+    property_columns = reader_data.property_to_column_idx_dict
+    sort_column = reader_data.sort_by_column_idx
+
+    columns = set(itertools.chain.from_iterable(property_columns.values()))
+    if sort_column is not None:
+        columns.add(sort_column)
+    columns = sorted(columns)
+
+    column_positions = {
+        name: np.searchsorted(columns, idxs)[None, :]
+        for name, idxs in property_columns.items()
+    }
+    sort_position = None if sort_column is None else columns.index(sort_column)
+
+    return columns, column_positions, sort_position
 
-        return chunk
+
+def _get_n_workers() -> int:
+    """Number of processes to parse a trajectory with, see config.file_io_workers."""
+    if config.file_io_workers is None:
+        return 1
+    return max(1, int(config.file_io_workers))
+
+
+# layout of the file parsed by a worker process, see _init_worker
+_worker_data: typing.Optional[tuple] = None
+
+
+def _init_worker(
+    reader_data: TabularTextFileReaderMData,
+    species_list: typing.List[mdsuite.database.simulation_database.SpeciesInfo],
+):
+    """
+    Store the layout of the file in a worker process.
+
+    Parameters
+    ----------
+    reader_data:
+        The tabular text reader data of the file.
+    species_list:
+        The species of the trajectory metadata.
+    """
+    global _worker_data
+    _worker_data = (reader_data, species_list)
+
+
+def _read_configurations_at(
+    file_path: pathlib.Path,
+    start_byte: int,
+    n_configs: int,
+    n_header_lines: int,
+) -> mdsuite.database.simulation_database.TrajectoryChunkData:
+    """
+    Worker function to read n_configs configurations starting at a byte offset.
+
+    Parameters
+    ----------
+    file_path:
+        Path to the tabular text file.
+    start_byte:
+        Byte offset of the first configuration in the file.
+    n_configs:
+        Number of configs to process
+    n_header_lines:
+        Number of header lines PER CONFIG
+    """
+    with open(file_path, "r") as file:
+        file.seek(start_byte)
+        return _read_configurations(file, n_configs, n_header_lines, *_worker_data)
 
 
 def read_n_lines(file, n_lines: int, start_at: int = None) -> list:
@@ -30,14 +30,15 @@ import logging
 from typing import TYPE_CHECKING
 
 import numpy as np
-import tensorflow as tf
+import scipy.sparse
 from pysmiles import read_smiles
-from tqdm import tqdm
+from scipy.sparse.csgraph import connected_components
 
 from mdsuite.database.mdsuite_properties import mdsuite_properties
 from mdsuite.database.simulation_database import Database
-from mdsuite.utils.meta_functions import check_a_in_b, join_path
+from mdsuite.utils.meta_functions import join_path
 from mdsuite.utils.molecule import Molecule
+from mdsuite.utils.neighbour_list import cell_list_applicable, get_cell_list_pairs
 
 log = logging.getLogger(__name__)
 
@@ -129,15 +130,18 @@ class MolecularGraph:
         # we round to .14f to avoid some very small uncertainties and test equality
         self.molecular_mass = round(self.molecular_mass, 14)
 
-    def build_configuration_graph(self) -> tf.Tensor:
+    def build_configuration_graph(self) -> scipy.sparse.csr_matrix:
         """
         Build a graph for the configuration.
 
+        Bonds are found with a cell list, so the adjacency matrix is built without
+        computing all pairwise distances.
+
         Returns
         -------
-        adjacency_matrix : tf.Tensor
-                An adjacency matrix for the configuration describing which atoms are
-                bonded to which others.
+        adjacency_matrix : scipy.sparse.csr_matrix
+                A sparse, symmetric adjacency matrix for the configuration describing
+                which atoms are bonded to which others.
         """
         path_list = [
             join_path(species, self.reference_property.name) for species in self.species
@@ -145,15 +149,17 @@ class MolecularGraph:
         data_dict = self.database.load_data(
             path_list=path_list, select_slice=np.s_[:, self.reference_configuration]
         )
-        data = []
-        for item in path_list:
-            data.append(data_dict[item])
-        configuration_tensor = tf.concat(data, axis=0)
-        distance_matrix = get_neighbour_list(
-            configuration_tensor, cell=self.experiment.box_array
+        configuration = np.concatenate(
+            [np.asarray(data_dict[item], dtype=np.float64) for item in path_list]
         )
+        bonds = get_bonded_pairs(configuration, self.experiment.box_array, self.cutoff)
 
-        return _apply_system_cutoff(distance_matrix, self.cutoff)
+        n_atoms = len(configuration)
+        adjacency_matrix = scipy.sparse.coo_matrix(
+            (np.ones(bonds.shape[1], dtype=np.int8), (bonds[0], bonds[1])),
+            shape=(n_atoms, n_atoms),
+        )
+        return (adjacency_matrix + adjacency_matrix.T).tocsr()
 
     def _build_molecule_groups(self):
         """
@@ -167,7 +173,9 @@ class MolecularGraph:
         decomposed_graphs = self._perform_graph_decomposition(adjacency_graph)
         self.molecular_groups = self._split_decomposed_graphs(decomposed_graphs)
 
-    def _perform_graph_decomposition(self, adjacency_matrix: tf.Tensor) -> dict:
+    def _perform_graph_decomposition(
+        self, adjacency_matrix: scipy.sparse.csr_matrix
+    ) -> dict:
         """
         Reduce an adjacency matrix into a linear combination of sub-matrices.
 
@@ -178,51 +186,22 @@ class MolecularGraph:
 
         Parameters
         ----------
-        adjacency_matrix : tf.Tensor
-                Adjacency tensor to reduce.
+        adjacency_matrix : scipy.sparse.csr_matrix
+                Adjacency matrix to reduce.
 
         Returns
         -------
         reduced_graphs : dict
                 A dict of sub graphs constructed from the decomposition of the adjacency
-                matrix. Of the form {'0': [], '1': []}
+                matrix. Of the form {0: np.array([0, 4, 5]), 1: np.array([1, 2, 3])}
         """
         # TODO: wrap this in an optimizer to iteratively improve the cutoff until the
         #       number is correct.
-
-        molecules = {}
         log.info(f"Building molecular graph from configuration for {self.molecule_name}")
-        # TODO speed up
-        for i in tqdm(range(len(adjacency_matrix)), ncols=70):
-            indices = tf.where(adjacency_matrix[i])
-            indices = tf.reshape(indices, -1)
-            if len(molecules) == 0:
-                molecule = 0
-                molecules[molecule] = indices
-            else:
-                molecule = None
-                for mol in molecules:
-                    if check_a_in_b(indices, molecules[mol]):
-                        molecule = mol
-                        molecules[mol] = tf.concat([molecules[mol], indices], 0)
-                        molecules[mol] = tf.unique(molecules[mol])[0]
-                        break
-                if molecule is None:
-                    molecule = len(molecules)
-                    molecules[molecule] = indices
-
-        del_list = []
-        for item in molecules:
-            test_dict = molecules.copy()
-            test_dict.pop(item)
-            for reference in test_dict:
-                if all(elem in test_dict[reference] for elem in molecules[item]):
-                    del_list.append(item)
-
-        for item in del_list:
-            molecules.pop(item)
-
-        return molecules
+        # unbonded atoms are only molecules if the molecule has a single atom
+        min_size = 1 if sum(self.species.values()) == 1 else 2
+
+        return get_connected_components(adjacency_matrix, min_size=min_size)
 
     def _perform_isomorphism_tests(self):
         """
@@ -315,29 +294,19 @@ class MolecularGraph:
                 A dictionary of atoms and indices that specify that indices of
                 this species is in a molecule.
         """
+        lengths = np.cumsum(
+            [0] + [self.experiment.species[item].n_particles for item in self.species]
+        )
         particle_groups = {}
-        for item in graph_dict:
-            indices_dict = {}
-            lengths = [self.experiment.species[item].n_particles for item in self.species]
-            lengths = np.cumsum(lengths)
-
-            for i, particle_species in enumerate(self.species):
-                if i == 0:
-                    indices_dict[particle_species] = np.sort(
-                        np.array(list(filter(lambda x: x < lengths[i], graph_dict[item])))
-                    ).tolist()
-                else:
-                    greater_array = list(
-                        filter(lambda x: x >= lengths[i - 1], graph_dict[item])
-                    )
-                    constrained_array = list(
-                        filter(lambda x: x < lengths[i], greater_array)
-                    )
-                    indices_dict[particle_species] = np.sort(
-                        np.array(constrained_array) - (lengths[i - 1])
-                    ).tolist()
-
-            particle_groups[item] = indices_dict
+        for item, indices in graph_dict.items():
+            indices = np.sort(indices)
+            species_index = np.searchsorted(lengths, indices, side="right") - 1
+            particle_groups[item] = {
+                particle_species: (
+                    indices[species_index == i] - lengths[i]
+                ).tolist()
+                for i, particle_species in enumerate(self.species)
+            }
 
         return particle_groups
 
@@ -371,63 +340,71 @@ def build_smiles_graph(smiles_string: str) -> tuple:
     return mol, species
 
 
-def _apply_system_cutoff(input_tensor: tf.Tensor, cutoff: float) -> tf.Tensor:
+def get_bonded_pairs(positions: np.ndarray, box, cutoff: float) -> np.ndarray:
     """
-    Enforce a cutoff on a tensor.
+    Find all pairs of atoms closer than a cutoff in a single configuration.
 
-    In this context the cutoff is used to identify bonded atoms. We argue
-    that the closest atoms will be bonded as defined by a cutoff.
-    Constructing the mask of closest atoms will allow for the bonded ones to be
-    identified.
+    A cell list is used if the box holds at least three cells along every axis.
+    Otherwise, the distances are computed for blocks of atoms such that the full
+    distance matrix is never stored.
 
     Parameters
     ----------
-    input_tensor : tf.Tensor
-            Tensor of any size or shape to be masked. In our case it is a distance
-            tensor of the atoms in a configuration.
+    positions : np.ndarray
+            Positions of the atoms with the shape (n_atoms, 3).
+    box : list
+            Edge lengths of the box. If given, minimum image convention is applied.
     cutoff : float
-            Cutoff to use in the mask. If a distance is greater than this cutoff it
-            is marked as 0, if not, it is 1.
+            Atoms closer than the cutoff are bonded.
 
     Returns
     -------
-    masked_tensor : tf.Tensor
-            A tensor of ones and zeros where 1s corresponded to 'bonded' particles
-            and 0s indicated no bonding. Note, the diagonals of this tensor are
-            set to 0 as a particle cannot bond itself.
+    bonds : np.ndarray
+            Atom indices of the bonds with the shape (2, n_bonds). Every bond is
+            returned once with bonds[0] < bonds[1].
     """
-    cutoff_mask = tf.cast(
-        tf.less(input_tensor, cutoff), dtype=tf.int16
-    )  # Construct the mask
-
-    return tf.linalg.set_diag(cutoff_mask, np.zeros(len(input_tensor)))
-
-
-def get_neighbour_list(positions: tf.Tensor, cell: list = None) -> tf.Tensor:
+    if box is not None:
+        box = np.asarray(box, dtype=positions.dtype)
+    if cell_list_applicable(box, cutoff):
+        return get_cell_list_pairs(positions, box, cutoff)[0]
+
+    n_atoms = len(positions)
+    block_size = max(1, 2**21 // max(n_atoms, 1))
+    bonds = [np.zeros((2, 0), dtype=np.int64)]
+    for start in range(0, n_atoms, block_size):
+        r_ij = positions[None, :, :] - positions[start : start + block_size, None, :]
+        if box is not None:
+            r_ij -= np.rint(r_ij / box) * box
+        i, j = np.nonzero(np.linalg.norm(r_ij, axis=-1) < cutoff)
+        i += start
+        mask = i < j
+        bonds.append(np.stack([i[mask], j[mask]]))
+
+    return np.concatenate(bonds, axis=1)
+
+
+def get_connected_components(
+    adjacency_matrix: scipy.sparse.spmatrix, min_size: int = 1
+) -> dict:
     """
-    Generate the neighbour list.
+    Decompose a graph into its connected components.
 
     Parameters
     ----------
-    positions: tf.Tensor
-        Tensor with shape (number_of_configurations, n_atoms, 3)
-        representing the coordinates
-    cell: list
-        If periodic boundary conditions are used, please supply the cell
-        dimensions, e.g. [13.97, 13.97, 13.97]. If the cell is provided
-        minimum image convention will be applied!
+    adjacency_matrix : scipy.sparse.spmatrix
+            Symmetric adjacency matrix of the graph.
+    min_size : int
+            Components with fewer nodes are dropped.
 
     Returns
     -------
-    neighbour_list : tf.Tensor
-            Neighbour list for a single configuration.
-
+    components : dict
+            The nodes of each component, numbered in the order of their smallest
+            node, e.g. {0: np.array([0, 4, 5]), 1: np.array([1, 2, 3])}
     """
-    r_ij_matrix = tf.reshape(positions, (1, len(positions), 3)) - tf.reshape(
-        positions, (len(positions), 1, 3)
-    )
-
-    # Pretty sure we never need min image for mapping.
-    if cell:
-        r_ij_matrix -= tf.math.rint(r_ij_matrix / cell) * cell
-    return tf.norm(r_ij_matrix, ord="euclidean", axis=2)
+    _, labels = connected_components(adjacency_matrix, directed=False)
+    order = np.argsort(labels, kind="stable")
+    components = np.split(order, np.cumsum(np.bincount(labels))[:-1])
+    components = [item for item in components if len(item) >= min_size]
+    # scipy labels the components in the order of their smallest node
+    return dict(enumerate(components))
@@ -24,6 +24,7 @@ If you use this module please cite us with:
 Summary
 -------
 """
-from .memory_manager import MemoryManager
+from .memory_budget import MemoryBudget, memory_budget
+from .memory_manager import MemoryManager, MemoryProbe
 
-__all__ = ["MemoryManager"]
+__all__ = ["MemoryBudget", "memory_budget", "MemoryManager", "MemoryProbe"]
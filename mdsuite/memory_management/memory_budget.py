@@ -0,0 +1,114 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Process-wide account of the memory reserved by running operations.
+"""
+import itertools
+import threading
+
+from mdsuite.utils.meta_functions import get_available_memory
+
+
+class MemoryBudget:
+    """
+    Memory shared by all calculators and transformations of a process.
+
+    Each memory manager reserves the memory of the batches it plans and releases it
+    once the operation is done. Operations running at the same time, e.g. in
+    threads, therefore plan their batches with the memory that is not reserved by
+    the others instead of each assuming that it owns the machine.
+
+    The total memory is resolved with get_available_memory whenever no memory is
+    reserved, such that memory used outside of MDSuite is taken into account.
+
+    Attributes
+    ----------
+    total : float
+            Memory in bytes available to the process when the first of the current
+            reservations was made.
+    """
+
+    def __init__(self):
+        """Constructor for the memory budget."""
+        self.total: float = None
+        self._reservations = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def reserved(self) -> float:
+        """Memory in bytes reserved by running operations."""
+        with self._lock:
+            return sum(self._reservations.values())
+
+    @property
+    def free(self) -> float:
+        """Memory in bytes that can be reserved."""
+        with self._lock:
+            self._update_total()
+            return max(self.total - sum(self._reservations.values()), 0.0)
+
+    def _update_total(self):
+        """Resolve the total memory if nothing is reserved."""
+        if len(self._reservations) == 0 or self.total is None:
+            self.total = get_available_memory()
+
+    def reserve(self, memory: float) -> int:
+        """
+        Reserve memory for an operation.
+
+        Parameters
+        ----------
+        memory : float
+                Memory in bytes to reserve. The reservation is recorded even if it
+                exceeds the free memory, the budget only informs the planning.
+
+        Returns
+        -------
+        token : int
+                Identifier of the reservation to be passed to release.
+        """
+        with self._lock:
+            self._update_total()
+            token = next(self._tokens)
+            self._reservations[token] = float(memory)
+
+        return token
+
+    def release(self, token: int):
+        """
+        Release a reservation.
+
+        Parameters
+        ----------
+        token : int
+                Identifier returned by reserve. Releasing a reservation twice has
+                no effect.
+        """
+        with self._lock:
+            self._reservations.pop(token, None)
+
+
+memory_budget = MemoryBudget()
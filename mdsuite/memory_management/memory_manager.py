@@ -25,12 +25,19 @@ Summary
 -------
 """
 import logging
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
 from typing import Tuple
 
 import numpy as np
+import psutil
 import tensorflow as tf
 
 from mdsuite.database.simulation_database import Database
+from mdsuite.memory_management.memory_budget import memory_budget
 from mdsuite.utils import config
 from mdsuite.utils.meta_functions import get_machine_properties, gpu_available
 from mdsuite.utils.scale_functions import (
@@ -40,6 +47,11 @@ from mdsuite.utils.scale_functions import (
     quadratic_scale_function,
 )
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 log = logging.getLogger(__name__)
 
 
@@ -56,6 +68,10 @@ class MemoryManager:
     The class can work with several tensor_values-sets in the case an analysis requires
     this much tensor_values.
 
+    The memory of the planned batches is reserved from the process-wide memory
+    budget until release is called or the manager is garbage collected, such that
+    operations running at the same time share the available memory.
+
     Attributes
     ----------
     data_path : list
@@ -63,6 +79,8 @@ class MemoryManager:
     parallel : bool
     memory_fraction : float
     scale_function : dict
+    memory_overhead : float
+            Memory in bytes used by an operation independent of the batch size.
     gpu : bool
     """
 
@@ -75,6 +93,7 @@ class MemoryManager:
         scale_function: dict = None,
         gpu: bool = gpu_available(),
         offset: int = 0,
+        calibration: dict = None,
     ):
         """
         Constructor for the memory manager.
@@ -99,14 +118,23 @@ class MemoryManager:
                 If data is being loaded from a non-zero point in the database the
                 offset is used to take this into account. For example, expanding a
                 transformation.
+        calibration : dict
+                Measured memory scaling of the operation as returned by
+                fit_calibration. If given, it replaces the scale function.
         """
         if scale_function is None:
             scale_function = {"linear": {"scale_factor": 10}}
+        self.memory_overhead = 0.0
+        if calibration is not None:
+            scale_function = calibration["scale_function"]
+            self.memory_overhead = calibration["overhead"]
         self.data_path = data_path
         self.parallel = parallel
         self.database = database
         self.memory_fraction = config.memory_fraction
         self.offset = offset
+        self.gpu = gpu
+        self._reservation = None
 
         self.machine_properties = get_machine_properties()
         if gpu:
@@ -176,13 +204,97 @@ class MemoryManager:
 
         return scale_function, scale_function_parameters
 
-    def get_batch_size(self) -> tuple:
+    @staticmethod
+    def fit_calibration(
+        batch_sizes: list,
+        peak_memory: list,
+        durations: list,
+        per_configuration_memory: float,
+    ) -> dict:
+        """
+        Fit the memory scaling of an operation to measurements on probe batches.
+
+        The memory is modelled as an overhead plus a linear scale function of the
+        raw memory of the loaded configurations. The line is shifted such that it
+        bounds all measurements from above.
+
+        Parameters
+        ----------
+        batch_sizes : list
+                Number of configurations of each probe batch.
+        peak_memory : list
+                Peak memory in bytes measured for each probe batch.
+        durations : list
+                Time in seconds of the operation on each probe batch.
+        per_configuration_memory : float
+                Raw memory in bytes of a single configuration of the loaded data.
+
+        Returns
+        -------
+        calibration : dict
+                e.g. {"scale_function": {"linear": {"scale_factor": 12.3}},
+                "overhead": 1e6, "frame_time": 1e-4}
+        """
+        batch_sizes = np.asarray(batch_sizes, dtype=float)
+        peak_memory = np.asarray(peak_memory, dtype=float)
+        if len(np.unique(batch_sizes)) > 1:
+            slope = np.polyfit(batch_sizes, peak_memory, 1)[0]
+        else:
+            slope = np.max(peak_memory / batch_sizes)
+        # the loaded configurations themselves have to fit into memory
+        slope = max(slope, per_configuration_memory)
+        overhead = max(np.max(peak_memory - slope * batch_sizes), 0.0)
+
+        return {
+            "scale_function": {
+                "linear": {"scale_factor": float(slope / per_configuration_memory)}
+            },
+            "overhead": float(overhead),
+            "frame_time": float(np.sum(durations) / np.sum(batch_sizes)),
+        }
+
+    @property
+    def available_memory(self) -> float:
+        """Memory in bytes which can be used for the loaded configurations."""
+        memory = self.machine_properties["memory"]
+        if not self.gpu:
+            memory = min(memory, memory_budget.free)
+        return max(self.memory_fraction * memory - self.memory_overhead, 0.0)
+
+    def reserve(self, memory: float):
+        """
+        Reserve memory from the process-wide memory budget.
+
+        Parameters
+        ----------
+        memory : float
+                Memory in bytes replacing the previous reservation of this manager.
+        """
+        self.release()
+        if self.gpu:
+            return
+        token = memory_budget.reserve(memory)
+        self._reservation = weakref.finalize(self, memory_budget.release, token)
+
+    def release(self):
+        """Release the memory reserved by this manager."""
+        if self._reservation is not None:
+            self._reservation()
+            self._reservation = None
+
+    def get_batch_size(self, batch_size: int = None) -> tuple:
         """
         Calculate the batch size of an operation.
 
         This method takes the tensor_values requirements of an operation and returns
         how big each batch of tensor_values should be for such an operation.
 
+        Parameters
+        ----------
+        batch_size : int
+                If given, this batch size is used instead of the memory estimate,
+                e.g. to share batches between the calculators of a pipeline.
+
         Returns
         -------
         batch_size : int
@@ -195,6 +307,8 @@ class MemoryManager:
         """
         if self.data_path is None:
             raise ValueError("No tensor_values have been requested.")
+        # plan with the memory of other operations, not with the own batches
+        self.release()
         per_configuration_memory: float = 0.0
         for item in self.data_path:
             n_particles, n_configs, n_bytes = self.database.get_data_size(item)
@@ -204,14 +318,24 @@ class MemoryManager:
         )
         maximum_loaded_configurations = int(
             np.clip(
-                (self.memory_fraction * self.machine_properties["memory"])
-                / per_configuration_memory,
+                self.available_memory / per_configuration_memory,
                 1,
                 n_configs - self.offset,
             )
         )
-        batch_size = self._get_optimal_batch_size(maximum_loaded_configurations)
+        # Only align split batches with the chunks, data that fits is loaded at once.
+        if maximum_loaded_configurations < n_configs - self.offset:
+            chunk_configurations = self._get_chunk_configurations()
+        else:
+            chunk_configurations = None
+        if batch_size is None:
+            batch_size = self._get_optimal_batch_size(
+                maximum_loaded_configurations, chunk_configurations
+            )
+        else:
+            batch_size = int(np.clip(batch_size, 1, n_configs - self.offset))
         number_of_batches, remainder = divmod((n_configs - self.offset), batch_size)
+        self.reserve(self.memory_overhead + batch_size * per_configuration_memory)
         self.batch_size = batch_size
         self.n_batches = number_of_batches
         self.remainder = remainder
@@ -235,8 +359,26 @@ class MemoryManager:
         """
         return np.log(n)
 
+    def _get_chunk_configurations(self):
+        """
+        Get the number of configurations per chunk of the database.
+
+        Returns
+        -------
+        chunk_configurations : int
+                Configurations per chunk or None if the database does not record
+                its storage layout.
+        """
+        get_storage_layout = getattr(self.database, "get_storage_layout", None)
+        if get_storage_layout is None:
+            return None
+        layout = get_storage_layout()
+        if layout is None:
+            return None
+        return layout.chunk_configurations
+
     @staticmethod
-    def _get_optimal_batch_size(naive_size):
+    def _get_optimal_batch_size(naive_size, chunk_configurations: int = None):
         """
         Use the open/close and read speeds of the hdf5 database_path as well as the
         operation being performed to get an optimal batch size.
@@ -245,6 +387,10 @@ class MemoryManager:
         ----------
         naive_size : int
                 Naive batch size to be optimized
+        chunk_configurations : int, optional
+                Configurations per chunk of the database. If the naive size spans
+                at least one chunk, it is rounded down to a multiple of the chunk
+                size such that batches do not share chunks.
 
         Returns
         -------
@@ -252,7 +398,9 @@ class MemoryManager:
                 An optimized batch size
         """
         # db_io_time = self.database.get_load_time()
-        return naive_size
+        if chunk_configurations is None or naive_size < chunk_configurations:
+            return naive_size
+        return naive_size - naive_size % chunk_configurations
 
     def _compute_atomwise_minibatch(self, data_range: int):
         """
@@ -277,6 +425,7 @@ class MemoryManager:
             self.atom_remainder : int
                     Remainder atoms after even batching.
         """
+        self.release()
         per_atom_memory = 0  # memory usage per atom within ONE configuration
         per_configuration_memory = 0  # per configuration memory usage
         total_rows = 0
@@ -305,9 +454,7 @@ class MemoryManager:
                 )
                 batch_size = int(
                     np.clip(
-                        self.memory_fraction
-                        * self.machine_properties["memory"]
-                        / per_atom_memory,
+                        self.available_memory / per_atom_memory,
                         1,
                         n_configs,
                     )
@@ -318,9 +465,7 @@ class MemoryManager:
             atom_batch_memory = fraction * per_atom_memory
             batch_size = int(
                 np.clip(
-                    self.memory_fraction
-                    * self.machine_properties["memory"]
-                    / atom_batch_memory,
+                    self.available_memory / atom_batch_memory,
                     1,
                     n_configs,
                 )
@@ -333,6 +478,9 @@ class MemoryManager:
                 )  # Set the mini batch size to total_data_points * fraction
                 break
 
+        self.reserve(
+            self.memory_overhead + batch_size * self.atom_batch_size * per_atom_memory
+        )
         self.batch_size = batch_size
         self.n_batches = int(n_configs / batch_size)
         self.remainder = int(n_configs % batch_size)
@@ -370,3 +518,148 @@ class MemoryManager:
 
         else:
             return int(np.clip(final_window / correlation_time, 1, None)), False
+
+    def get_ensemble_block_size(self, data_range: int, correlation_time: int = 1) -> int:
+        """
+        Get the number of time origins that are processed together.
+
+        The ensemble loop operates on blocks of time-origin windows. The batch size
+        already accounts for the memory scaling of the operation, so a block is
+        limited such that its windows hold as many configurations as the batch.
+
+        Parameters
+        ----------
+        data_range : int
+                Number of configurations in each window.
+        correlation_time : int
+                Number of configurations between two time origins.
+
+        Returns
+        -------
+        block_size : int
+                Number of time origins in each block, at least one and at most the
+                number of time origins in a batch.
+        """
+        n_origins = max((self.batch_size - data_range) // correlation_time + 1, 1)
+
+        return int(np.clip(self.batch_size // data_range, 1, n_origins))
+
+
+class MemoryProbe:
+    """
+    Context manager measuring the peak memory and duration of an operation.
+
+    The peak memory is the largest of the memory traced by the Python allocator,
+    which includes numpy arrays, the growth of the peak resident set size of the
+    process and, if a GPU is used, the peak of the TensorFlow GPU allocator.
+
+    tracemalloc does not see the buffers TensorFlow allocates on the CPU, these
+    are only covered by the resident set size. Its peak is taken from the high
+    water mark of the process if the operation raises it and otherwise sampled
+    in a background thread, so buffers that are allocated and freed within the
+    context are counted as well.
+
+    Attributes
+    ----------
+    peak_memory : float
+            Peak memory in bytes allocated within the context.
+    duration : float
+            Time in seconds spent within the context.
+
+    Examples
+    --------
+    with MemoryProbe() as probe:
+        operation(batch)
+    print(probe.peak_memory, probe.duration)
+    """
+
+    sample_interval = 1e-3
+
+    def __init__(self, gpu: bool = False):
+        """
+        Constructor for the memory probe.
+
+        Parameters
+        ----------
+        gpu : bool
+                If true, the TensorFlow GPU allocator is measured as well.
+        """
+        self.gpu = gpu
+        self.peak_memory = 0.0
+        self.duration = 0.0
+        self._tracing = False
+        self._traced = 0
+        self._rss = 0
+        self._max_rss = 0
+        self._sampled_rss = 0
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._start = 0.0
+
+    def _sample_rss(self):
+        """Record the largest resident set size until the measurement stops."""
+        process = psutil.Process()
+        while True:
+            self._sampled_rss = max(self._sampled_rss, process.memory_info().rss)
+            if self._stop_sampling.wait(self.sample_interval):
+                return
+
+    def __enter__(self) -> "MemoryProbe":
+        """Start the measurement."""
+        self._tracing = tracemalloc.is_tracing()
+        if self._tracing:
+            # the peak cannot be reset before Python 3.9
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        else:
+            tracemalloc.start()
+            self._traced = 0
+        if self.gpu:
+            tf.config.experimental.reset_memory_stats("GPU:0")
+        self._rss = psutil.Process().memory_info().rss
+        self._max_rss = _get_max_rss()
+        self._sampled_rss = self._rss
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
+        self._start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *args):
+        """Stop the measurement."""
+        self.duration = time.perf_counter() - self._start
+        self._stop_sampling.set()
+        self._sampler.join()
+        peak_rss = self._sampled_rss
+        max_rss = _get_max_rss()
+        if max_rss > self._max_rss:
+            # the high water mark of the process was raised within the context
+            peak_rss = max(peak_rss, max_rss)
+        peak_memory = [
+            tracemalloc.get_traced_memory()[1] - self._traced,
+            peak_rss - self._rss,
+        ]
+        if not self._tracing:
+            tracemalloc.stop()
+        if self.gpu:
+            peak_memory.append(tf.config.experimental.get_memory_info("GPU:0")["peak"])
+        self.peak_memory = float(max(peak_memory))
+
+
+def _get_max_rss() -> int:
+    """
+    Get the peak resident set size of the process.
+
+    Returns
+    -------
+    max_rss : int
+            Peak resident set size in bytes or 0 if it is not available on the
+            platform.
+    """
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in kilobytes except on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
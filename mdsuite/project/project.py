@@ -34,6 +34,7 @@ from dot4dict import dotdict
 import mdsuite.database.scheme as db
 import mdsuite.file_io.file_read
 from mdsuite.database.project_database import ProjectDatabase
+from mdsuite.database.simulation_database import StorageLayout
 from mdsuite.experiment import Experiment
 from mdsuite.experiment.run import RunComputation
 from mdsuite.utils import Units
@@ -166,6 +167,7 @@ class Project(ProjectDatabase):
             str, pathlib.Path, mdsuite.file_io.file_read.FileProcessor, list
         ] = None,  # TODO make this the second argument, (name, data, ...)
         update_with_pubchempy: bool = False,
+        storage_layout: StorageLayout = None,
     ) -> Experiment:
         """Add an experiment to the project.
 
@@ -191,6 +193,9 @@ class Project(ProjectDatabase):
             later
         update_with_pubchempy : bool (default=False)
                 Passed to the add data method.
+        storage_layout : StorageLayout, optional
+                Chunking and compression of the simulation database of the
+                experiment, see mdsuite.database.simulation_database.StorageLayout.
 
         Notes
         -----
@@ -230,6 +235,7 @@ class Project(ProjectDatabase):
             temperature=temperature,
             units=units,
             cluster_mode=cluster_mode,
+            storage_layout=storage_layout,
         )
 
         new_experiment.active = active
@@ -25,13 +25,14 @@ Summary
 -------
 """
 import logging
-from typing import List
+from typing import List, Union
 
 import numpy as np
 import tensorflow as tf
 from tqdm import tqdm
 
 from mdsuite.database.mdsuite_properties import mdsuite_properties
+from mdsuite.database.simulation_database import MoleculeGroups
 from mdsuite.graph_modules.molecular_graph import MolecularGraph
 from mdsuite.transformations.transformations import Transformations
 from mdsuite.utils.meta_functions import join_path
@@ -94,11 +95,11 @@ class MolecularMap(Transformations):
         self.database.add_dataset(
             dataset_structure
         )  # add a new dataset to the database_path
-        # data_structure = {path: {"indices": np.s_[:], "columns": [0, 1, 2]}}
         data_structure = {
             path: {
-                "indices": list(range(number_of_molecules)),
+                "indices": np.s_[:],
                 "columns": [0, 1, 2],
+                "length": number_of_molecules,
             }
         }
 
@@ -223,41 +224,85 @@ class MolecularMap(Transformations):
         )
         data_set = data_set.prefetch(tf.data.experimental.AUTOTUNE)
 
+        species_offsets = np.cumsum(
+            [0]
+            + [
+                self.experiment.species[item].n_particles
+                for item in molecular_graph.species
+            ]
+        )
+        atom_indices, segment_ids, weights = self._get_molecule_segments(
+            molecular_graph.molecular_groups,
+            dict(zip(molecular_graph.species, species_offsets)),
+            mass_dictionary,
+        )
+        weights = tf.convert_to_tensor(weights[:, None, None], dtype=self.dtype)
+
         log.info(f"Mapping molecule graphs onto trajectory for {molecule_name}")
         for i, batch in tqdm(enumerate(data_set), ncols=70, total=self.n_batches):
-            batch_size = batch[b"data_size"]
-
-            trajectory = np.zeros(
-                shape=(
-                    molecular_graph.n_molecules,
-                    batch_size,
-                    3,
-                )
+            # all atoms of the molecule species in one tensor, species after species
+            atom_trajectories = tf.concat(
+                [batch[str.encode(item)] for item in path_list], axis=0
+            )
+            # Compute the COM trajectory
+            trajectory = tf.math.unsorted_segment_sum(
+                tf.gather(atom_trajectories, atom_indices) * weights,
+                segment_ids,
+                num_segments=molecular_graph.n_molecules,
             )
-
-            for t, molecule in enumerate(molecular_graph.molecular_groups):
-                # Load species molecule-specific particles into a separate dict
-                # and apply their respective scaling factor.
-                molecule_trajectory = np.zeros((batch_size, 3))
-                for item in molecular_graph.molecular_groups[molecule]:
-                    batch_reference = str.encode(f"{item}/{self.mapping_property.name}")
-                    particles = molecular_graph.molecular_groups[molecule][item]
-                    particle_trajectories = (
-                        tf.gather(batch[batch_reference], particles)
-                        * mass_dictionary[item]
-                    )
-                    molecule_trajectory += tf.reduce_sum(particle_trajectories, axis=0)
-
-                # Compute the COM trajectory
-                trajectory[t] = molecule_trajectory
 
             self._save_output(
-                data=trajectory,
+                data=trajectory.numpy(),
                 data_structure=data_structure,
                 index=i * self.batch_size,
             )
 
-            self.experiment.molecules = molecules
+        self.experiment.molecules = molecules
+
+    @staticmethod
+    def _get_molecule_segments(
+        molecular_groups: Union[dict, MoleculeGroups],
+        species_offsets: dict,
+        mass_dictionary: dict,
+    ) -> tuple:
+        """
+        Flatten the molecule groups for a segment sum over the atoms.
+
+        Parameters
+        ----------
+        molecular_groups : dict or MoleculeGroups
+                The atoms of each molecule, e.g. {"0": {"H": [0, 1], "O": [0]}}
+        species_offsets : dict
+                Index of the first atom of each species in the concatenated atoms
+                of all species, e.g. {"H": 0, "O": 40}.
+        mass_dictionary : dict
+                Reduced mass of each species, see _get_reduced_mass_dict.
+
+        Returns
+        -------
+        atom_indices : np.ndarray
+                Index of each atom in the concatenated atoms.
+        segment_ids : np.ndarray
+                Index of the molecule each atom belongs to.
+        weights : np.ndarray
+                Reduced mass of each atom.
+        """
+        if not isinstance(molecular_groups, MoleculeGroups):
+            molecular_groups = MoleculeGroups.from_dict(molecular_groups)
+        atom_indices, segment_ids, weights = [], [], []
+        for item in molecular_groups.species:
+            particles, molecules = molecular_groups.particles(item)
+            atom_indices.append(species_offsets[item] + particles)
+            segment_ids.append(molecules)
+            weights.append(np.full(len(particles), mass_dictionary[item]))
+        # atoms ordered by molecule
+        order = np.argsort(np.concatenate(segment_ids), kind="stable")
+
+        return (
+            np.concatenate(atom_indices).astype(np.int64)[order],
+            np.concatenate(segment_ids).astype(np.int64)[order],
+            np.concatenate(weights).astype(np.float64)[order],
+        )
 
     def run_transformation(self, molecules: List[Molecule]):
         """
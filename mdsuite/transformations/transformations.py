@@ -517,6 +517,7 @@ class SingleSpeciesTrafo(Transformations):
                     data_structure=output_data_structure,
                     index=index * self.batch_size,
                 )
+            self.memory_manager.release()
 
     @abc.abstractmethod
     def transform_batch(
@@ -617,6 +618,7 @@ class MultiSpeciesTrafo(Transformations):
                 data_structure=output_data_structure,
                 index=index * self.batch_size,
             )
+        self.memory_manager.release()
 
     @abc.abstractmethod
     def transform_batch(
@@ -31,19 +31,101 @@ from typing import Any, Iterable, Tuple, Union
 import jax
 import jax.numpy as jnp
 import numpy as np
+import scipy.fft
 from numpy import ndarray
 from scipy.interpolate import UnivariateSpline
-from scipy.optimize import curve_fit
+
+from mdsuite.utils import config
 
 log = logging.getLogger(__name__)
 
 
+def running_linear_regression(
+    x_data: np.ndarray, y_data: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Least-squares fit of a line to every prefix of the data in one pass.
+
+    The fits use cumulative sums of the data, shifted by its first point so that
+    the sums do not lose precision. The covariance is the one returned by
+    scipy.optimize.curve_fit, i.e. scaled by the residual variance.
+
+    Parameters
+    ----------
+    x_data : np.ndarray (n_points,)
+            x data to use in the fitting.
+    y_data : np.ndarray (n_points,)
+            y data to use in the fitting.
+
+    Returns
+    -------
+    slopes : np.ndarray (n_points - 1,)
+            Gradient of the fit to the first n points, starting at n = 2.
+    intercepts : np.ndarray (n_points - 1,)
+            y-intercept of the fit to the first n points.
+    covariances : np.ndarray (n_points - 1, 2, 2)
+            Covariance matrix of (slope, intercept) of each fit. It is infinite for
+            two points, where the residual variance is undefined.
+    """
+    x_data = np.asarray(x_data, dtype=np.float64)
+    y_data = np.asarray(y_data, dtype=np.float64)
+    x_0, y_0 = x_data[0], y_data[0]
+    x_shifted = x_data - x_0
+    y_shifted = y_data - y_0
+
+    n_points = np.arange(1, len(x_data) + 1, dtype=np.float64)[1:]
+    sum_x = np.cumsum(x_shifted)[1:]
+    sum_y = np.cumsum(y_shifted)[1:]
+    sum_xx = np.cumsum(x_shifted**2)[1:]
+    sum_xy = np.cumsum(x_shifted * y_shifted)[1:]
+    sum_yy = np.cumsum(y_shifted**2)[1:]
+
+    centred_xx = sum_xx - sum_x**2 / n_points
+    centred_xy = sum_xy - sum_x * sum_y / n_points
+    centred_yy = sum_yy - sum_y**2 / n_points
+
+    slopes = centred_xy / centred_xx
+    shifted_intercepts = (sum_y - slopes * sum_x) / n_points
+
+    intercepts = shifted_intercepts + y_0 - slopes * x_0
+
+    # the residual variance is undefined for two points, the covariance is inf
+    with np.errstate(divide="ignore", invalid="ignore"):
+        residual_variance = np.maximum(centred_yy - slopes * centred_xy, 0.0) / (
+            n_points - 2
+        )
+
+        # inverse of [[sum_xx, sum_x], [sum_x, n]] in the shifted coordinates
+        determinant = n_points * centred_xx
+        var_slope = residual_variance * n_points / determinant
+        var_intercept = residual_variance * sum_xx / determinant
+        cov_slope_intercept = -residual_variance * sum_x / determinant
+
+        # move the intercept from x = x_0 back to x = 0
+        cov_slope_intercept = cov_slope_intercept - x_0 * var_slope
+        var_intercept = (
+            var_intercept - 2 * x_0 * cov_slope_intercept - x_0**2 * var_slope
+        )
+
+    covariances = np.empty((len(slopes), 2, 2))
+    covariances[:, 0, 0] = var_slope
+    covariances[:, 0, 1] = cov_slope_intercept
+    covariances[:, 1, 0] = cov_slope_intercept
+    covariances[:, 1, 1] = var_intercept
+    covariances[n_points == 2] = np.inf
+
+    return slopes, intercepts, covariances
+
+
 def fit_einstein_curve(
     x_data: np.ndarray, y_data: np.ndarray, fit_max_index: int
 ) -> Tuple[Union[ndarray, Iterable, int, float], Any, list, list]:
     """
     Fit operation for Einstein calculations.
 
+    A line is fitted from the start of the linear regime to every later point with
+    running_linear_regression.
+
     Parameters
     ----------
     x_data : np.ndarray
@@ -64,45 +146,24 @@ def fit_einstein_curve(
     popt = []
     pcov = []
 
-    def func(x, m, a):
-        """
-        Standard linear function for fitting.
-
-        Parameters
-        ----------
-        x : list/np.array
-                x axis tensor_values for the fit
-        m : float
-                gradient of the line
-        a : float
-                scalar offset, also the y-intercept for those who did not
-                get much maths in school.
-
-        Returns
-        -------
-        m * x + a
-        """
-        return m * x + a
-
     spline_data = UnivariateSpline(x_data, y_data, s=0, k=4)
 
     derivatives = spline_data.derivative(n=2)(x_data)
 
     derivatives[abs(derivatives) < 1e-5] = 0
     start_index = np.argmin(abs(derivatives))
-    gradients = []
-    gradient_errors = []
 
-    for i in range(start_index + 2, len(y_data)):
-        popt_temp, pcov_temp = curve_fit(
-            func, xdata=x_data[start_index:i], ydata=y_data[start_index:i]
-        )
-        gradients.append(popt_temp[0])
-        gradient_errors.append(np.sqrt(np.diag(pcov_temp))[0])
+    # The fits cover x_data[start_index:i] for i in [start_index + 2, len(y_data)).
+    slopes, intercepts, covariances = running_linear_regression(
+        x_data[start_index:-1], y_data[start_index:-1]
+    )
+    gradients = slopes.tolist()
+    gradient_errors = np.sqrt(covariances[:, 0, 0]).tolist()
 
-        if i == fit_max_index:
-            popt = popt_temp
-            pcov = pcov_temp
+    fit_index = fit_max_index - start_index - 2
+    if start_index + 2 <= fit_max_index < len(y_data):
+        popt = np.array([slopes[fit_index], intercepts[fit_index]])
+        pcov = covariances[fit_index]
 
     return popt, pcov, gradients, gradient_errors
 
@@ -182,3 +243,169 @@ def msd_operation(ds_a, ds_b) -> np.ndarray:
     difference_vmap = jax.vmap(_difference_op, in_axes=-1)
 
     return np.mean(difference_vmap(ds_a, ds_b), axis=0)
+
+
+def fft_correlate(
+    ds_a: np.ndarray,
+    ds_b: np.ndarray = None,
+    max_lag: int = None,
+    normalize: bool = False,
+    memory_limit: int = None,
+) -> np.ndarray:
+    """
+    Compute time-origin averaged correlation functions with zero-padded real FFTs.
+
+    For each particle the correlation c(m) = sum_t a(t) . b(t + m) is computed over
+    every time origin t in the data and summed over the spatial dimension. The
+    particles are transformed in chunks so that the FFT buffers stay below the
+    memory limit.
+
+    Parameters
+    ----------
+    ds_a : np.ndarray (n_particles, n_configurations, dimension)
+            Data of the first signal.
+    ds_b : np.ndarray (n_particles, n_configurations, dimension)
+            Data of the second signal, correlated row by row with ds_a. A single
+            row (n_particles = 1) is correlated with every particle of ds_a and
+            transformed only once. If None, the auto-correlation of ds_a is computed.
+    max_lag : int
+            Number of lags to compute, starting at a lag of zero. Defaults to the
+            number of configurations. Lags that do not fit in the data are zero.
+    normalize : bool
+            If true, the sums are divided by the number of time origins of each lag,
+            otherwise the sums over the time origins are returned.
+    memory_limit : int
+            Upper bound in bytes for the FFT buffers. Defaults to
+            config.correlation_memory_limit.
+
+    Returns
+    -------
+    correlation : np.ndarray (n_particles, max_lag)
+            Correlation function of each particle, summed over the dimension.
+    """
+    if memory_limit is None:
+        memory_limit = config.correlation_memory_limit
+    n_particles, n_configurations, dimension = np.shape(ds_a)
+    if max_lag is None:
+        max_lag = n_configurations
+    n_lags = min(max_lag, n_configurations)
+
+    # Zero padding to at least 2N - 1 removes the circular wrap-around.
+    fft_size = scipy.fft.next_fast_len(2 * n_configurations - 1, real=True)
+    n_signals = 1 if ds_b is None else 2
+    particle_memory = (fft_size // 2 + 1) * dimension * 16 * (n_signals + 1)
+    chunk_size = max(1, min(memory_limit // particle_memory, n_particles))
+
+    shared_b = ds_b is not None and len(ds_b) == 1
+    if shared_b:
+        transform_b = scipy.fft.rfft(ds_b, n=fft_size, axis=1)
+
+    correlation = np.zeros((n_particles, max_lag))
+    for start in range(0, n_particles, chunk_size):
+        stop = start + chunk_size
+        transform_a = scipy.fft.rfft(ds_a[start:stop], n=fft_size, axis=1)
+        if ds_b is None:
+            transform_b = transform_a
+        elif not shared_b:
+            transform_b = scipy.fft.rfft(ds_b[start:stop], n=fft_size, axis=1)
+        product = np.sum(transform_a.conj() * transform_b, axis=-1)
+        correlation[start:stop, :n_lags] = scipy.fft.irfft(product, n=fft_size, axis=1)[
+            :, :n_lags
+        ]
+
+    if normalize:
+        correlation[:, :n_lags] /= n_configurations - np.arange(n_lags)
+
+    return correlation
+
+
+def msd_fft(data: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Compute the time-origin summed MSD of a set of trajectories using FFTs.
+
+    The mean square displacement at lag m is decomposed as S1(m) - 2 S2(m), where
+    S2 is the position auto-correlation computed with fft_correlate and S1 is built
+    from cumulative sums of the squared positions. All time origins in the data are
+    used.
+
+    Parameters
+    ----------
+    data : np.ndarray (n_particles, n_configurations, dimension)
+            Unwrapped trajectories of the particles.
+    max_lag : int
+            Number of lags to compute, starting at a lag of zero.
+
+    Returns
+    -------
+    msd : np.ndarray (max_lag,)
+            Squared displacements summed over particles, dimensions and all time
+            origins available for each lag. Lags that do not fit in the data are
+            zero. Divide by n_particles * (n_configurations - lag) for the average.
+    """
+    n_particles, n_configurations, _ = data.shape
+    n_lags = min(max_lag, n_configurations)
+
+    # The MSD is translation invariant, centering avoids cancellation errors.
+    data = data - np.mean(data, axis=1, keepdims=True)
+    s2 = np.sum(fft_correlate(data, max_lag=n_lags), axis=0)
+
+    squared_norm = np.sum(data**2, axis=(0, 2))
+    cumulative = np.concatenate(([0.0], np.cumsum(squared_norm)))
+    lags = np.arange(n_lags)
+    s1 = (
+        cumulative[n_configurations - lags]
+        + cumulative[n_configurations]
+        - cumulative[lags]
+    )
+
+    msd = np.zeros(max_lag)
+    msd[:n_lags] = s1 - 2 * s2
+    # The zero lag vanishes exactly, the decomposition only leaves round-off there.
+    msd[0] = 0.0
+
+    return msd
+
+
+def lag_counts(n_configurations: int, max_lag: int) -> np.ndarray:
+    """
+    Number of time origins of each lag in a series of configurations.
+
+    Parameters
+    ----------
+    n_configurations : int
+            Number of configurations in the series.
+    max_lag : int
+            Number of lags, starting at a lag of zero.
+
+    Returns
+    -------
+    counts : np.ndarray (max_lag,)
+            Time origins of each lag, zero for lags that do not fit in the series.
+    """
+    return np.maximum(n_configurations - np.arange(max_lag), 0)
+
+
+def split_time_blocks(data: np.ndarray, block_size: int) -> np.ndarray:
+    """
+    Split a data set into non-overlapping blocks along the time axis.
+
+    The blocks are stacked along the particle axis so that they can be passed to
+    fft_correlate, e.g. to estimate uncertainties from independent time windows.
+
+    Parameters
+    ----------
+    data : np.ndarray (n_particles, n_configurations, dimension)
+            Data to split. Configurations that do not fill a block are dropped.
+    block_size : int
+            Number of configurations in each block.
+
+    Returns
+    -------
+    blocks : np.ndarray (n_particles * n_blocks, block_size, dimension)
+    """
+    n_particles, n_configurations, dimension = np.shape(data)
+    n_blocks = n_configurations // block_size
+
+    return np.reshape(
+        data[:, : n_blocks * block_size], (n_particles * n_blocks, block_size, dimension)
+    )
@@ -40,11 +40,59 @@ class Config:
             If true, jupyter is being used.
     memory_fraction: bool
             The portion of the available memory to be used.
+    memory_limit: int
+            Memory in bytes available to MDSuite. If None, the available memory is
+            resolved from the machine, the cgroup limits of containers and the
+            allocation of Slurm jobs.
+    correlation_memory_limit: int
+            Upper bound in bytes for the FFT buffers of the correlation engine.
+            Particles are transformed in chunks that stay below this limit.
+    hdf5_chunk_cache_bytes: int
+            Size in bytes of the raw data chunk cache of an open simulation database.
+    hdf5_chunk_cache_slots: int
+            Number of slots of the chunk cache hash table, should be a prime number
+            about 100 times larger than the number of chunks fitting into the cache.
+    memory_map_datasets: bool
+            If true, contiguous uncompressed datasets of the simulation database are
+            memory-mapped when they are loaded instead of read through h5py.
+    file_io_workers: int
+            Number of processes that parse tabular text trajectories in parallel.
+            If None, they are parsed in the calling process. The workers are
+            spawned and import MDSuite, so this only pays off for large files.
+    file_io_parallel_min_bytes: int
+            Files smaller than this are parsed in the calling process, because
+            starting the worker processes would take longer than reading them.
+    result_array_min_size: int
+            Numeric arrays of computation results with at least this many elements
+            are written to a binary file next to the simulation database instead
+            of the SQL database.
+    memory_calibration: bool
+            If true, trajectory calculators without a stored memory calibration for
+            the system size measure their memory usage on a few probe batches
+            before choosing the batch size.
+    sqlite_journal_mode: str
+            Journal mode of the SQL database of a project. WAL allows reading while
+            another process writes. Set it to None to keep the mode of the database,
+            e.g. on network file systems that do not support WAL.
+    sqlite_busy_timeout: float
+            Time in seconds to wait for a lock on the SQL database held by another
+            process before an error is raised.
     """
 
     jupyter: bool = False
     bokeh_sizing_mode: str = "stretch_both"
     memory_fraction: float = 0.5
+    memory_limit: int = None
+    correlation_memory_limit: int = 2**28
+    hdf5_chunk_cache_bytes: int = 2**25
+    hdf5_chunk_cache_slots: int = 10007
+    memory_map_datasets: bool = True
+    file_io_workers: int = None
+    file_io_parallel_min_bytes: int = 2**26
+    result_array_min_size: int = 64
+    memory_calibration: bool = False
+    sqlite_journal_mode: str = "WAL"
+    sqlite_busy_timeout: float = 30.0
 
 
 config = Config()
@@ -40,6 +40,7 @@ import psutil
 import tensorflow as tf
 from scipy.signal import savgol_filter
 
+from mdsuite.utils.config import config
 from mdsuite.utils.exceptions import NoGPUInSystem
 from mdsuite.utils.units import golden_ratio
 
@@ -129,6 +130,180 @@ def get_dimensionality(box: list) -> int:
     return dimensions
 
 
+def _read_cgroup_value(path: pathlib.Path) -> typing.Union[int, None]:
+    """
+    Read a memory value of a cgroup.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+            File of the cgroup file system, e.g. /sys/fs/cgroup/memory.max.
+
+    Returns
+    -------
+    value : int
+            The value in bytes or None if the file does not exist or the value is
+            unlimited.
+    """
+    try:
+        value = path.read_text().strip()
+    except OSError:
+        return None
+    # cgroup v1 reports no limit as the largest page aligned 64 bit integer
+    if value == "max" or int(value) >= 2**62:
+        return None
+    return int(value)
+
+
+def _get_cgroup_directories() -> typing.List[tuple]:
+    """
+    Get the memory cgroups of this process.
+
+    Returns
+    -------
+    directories : list
+            A (root, directory, limit file, usage file) tuple for the cgroup v2
+            hierarchy and the memory controller of cgroup v1, if they are mounted.
+    """
+    try:
+        cgroups = pathlib.Path("/proc/self/cgroup").read_text().splitlines()
+    except OSError:
+        return []
+
+    files = {
+        "v2": ("memory.max", "memory.current"),
+        "v1": ("memory.limit_in_bytes", "memory.usage_in_bytes"),
+    }
+    directories = []
+    for line in cgroups:
+        _, controllers, path = line.split(":", 2)
+        if controllers == "":
+            root, version = pathlib.Path("/sys/fs/cgroup"), "v2"
+        elif "memory" in controllers.split(","):
+            root, version = pathlib.Path("/sys/fs/cgroup/memory"), "v1"
+        else:
+            continue
+        # inside a container the cgroup of the process is mounted as the root
+        directory = root / path.lstrip("/")
+        if not directory.is_dir():
+            directory = root
+        directories.append((root, directory, *files[version]))
+
+    return directories
+
+
+def _get_cgroup_hierarchy_memory(
+    root: pathlib.Path, directory: pathlib.Path, limit_file: str, usage_file: str
+) -> typing.List[int]:
+    """
+    Get the memory available at every limited level of a cgroup hierarchy.
+
+    Parameters
+    ----------
+    root : pathlib.Path
+            Mount point of the cgroup hierarchy.
+    directory : pathlib.Path
+            Cgroup of the process within the hierarchy.
+    limit_file : str
+            Name of the file holding the memory limit of a level.
+    usage_file : str
+            Name of the file holding the memory usage of a level.
+
+    Returns
+    -------
+    available : list
+            The difference between limit and usage in bytes of each level that
+            sets a limit, from the cgroup of the process up to the root.
+    """
+    available = []
+    for level in [directory, *directory.parents]:
+        limit = _read_cgroup_value(level / limit_file)
+        usage = _read_cgroup_value(level / usage_file)
+        if limit is not None:
+            available.append(limit - (usage or 0))
+        if level == root:
+            break
+
+    return available
+
+
+def get_cgroup_memory() -> typing.Union[float, None]:
+    """
+    Get the memory available within the cgroup limits of this process.
+
+    Containers and job schedulers, e.g. Slurm with the cgroup plugin, restrict the
+    memory of a process by the cgroup it is running in. Every level of the cgroup
+    hierarchy can set a limit, the available memory is the smallest difference
+    between limit and usage. Both cgroup v2 and the memory controller of cgroup v1
+    are supported.
+
+    Returns
+    -------
+    memory : float
+            Available memory in bytes or None if the process is not limited.
+    """
+    available = []
+    for hierarchy in _get_cgroup_directories():
+        available.extend(_get_cgroup_hierarchy_memory(*hierarchy))
+
+    if len(available) == 0:
+        return None
+    return float(max(min(available), 0))
+
+
+def get_slurm_memory() -> typing.Union[float, None]:
+    """
+    Get the memory allocated to a Slurm job that is not used by this process.
+
+    Slurm exports the memory of a job in megabytes either per node or per
+    allocated CPU.
+
+    Returns
+    -------
+    memory : float
+            Available memory in bytes or None if not run within a Slurm job with a
+            memory allocation.
+    """
+    megabyte = 1024**2
+    if "SLURM_MEM_PER_NODE" in os.environ:
+        limit = int(os.environ["SLURM_MEM_PER_NODE"]) * megabyte
+    elif "SLURM_MEM_PER_CPU" in os.environ:
+        cpus = os.environ.get(
+            "SLURM_CPUS_ON_NODE", os.environ.get("SLURM_CPUS_PER_TASK", 1)
+        )
+        limit = int(os.environ["SLURM_MEM_PER_CPU"]) * int(cpus) * megabyte
+    else:
+        return None
+    # a memory of 0 requests all memory of the node
+    if limit == 0:
+        return None
+
+    return float(max(limit - psutil.Process().memory_info().rss, 0))
+
+
+def get_available_memory() -> float:
+    """
+    Get the memory available to this process.
+
+    If config.memory_limit is set, it is returned. Otherwise, the smallest of
+    the available memory of the machine, the cgroup limits and the Slurm job
+    allocation is returned.
+
+    Returns
+    -------
+    memory : float
+            Available memory in bytes.
+    """
+    if config.memory_limit is not None:
+        return float(config.memory_limit)
+    memory = [float(psutil.virtual_memory().available)]
+    for limit in (get_cgroup_memory(), get_slurm_memory()):
+        if limit is not None:
+            memory.append(limit)
+
+    return min(memory)
+
+
 def get_machine_properties() -> dict:
     """
     Get the properties of the machine being used.
@@ -139,7 +314,7 @@ def get_machine_properties() -> dict:
             A dictionary containing information about the hardware being used.
     """
     machine_properties = {}
-    available_memory = psutil.virtual_memory().available  # RAM available
+    available_memory = get_available_memory()  # RAM available to this process
     total_cpu_cores = psutil.cpu_count(logical=True)  # CPU cores available
     # Update the machine properties dictionary
     machine_properties["cpu"] = total_cpu_cores
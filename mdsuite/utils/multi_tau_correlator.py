@@ -0,0 +1,245 @@
+"""
+MDSuite: A Zincwarecode package.
+
+License
+-------
+This program and the accompanying materials are made available under the terms
+of the Eclipse Public License v2.0 which accompanies this distribution, and is
+available at https://www.eclipse.org/legal/epl-v20.html
+
+SPDX-License-Identifier: EPL-2.0
+
+Copyright Contributors to the Zincwarecode Project.
+
+Contact Information
+-------------------
+email: zincwarecode@gmail.com
+github: https://github.com/zincware
+web: https://zincwarecode.com/
+
+Citation
+--------
+If you use this module please cite us with:
+
+Summary
+-------
+Streaming multiple-tau correlator for time correlation functions at long lag times.
+
+The correlator follows J. Ramirez et al., J. Chem. Phys. 133, 154103 (2010). The
+signal is stored on a hierarchy of levels. Level 0 holds the last block_length
+frames, every following level holds averages of `averaging` values of the level
+below. A lag j on level k therefore corresponds to j * averaging**k frames, so the
+lags are spaced logarithmically and the memory is O(n_particles log T).
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+class MultiTauCorrelator:
+    """
+    Multiple-tau correlator consuming a trajectory chunk by chunk.
+
+    The frames of a chunk are processed level by level with vectorised operations,
+    the result does not depend on how the trajectory is split into chunks.
+
+    Attributes
+    ----------
+    n_particles : int
+            Number of particles (signals) that are correlated.
+    dimension : int
+            Spatial dimension of the signals.
+    max_lag : int
+            Largest lag in frames that is computed.
+    block_length : int
+            Number of lags on each level.
+    averaging : int
+            Number of values that are averaged when moving to the next level.
+    mode : str
+            'correlation' computes <a(t) . a(t + tau)>, 'msd' computes
+            <(a(t + tau) - a(t))^2>.
+    n_levels : int
+            Number of levels needed to reach max_lag.
+    """
+
+    def __init__(
+        self,
+        n_particles: int,
+        dimension: int,
+        max_lag: int,
+        block_length: int = 16,
+        averaging: int = 2,
+        mode: str = "correlation",
+    ):
+        """
+        Constructor of the multiple-tau correlator.
+
+        Parameters
+        ----------
+        n_particles : int
+                Number of particles (signals) that are correlated.
+        dimension : int
+                Spatial dimension of the signals.
+        max_lag : int
+                Largest lag in frames that is computed.
+        block_length : int
+                Number of lags on each level. Must be a multiple of averaging.
+        averaging : int
+                Number of values that are averaged when moving to the next level.
+        mode : str
+                Either 'correlation' or 'msd'.
+        """
+        if mode not in ("correlation", "msd"):
+            raise ValueError(f"Unknown mode '{mode}', use 'correlation' or 'msd'.")
+        if averaging < 2 or block_length % averaging != 0:
+            raise ValueError(
+                "The block length must be a multiple of the averaging, which must be"
+                " at least 2."
+            )
+        self.n_particles = n_particles
+        self.dimension = dimension
+        self.max_lag = max_lag
+        self.block_length = block_length
+        self.averaging = averaging
+        self.mode = mode
+
+        self.n_levels = 1
+        while (block_length - 1) * averaging ** (self.n_levels - 1) < max_lag:
+            self.n_levels += 1
+
+        empty = np.zeros((n_particles, 0, dimension))
+        self._history = [empty] * self.n_levels
+        self._accumulator = [empty] * self.n_levels
+        self._correlation = []
+        self._counts = []
+        for level in range(self.n_levels):
+            n_lags = len(self._get_level_lag_indices(level))
+            self._correlation.append(np.zeros((n_particles, dimension, n_lags)))
+            self._counts.append(np.zeros(n_lags, dtype=np.int64))
+
+    def _get_level_lag_indices(self, level: int) -> np.ndarray:
+        """Indices j of the lags j * averaging**level computed on a level."""
+        if level == 0:
+            return np.arange(self.block_length)
+        return np.arange(self.block_length // self.averaging, self.block_length)
+
+    @property
+    def lags(self) -> np.ndarray:
+        """All lags of the correlator in frames, in increasing order."""
+        return np.concatenate(
+            [
+                self._get_level_lag_indices(level) * self.averaging**level
+                for level in range(self.n_levels)
+            ]
+        )
+
+    def add(self, data: np.ndarray):
+        """
+        Add the next frames of the trajectory.
+
+        Parameters
+        ----------
+        data : np.ndarray (n_particles, n_frames, dimension)
+                The frames following the ones added before.
+        """
+        values = np.asarray(data, dtype=np.float64)
+        for level in range(self.n_levels):
+            if values.shape[1] == 0:
+                break
+            self._correlate_level(level, values)
+            if level + 1 < self.n_levels:
+                values = self._coarse_grain(level, values)
+
+    def _correlate_level(self, level: int, values: np.ndarray):
+        """
+        Add the lag products of new values on a level.
+
+        Parameters
+        ----------
+        level : int
+                The level the values belong to.
+        values : np.ndarray (n_particles, n_values, dimension)
+                New values on the level.
+        """
+        history = self._history[level]
+        data = np.concatenate([history, values], axis=1)
+        n_old, n_total = history.shape[1], data.shape[1]
+
+        for idx, lag in enumerate(self._get_level_lag_indices(level)):
+            # pairs (t - lag, t) where t is a new value
+            start = max(n_old, lag)
+            if start >= n_total:
+                continue
+            later = data[:, start:]
+            earlier = data[:, start - lag : n_total - lag]
+            if self.mode == "msd":
+                products = (later - earlier) ** 2
+            else:
+                products = later * earlier
+            self._correlation[level][:, :, idx] += np.sum(products, axis=1)
+            self._counts[level][idx] += n_total - start
+
+        # copy, so the chunk is not kept alive by a view
+        self._history[level] = data[:, max(n_total - self.block_length + 1, 0) :].copy()
+
+    def _coarse_grain(self, level: int, values: np.ndarray) -> np.ndarray:
+        """
+        Average consecutive values of a level for the next level.
+
+        Parameters
+        ----------
+        level : int
+                The level the values belong to.
+        values : np.ndarray (n_particles, n_values, dimension)
+                New values on the level.
+
+        Returns
+        -------
+        coarse_values : np.ndarray (n_particles, n_coarse_values, dimension)
+                New values on the next level. Values that do not yet complete an
+                average are kept until the next call.
+        """
+        data = np.concatenate([self._accumulator[level], values], axis=1)
+        n_coarse = data.shape[1] // self.averaging
+        n_used = n_coarse * self.averaging
+        self._accumulator[level] = data[:, n_used:].copy()
+
+        return np.mean(
+            data[:, :n_used].reshape(
+                self.n_particles, n_coarse, self.averaging, self.dimension
+            ),
+            axis=2,
+        )
+
+    def get_correlation(
+        self, per_dimension: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the time-origin averaged correlation of the frames added so far.
+
+        Only lags up to max_lag that were sampled at least once are returned.
+
+        Parameters
+        ----------
+        per_dimension : bool
+                If true, the correlation of each dimension is returned, otherwise
+                the sum over the dimensions.
+
+        Returns
+        -------
+        lags : np.ndarray (n_lags,)
+                Lags in frames.
+        correlation : np.ndarray (n_particles, n_lags) or
+                (n_particles, dimension, n_lags)
+                Correlation function of each particle.
+        """
+        counts = np.concatenate(self._counts)
+        correlation = np.concatenate(self._correlation, axis=-1)
+        lags = self.lags
+
+        mask = (counts > 0) & (lags <= self.max_lag)
+        correlation = correlation[..., mask] / counts[mask]
+        if not per_dimension:
+            correlation = np.sum(correlation, axis=1)
+
+        return lags[mask], correlation
@@ -25,7 +25,9 @@ Summary
 -------
 """
 
+import itertools
 import logging
+from typing import Tuple
 
 import numpy as np
 import tensorflow as tf
@@ -175,3 +177,102 @@ def get_triplets(
         triples.append(tf.stack([t, i, j, k], axis=1))
 
     return tf.concat(triples, axis=0)
+
+
+def cell_list_applicable(box: np.ndarray, cutoff: float) -> bool:
+    """
+    Check if a cell list can be used for a box and cutoff.
+
+    The cell list requires an orthorhombic box with at least three cells of an edge
+    length of at least the cutoff along every axis. Otherwise neighbouring cells
+    overlap through the periodic boundaries.
+
+    Parameters
+    ----------
+    box : np.ndarray
+        Edge lengths of the orthorhombic box, e.g. [13.97, 13.97, 13.97].
+    cutoff : float
+        Largest distance of the pairs to find.
+
+    Returns
+    -------
+    applicable : bool
+        If true, get_cell_list_pairs can be used.
+    """
+    if box is None or cutoff is None or cutoff <= 0:
+        return False
+
+    return bool(np.all(np.floor(np.asarray(box) / cutoff) >= 3))
+
+
+def get_cell_list_pairs(
+    positions: np.ndarray, box: np.ndarray, cutoff: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all pairs within a cutoff in a single configuration using a cell list.
+
+    The atoms are sorted into cells of an edge length of at least the cutoff, so that
+    only the atoms in the 27 surrounding cells have to be checked for each atom. This
+    reduces the cost from O(N^2) to O(N) for a fixed density. Minimum image convention
+    is applied for the orthorhombic box.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Positions of the atoms in one configuration with the shape (n_atoms, 3).
+    box : np.ndarray
+        Edge lengths of the orthorhombic box, e.g. [13.97, 13.97, 13.97].
+    cutoff : float
+        Largest distance of the pairs to find.
+
+    Returns
+    -------
+    indices : np.ndarray
+        Atom indices of the pairs with the shape (2, n_pairs). Every pair is returned
+        once with indices[0] < indices[1].
+    distances : np.ndarray
+        Distance of each pair with the shape (n_pairs,).
+    """
+    box = np.asarray(box, dtype=positions.dtype)
+    if not cell_list_applicable(box, cutoff):
+        raise ValueError(
+            f"A cell list requires at least three cells per axis, but the box {box} "
+            f"only holds {np.floor(box / cutoff)} cells for a cutoff of {cutoff}."
+        )
+    n_cells = np.floor(box / cutoff).astype(int)
+
+    wrapped = positions - np.floor(positions / box) * box
+    cell_index = np.floor(wrapped / box * n_cells).astype(int) % n_cells
+    cell_id = np.ravel_multi_index(cell_index.T, n_cells)
+
+    # atoms sorted by their cell, each cell is a contiguous slice of this array
+    order = np.argsort(cell_id, kind="stable")
+    all_cells = np.arange(np.prod(n_cells))
+    cell_start = np.searchsorted(cell_id[order], all_cells, side="left")
+    cell_stop = np.searchsorted(cell_id[order], all_cells, side="right")
+
+    atoms = np.arange(len(positions))
+    pair_i, pair_j = [], []
+    for shift in itertools.product((-1, 0, 1), repeat=3):
+        neighbour_id = np.ravel_multi_index(
+            ((cell_index + np.array(shift)) % n_cells).T, n_cells
+        )
+        start = cell_start[neighbour_id]
+        counts = cell_stop[neighbour_id] - start
+        i = np.repeat(atoms, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(start, counts) + offsets]
+        # keep every unordered pair only once
+        mask = i < j
+        pair_i.append(i[mask])
+        pair_j.append(j[mask])
+
+    pair_i = np.concatenate(pair_i)
+    pair_j = np.concatenate(pair_j)
+
+    r_ij = positions[pair_j] - positions[pair_i]
+    r_ij -= np.rint(r_ij / box) * box
+    distances = np.linalg.norm(r_ij, axis=-1)
+    mask = distances < cutoff
+
+    return np.stack([pair_i[mask], pair_j[mask]]), distances[mask]